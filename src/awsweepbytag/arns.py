@@ -0,0 +1,49 @@
+"""
+Parse ARNs into their parts
+
+The same ARN is parsed by several functions during a sweep (delete functions, dependency checkers
+and retries), so parse results are cached.
+
+Functions:
+    parse_arn(arn) -> ArnParts
+"""
+
+import functools
+from typing import NamedTuple
+
+
+class ArnParts(NamedTuple):
+    """Parts of an ARN in the form arn:partition:service:region:account-id:resource."""
+
+    partition: str
+    service: str
+    region: str
+    account_id: str
+    resource: str
+
+    @property
+    def resource_id(self) -> str:
+        """Last part of the resource (e.g. 'i-0123456789abcdef0' for 'instance/i-0123456789abcdef0')."""
+        return self.resource.rsplit("/", 1)[-1]
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_arn(arn: str) -> ArnParts:
+    """
+    Split an ARN into its parts
+
+    Args:
+        arn (str): ARN to parse
+
+    Returns:
+        ArnParts: Partition, service, region, account ID and resource of the ARN
+
+    Raises:
+        ValueError: If the string is not an ARN
+    """
+
+    parts = arn.split(":", 5)
+    if len(parts) != 6 or parts[0] != "arn":
+        raise ValueError(f"Invalid ARN: '{arn}'")
+
+    return ArnParts(*parts[1:])
@@ -0,0 +1,109 @@
+"""
+Shared boto3 clients
+
+Creating a boto3 client loads the service model and builds a new connection pool, so clients
+are created once per service and region and reused for the rest of the sweep. Low-level clients
+are safe to share between threads once created, but creating them is not, so creation is guarded
+by a lock.
+
+Every client shares CLIENT_CONFIG. Its connection pool is sized from MAX_WORKERS so concurrent
+deletions don't queue for a connection behind botocore's default pool of 10, connections are kept
+alive between calls, and adaptive retries make throttled calls back off instead of failing.
+
+backoff_delay gives the wait between polls for resources that take a while to delete, so waits
+grow exponentially and are spread out with jitter instead of polling on a fixed interval.
+
+client_error_code reads the error code from a ClientError, so callers don't repeat the lookup
+through the error response.
+
+Functions:
+    get_client(service, region) -> BaseClient
+    clear_clients() -> None
+    backoff_delay(attempt, base, cap) -> float
+    client_error_code(error) -> str
+"""
+
+import random
+import threading
+
+import boto3
+from botocore.client import BaseClient
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Maximum number of resources deleted at the same time in each region
+MAX_WORKERS = 16
+MAX_POOL_CONNECTIONS = max(32, 2 * MAX_WORKERS)
+
+CLIENT_CONFIG = Config(
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
+
+_clients: dict[tuple[str, str | None], BaseClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(service: str, region: str | None = None) -> BaseClient:
+    """
+    Return the shared boto3 client for a service and region, creating it on first use
+
+    Args:
+        service (str): Name of the AWS service (e.g. 'ec2', 'sqs')
+        region (str | None, optional): Region the client is for. Defaults to None for global services like CloudFront.
+
+    Returns:
+        BaseClient: boto3 client for the service and region
+    """
+
+    key = (service, region)
+    client = _clients.get(key)
+
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = boto3.client(service, region_name=region, config=CLIENT_CONFIG)  # type: ignore
+                _clients[key] = client
+
+    return client
+
+
+def clear_clients() -> None:
+    """Remove all cached clients so the next call to get_client creates new ones."""
+
+    with _clients_lock:
+        _clients.clear()
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 30.0) -> float:
+    """
+    Return how long to wait before the next poll, using exponential backoff with jitter
+
+    Args:
+        attempt (int): Number of polls already made, starting at 0
+        base (float, optional): Delay in seconds for the first attempt. Defaults to 2.0.
+        cap (float, optional): Maximum delay in seconds before jitter is added. Defaults to 30.0.
+
+    Returns:
+        float: Seconds to wait
+    """
+
+    return min(cap, base * 2**attempt) + random.uniform(0, 1)
+
+
+def client_error_code(error: ClientError) -> str:
+    """
+    Return the error code of a ClientError (e.g. 'NotFoundException')
+
+    Args:
+        error (ClientError): Error raised by a boto3 client call
+
+    Returns:
+        str: The error code, or an empty string if the response doesn't include one
+    """
+
+    return error.response.get("Error", {}).get("Code", "")
@@ -17,11 +17,13 @@ Functions By Service:
         - delete_autoscaling_group
 
     CloudFront:
+        - clear_distribution_etags
         - delete_cloudfront_distribution
         - disable_cloudfront_distribution
         - wait_for_distribution_disabled
 
     DynamoDB:
+        - prompt_dynamodb_table_backup
         - create_dynamodb_table_backup
         - delete_dynamodb_table
 
@@ -30,14 +32,17 @@ Functions By Service:
         - delete_ec2_instance
         - ec2_waiter
         - release_eip
+        - get_internet_gateway_attachments
         - delete_internet_gateway
         - delete_launch_template
         - delete_nat_gateway
         - delete_route_table
         - delete_security_group
+        - delete_security_groups
         - delete_snapshot
         - delete_subnet
         - delete_vpc_endpoint
+        - delete_vpc_endpoints
         - delete_vpc
 
     Elastic Load Balancing:
@@ -49,6 +54,13 @@ Functions By Service:
         - delete_lambda_function
 
     S3:
+        - list_s3_bucket_first_page
+        - s3_bucket_listing_has_objects
+        - s3_bucket_has_objects
+        - clear_s3_bucket_listings
+        - list_s3_bucket_pages
+        - empty_s3_bucket
+        - expire_s3_bucket_objects
         - delete_s3_bucket
 
     SNS:
@@ -59,13 +71,19 @@ Functions By Service:
 """
 
 import json
+import threading
 import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from itertools import chain
 
-import boto3
 import botocore.exceptions
 
 from awsweepbytag import text_formatting as tf
+from awsweepbytag.arns import parse_arn
+from awsweepbytag.aws_clients import MAX_WORKERS, backoff_delay, client_error_code, get_client
 
 #####################################################################
 # API GW Services
@@ -90,33 +108,26 @@ def delete_api(arn: str, region: str) -> list[dict] | None:
         region (str): The AWS region where the API is located
     """
 
-    client = boto3.client("apigatewayv2", region_name=region)
+    client = get_client("apigatewayv2", region)
     api_id = arn.split("/")[-1]
     tf.header_print(f"Deleting API {api_id} in {region}...")
 
-    # Gather any integrations using VPC_LINK
-    integrations = client.get_integrations(ApiId=api_id)
-    vpc_link_ids = []
-
-    for integration in integrations.get("Items", []):
-        if integration.get("ConnectionType") == "VPC_LINK":
-            conn_id = integration.get("ConnectionId")
-            if conn_id:
-                vpc_link_ids.append(conn_id)
-
-    # Delete the API
-    try:
-        response = client.delete_api(ApiId=api_id)
-        status_code = response["ResponseMetadata"]["HTTPStatusCode"]
-
-        if 200 <= status_code < 300:
-            tf.success_print(f"API '{arn}' was successfully deleted")
-        else:
-            tf.failure_print(f"API '{arn}' was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+    # Gather the VPC links used by integrations, once each even when several integrations share a link
+    # MaxResults is a string in the apigatewayv2 model, so the page size is too
+    pages = client.get_paginator("get_integrations").paginate(ApiId=api_id, PaginationConfig={"PageSize": "500"})
+    vpc_link_ids = list(
+        dict.fromkeys(
+            integration["ConnectionId"]
+            for page in pages
+            for integration in page.get("Items", [])
+            if integration.get("ConnectionType") == "VPC_LINK" and integration.get("ConnectionId")
+        )
+    )
 
-    except botocore.exceptions.ClientError:
-        raise
+    # Delete the API. Failed calls raise a ClientError, which is handled by delete_resource() in main_delete.py
+    response = client.delete_api(ApiId=api_id)
+    tf.success_print(f"API '{arn}' was successfully deleted")
+    tf.api_response_print(response)
 
     print()
     # Ask if user wants to delete associated VPC links if there are any
@@ -160,26 +171,20 @@ def delete_rest_api(arn: str, region: str) -> None:
         region (str): The AWS region where the API is located
     """
 
-    client = boto3.client("apigateway", region_name=region)
+    client = get_client("apigateway", region)
     api_id = arn.split("/")[-1]
     tf.header_print(f"Deleting REST API {api_id} in {region}...")
     vpc_link_ids = set()
 
     # Checks for VPC Links in method integrations
-    resources = client.get_resources(restApiId=api_id, limit=500)
-
-    for resource in resources["items"]:
-        resource_id = resource["id"]
-        if "resourceMethods" in resource:
-            for http_method in resource["resourceMethods"]:
-                try:
-                    method_resp = client.get_integration(restApiId=api_id, resourceId=resource_id, httpMethod=http_method)
-                    if method_resp.get("connectionType") == "VPC_LINK":
-                        conn_id = method_resp.get("connectionId")
-                        if conn_id:
-                            vpc_link_ids.add(conn_id)
-                except botocore.exceptions.ClientError as e:
-                    tf.failure_print(f"Error retrieving integration for {http_method} on resource {resource_id}: {e}")
+    # embed=methods returns each method's integration with its resource, so no get_integration call is needed per method
+    paginator = client.get_paginator("get_resources")
+    for page in paginator.paginate(restApiId=api_id, embed=["methods"], PaginationConfig={"PageSize": 500}):
+        for resource in page["items"]:
+            for method in resource.get("resourceMethods", {}).values():
+                integration = method.get("methodIntegration", {})
+                if integration.get("connectionType") == "VPC_LINK" and integration.get("connectionId"):
+                    vpc_link_ids.add(integration["connectionId"])
 
     # Prompts user to delete VPC links if they exist.
     if vpc_link_ids:
@@ -197,7 +202,7 @@ def delete_rest_api(arn: str, region: str) -> None:
                         tf.success_print(f"VPC link {vpc_link_id} was successfully deleted")
                     else:
                         tf.failure_print(f"VPC link {vpc_link_id} was not successfully deleted")
-                    tf.response_print(json.dumps(response, indent=4, default=str))
+                    tf.api_response_print(response)
                 except botocore.exceptions.ClientError as e:
                     tf.failure_print(f"Error deleting VPC link {vpc_link_id}: {e}")
 
@@ -209,43 +214,44 @@ def delete_rest_api(arn: str, region: str) -> None:
             tf.success_print(f"REST API {arn} was successfully deleted")
         else:
             tf.failure_print(f"REST API {arn} was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
     except botocore.exceptions.ClientError as e:
         tf.indent_print(f"Failed to delete API {arn}: {e}")
 
     # Wait for VPC links to be deleted or reach a non-active state
     if vpc_link_ids and delete_vpc_links == "y":
         tf.indent_print("Checking status(es) of VPC link(s) to avoid dependency violations...\n")
-        max_retries = 5
-        retry_delay = 5
-        retry = 0
+        max_retries = 6
+        active_ids = set(vpc_link_ids)
 
-        while retry <= max_retries:
-            still_exists = []
+        def vpc_link_deleted(vpc_link_id: str) -> bool:
+            try:
+                response = client.get_vpc_link(vpcLinkId=vpc_link_id)
+                tf.indent_print(f"VPC link {vpc_link_id} status: {response.get('status', '')}")
+            except client.exceptions.NotFoundException:
+                tf.success_print(f"VPC link {vpc_link_id} has been fully deleted.")
+                return True
+            except botocore.exceptions.ClientError as e:
+                tf.failure_print(f"Error checking status for VPC link {vpc_link_id}: {e}")
+            return False
 
-            for vpc_link_id in vpc_link_ids:
-                try:
-                    response = client.get_vpc_link(vpcLinkId=vpc_link_id)
-                    status = response.get("status", "")
-                    tf.indent_print(f"VPC link {vpc_link_id} status: {status}")
-                    still_exists.append((vpc_link_id, status))
-                except botocore.exceptions.ClientError as e:
-                    if e.response["Error"]["Code"] == "NotFoundException":
-                        tf.success_print(f"VPC link {vpc_link_id} has been fully deleted.")
-                        continue
-                    else:
-                        tf.failure_print(f"Error checking status for VPC link {vpc_link_id}: {e}")
-                        still_exists.append((vpc_link_id, "ERROR"))
+        for retry in range(max_retries + 1):
+            # Remaining links are checked at the same time, and links that have been fully deleted are dropped so they aren't checked again
+            checked_ids = sorted(active_ids)
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(checked_ids))) as executor:
+                deleted = list(executor.map(vpc_link_deleted, checked_ids))
+            active_ids -= {vpc_link_id for vpc_link_id, is_deleted in zip(checked_ids, deleted, strict=True) if is_deleted}
 
-            if not still_exists:
+            if not active_ids:
                 tf.success_print("All VPC links have been fully deleted.")
                 break
-            else:
-                tf.indent_print("Waiting for VPC links to be fully deleted...")
-                retry += 1
+
+            if retry < max_retries:
+                retry_delay = backoff_delay(retry)
+                tf.indent_print(f"Waiting for VPC links to be fully deleted. Checking again in {retry_delay:.1f} seconds...")
                 time.sleep(retry_delay)
 
-        if retry >= max_retries:
+        else:
             tf.failure_print("Some VPC links may still exist. Please check manually.")
 
     print()
@@ -263,7 +269,7 @@ def delete_vpc_link(vpc_link_id: str, region: str, apigw_function: bool = False)
         apigw_function (bool, optional): Whether the function was called by an API delete function. Defaults to False.
     """
 
-    client = boto3.client("apigatewayv2", region_name=region)
+    client = get_client("apigatewayv2", region)
 
     if not apigw_function:
         tf.header_print(f"Deleting VPC link {vpc_link_id} in {region}...")
@@ -286,13 +292,13 @@ def delete_vpc_link(vpc_link_id: str, region: str, apigw_function: bool = False)
 
         if 200 <= status_code < 300:
             tf.success_print(f"VPC link {vpc_link_id} was successfully deleted")
-            tf.response_print(json.dumps(response, indent=4, default=str))
+            tf.api_response_print(response)
             if not apigw_function:
                 vpc_link_waiter([vpc_link_id], region)
                 return None
         else:
             tf.failure_print(f"VPC link {vpc_link_id} was not successfully deleted. Retrying later...")
-            tf.response_print(json.dumps(response, indent=4, default=str))
+            tf.api_response_print(response)
             return [resource]
 
     except botocore.exceptions.ClientError:
@@ -301,54 +307,67 @@ def delete_vpc_link(vpc_link_id: str, region: str, apigw_function: bool = False)
     return None
 
 
+# VPC link statuses that mean the link still exists and may block deleting its subnets and security groups
+VPC_LINK_ACTIVE_STATUSES = frozenset({"DELETING", "PENDING", "AVAILABLE"})
+
+
 def vpc_link_waiter(vpc_link_ids: list, region: str) -> None:
     """
     Waits for VPC Links to become inactive or non-existent to avoid dependency issues
+
+    Only links that are still active are checked on each pass, and the wait between passes backs off exponentially.
     """
 
     tf.indent_print("Checking status(es) of VPC link(s) to avoid dependency violations...\n")
 
-    client = boto3.client("apigatewayv2", region_name=region)
-    max_retries = 5
-    retry_delay = 5
-    retry = 0
+    client = get_client("apigatewayv2", region)
+    max_retries = 6
+    active_ids = set(vpc_link_ids)
 
-    while retry <= max_retries:
-        vpc_link_statuses = []
-        all_inactive = True
+    def check_vpc_link(vpc_link_id: str) -> str | None:
+        """Return the status of a VPC link that is still active, or None once it is inactive or deleted."""
+        try:
+            response = client.get_vpc_link(VpcLinkId=vpc_link_id)
 
-        for vpc_link_id in vpc_link_ids:
-            try:
-                response = client.get_vpc_link(VpcLinkId=vpc_link_id)
+            if "VpcLink" in response:
+                status = response["VpcLink"]["VpcLinkStatus"]
+            else:
+                status = response.get("VpcLinkStatus") or response.get("status")  # fallback
 
-                if "VpcLink" in response:
-                    status = response["VpcLink"]["VpcLinkStatus"]
-                else:
-                    status = response.get("VpcLinkStatus") or response.get("status")  # fallback
-                vpc_link_statuses.append((vpc_link_id, status))
-                if status in ("DELETING", "PENDING", "AVAILABLE"):
-                    all_inactive = False
+            return status if status in VPC_LINK_ACTIVE_STATUSES else None
 
-            except botocore.exceptions.ClientError as e:
-                if e.response["Error"]["Code"] == "NotFoundException":
-                    tf.success_print(f"VPC link {vpc_link_id} is already deleted")
-                else:
-                    tf.indent_print(f"Error checking status for VPC link {vpc_link_id}: {e}")
-                    all_inactive = False
+        except client.exceptions.NotFoundException:
+            tf.success_print(f"VPC link {vpc_link_id} is already deleted")
+            return None
+
+        except botocore.exceptions.ClientError as e:
+            tf.indent_print(f"Error checking status for VPC link {vpc_link_id}: {e}")
+            return "ERROR"
+
+    for retry in range(max_retries + 1):
+        # Active links are checked at the same time, and links that are inactive or deleted are dropped so they aren't checked again
+        checked_ids = sorted(active_ids)
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(checked_ids)))) as executor:
+            statuses = list(executor.map(check_vpc_link, checked_ids))
+
+        vpc_link_statuses = [(vpc_link_id, status) for vpc_link_id, status in zip(checked_ids, statuses, strict=True) if status]
+        active_ids = {vpc_link_id for vpc_link_id, _ in vpc_link_statuses}
 
         print()
-        if all_inactive:
+        if not active_ids:
             tf.success_print("All VPC links are inactive or deleted")
             break
-        else:
-            tf.indent_print("Some VPC links are still active:")
-            for vpc_link_id, status in vpc_link_statuses:
-                tf.indent_print(f"  - {vpc_link_id}: {status}")
-            tf.indent_print(f"Retrying in {retry_delay} seconds...")
+
+        tf.indent_print("Some VPC links are still active:")
+        for vpc_link_id, status in vpc_link_statuses:
+            tf.indent_print(f"  - {vpc_link_id}: {status}")
+
+        if retry < max_retries:
+            retry_delay = backoff_delay(retry)
+            tf.indent_print(f"Retrying in {retry_delay:.1f} seconds...")
             time.sleep(retry_delay)
-            retry += 1
 
-    if retry > max_retries:
+    else:
         tf.failure_print("Some VPC links may still be active. Please check manually")
     print()
 
@@ -371,11 +390,11 @@ def delete_application_autoscaling(service_namespace: str, resource_id: str, reg
     """
 
     tf.subheader_print(f"Checking for attached Application Autoscaling Policies and Targets for {resource_id}...")
-    client = boto3.client("application-autoscaling", region_name=region)
+    client = get_client("application-autoscaling", region)
     response = client.describe_scalable_targets(ServiceNamespace=service_namespace, ResourceIds=[resource_id])
 
     # tf.indent_print("Describe Scalable Targets Response:")
-    # tf.response_print(json.dumps(response, indent=4, default=str))
+    # tf.api_response_print(response)
 
     if not response["ScalableTargets"]:
         tf.indent_print(f"No scalable targets found for {resource_id}.")
@@ -413,7 +432,7 @@ def delete_application_autoscaling(service_namespace: str, resource_id: str, reg
                 tf.success_print(f"Successfully deleted scaling policy '{policy_name}' for {dimension}")
             else:
                 tf.failure_print(f"Failed to delete scaling policy '{policy_name}' for {dimension}")
-            tf.response_print(json.dumps(response, indent=4, default=str))
+            tf.api_response_print(response)
 
     # Delete scalable targets
     for dimension in scalable_dimensions:
@@ -426,7 +445,7 @@ def delete_application_autoscaling(service_namespace: str, resource_id: str, reg
             tf.success_print(f"Successfully deregistered Application Auto Scaling target for {dimension}.")
         else:
             tf.failure_print(f"Failed to deregister Application Auto Scaling target for {dimension}.")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
 
 #####################################################################
@@ -434,13 +453,18 @@ def delete_application_autoscaling(service_namespace: str, resource_id: str, reg
 #####################################################################
 
 
+# Maximum number of instance IDs accepted by a single TerminateInstances call
+TERMINATE_INSTANCES_BATCH_SIZE = 1000
+
+
 def delete_autoscaling_group(arn: str, region: str) -> list[dict] | None:
     """
     Delete an autoscaling group and terminate all instances in the group
 
     1. Autoscaling group is checked for any instances
     2. Autoscaling group is deleted, function returns if not instances exist, any exceptions are raised
-    3. If instances exist, they are terminated with delete_ec2_instance and ec2_waiter is called to wait for full termination
+    3. If instances exist, they are terminated together (falling back to delete_ec2_instance for each one if that fails) and ec2_waiter
+    is called to wait for full termination
     4. If instances fail to delete, they are added to a list of instances to retry and returned
 
     The step to delete instances seems redundant, but this is done to speed up the process, as
@@ -456,55 +480,68 @@ def delete_autoscaling_group(arn: str, region: str) -> list[dict] | None:
     """
 
     tf.header_print(f"Deleting autoscaling group {arn} in {region}...")
-    client = boto3.client("autoscaling", region_name=region)
-    asg_name = arn.split("/")[-1]
-    account_id = arn.split(":")[4]
+    client = get_client("autoscaling", region)
+    arn_parts = parse_arn(arn)
+    asg_name = arn_parts.resource_id
 
     instance_ids = [
         instance["InstanceId"]
         for instance in client.describe_auto_scaling_groups(AutoScalingGroupNames=[asg_name])["AutoScalingGroups"][0]["Instances"]
     ]
 
-    instance_arns = [f"arn:aws:ec2:{region}:{account_id}:instance/{instance_id}" for instance_id in instance_ids]
-    try:
-        response = client.delete_auto_scaling_group(AutoScalingGroupName=asg_name, ForceDelete=True)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.success_print(f"Autoscaling group {arn} deletion initiated successfully")
-        else:
-            tf.failure_print(f"Autoscaling group {arn} was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
-
-    except botocore.exceptions.ClientError:
-        raise
+    instance_arns = [
+        f"arn:{arn_parts.partition}:ec2:{region}:{arn_parts.account_id}:instance/{instance_id}" for instance_id in instance_ids
+    ]
+    response = client.delete_auto_scaling_group(AutoScalingGroupName=asg_name, ForceDelete=True)
+    tf.success_print(f"Autoscaling group {arn} deletion initiated successfully")
+    tf.api_response_print(response)
 
     if not instance_arns:
         return None
 
     # Terminate any instances if they exist and wait until they are fully terminated
+    # Instances are terminated with one call per batch. The whole call is rejected if any instance in it no longer exists,
+    # so on an error the batch falls back to terminating each instance with delete_ec2_instance.
+    ec2_client = get_client("ec2", region)
     instances_to_retry = []
 
-    for instance in instance_arns:
+    for i in range(0, len(instance_arns), TERMINATE_INSTANCES_BATCH_SIZE):
+        batch = instance_arns[i : i + TERMINATE_INSTANCES_BATCH_SIZE]
+        batch_ids = [instance.split("/")[-1] for instance in batch]
+        tf.subheader_print(f"Terminating EC2 instance(s) '{', '.join(batch_ids)}' in {region}...")
+
         try:
-            delete_ec2_instance(instance, region, True)
+            response = ec2_client.terminate_instances(InstanceIds=batch_ids)
+            for terminating_instance in response["TerminatingInstances"]:
+                tf.success_print(f"EC2 instance '{terminating_instance['InstanceId']}' is shutting down.")
+            tf.api_response_print(response)
+            continue
 
-        except Exception as e:
-            tf.failure_print(f"Error deleting instances in autoscaling group '{asg_name}':")
-            tf.indent_print(f"{e}", 6)
-            instance_map = {
-                "arn": instance,
-                "service": "ec2",
-                "resource_type": "instance",
-                "region": region,
-            }
-            instances_to_retry.append(instance_map)
+        except botocore.exceptions.ClientError as e:
+            error_code = client_error_code(e)
+            tf.indent_print(f"Could not terminate the instances together ({error_code}). Trying one at a time...")
+
+        for instance in batch:
+            try:
+                delete_ec2_instance(instance, region, True)
+
+            except Exception as e:
+                tf.failure_print(f"Error deleting instances in autoscaling group '{asg_name}':")
+                tf.indent_print(f"{e}", 6)
+                instance_map = {
+                    "arn": instance,
+                    "service": "ec2",
+                    "resource_type": "instance",
+                    "region": region,
+                }
+                instances_to_retry.append(instance_map)
 
     if not instances_to_retry:
         instance_ids_to_confirm = instance_ids
 
     else:
-        instance_ids_to_confirm = [
-            arn.split("/")[-1] for arn in instance_arns if arn not in [instance["arn"] for instance in instances_to_retry]
-        ]
+        failed_arns = {instance["arn"] for instance in instances_to_retry}
+        instance_ids_to_confirm = [arn.split("/")[-1] for arn in instance_arns if arn not in failed_arns]
 
     tf.indent_print("Waiting for autoscaling instances to shut down to avoid dependency violations...")
     ec2_waiter(instance_ids_to_confirm, region)
@@ -519,35 +556,50 @@ def delete_autoscaling_group(arn: str, region: str) -> list[dict] | None:
 #####################################################################
 
 
+# ETags returned by update_distribution when distributions are disabled, so deleting them doesn't need another get_distribution call
+_distribution_etags: dict[str, str] = {}
+
+
+def clear_distribution_etags() -> None:
+    """Remove all cached CloudFront distribution ETags."""
+
+    _distribution_etags.clear()
+
+
 def delete_cloudfront_distribution(arn: str) -> None:
     """
     Delete a CloudFront distribution
 
     If the distribution is not yet fully disabled, it will be retried by the retry_failed_deletions
     function. Retries should not be needed however, because the function that calls this first calls the
-    wait_for_distribution_disabled function. Before attempting to delete a get_distribution request is
-    made first to retrieve the latest ETag, which is required for the delete_distribution request.
+    wait_for_distribution_disabled function. The delete_distribution request requires the latest ETag. The
+    ETag returned when the distribution was disabled is used if there is one, otherwise (or if it is stale)
+    a get_distribution request is made to retrieve it.
 
     Args:
         arn (str): The ARN of the CloudFront distribution to delete
     """
 
-    client = boto3.client("cloudfront")
+    client = get_client("cloudfront")
     distribution_id = arn.split("/")[-1]
     tf.header_print(f"Deleting CloudFront distribution {distribution_id}...")
 
-    # Get the new ETag after disable
-    distribution = client.get_distribution(Id=distribution_id)
-    etag = distribution["ETag"]
+    # Use the ETag from disabling the distribution, or get the current one
+    etag = _distribution_etags.pop(distribution_id, None)
+    if etag is None:
+        etag = client.get_distribution(Id=distribution_id)["ETag"]
 
     # Now delete the distribution
     try:
-        response = client.delete_distribution(Id=distribution_id, IfMatch=etag)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.success_print(f"CloudFront distribution {arn} was successfully deleted")
-        else:
-            tf.failure_print(f"CloudFront distribution {arn} was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        try:
+            response = client.delete_distribution(Id=distribution_id, IfMatch=etag)
+        except client.exceptions.PreconditionFailed:
+            # The distribution was changed after it was disabled, so retry with its current ETag
+            etag = client.get_distribution(Id=distribution_id)["ETag"]
+            response = client.delete_distribution(Id=distribution_id, IfMatch=etag)
+
+        tf.success_print(f"CloudFront distribution {arn} was successfully deleted")
+        tf.api_response_print(response)
 
     except Exception as e:
         tf.failure_print(f"Delete error (CloudFront {distribution_id}): {str(e)}\n")
@@ -570,7 +622,7 @@ def disable_cloudfront_distribution(arn: str) -> bool:
         bool - True if the distribution needs to be retried for deletion
     """
 
-    client = boto3.client("cloudfront")
+    client = get_client("cloudfront")
     distribution_id = arn.split("/")[-1]
     tf.header_print(f"Disabling CloudFront distribution {distribution_id}...")
     # Get the current distribution config
@@ -587,7 +639,8 @@ def disable_cloudfront_distribution(arn: str) -> bool:
 
         # Update the distribution to disable it
         tf.indent_print(f"Disabling CloudFront distribution {distribution_id}. Will come back to delete...")
-        client.update_distribution(Id=distribution_id, DistributionConfig=config, IfMatch=etag)
+        response = client.update_distribution(Id=distribution_id, DistributionConfig=config, IfMatch=etag)
+        _distribution_etags[distribution_id] = response["ETag"]
         retry = True
 
     else:
@@ -599,7 +652,7 @@ def disable_cloudfront_distribution(arn: str) -> bool:
                 retry = False
             else:
                 tf.failure_print(f"CloudFront distribution {arn} was not successfully deleted")
-            tf.response_print(json.dumps(response, indent=4, default=str))
+            tf.api_response_print(response)
         except client.exceptions.DistributionNotDisabled:
             tf.indent_print(f"CloudFront distribution {distribution_id} is not yet fully disabled. Will retry later...\n")
             retry = True
@@ -618,7 +671,7 @@ def wait_for_distribution_disabled(arn: str) -> None:
         arn (str): The arn of the CloudFront distribution to wait for
     """
 
-    client = boto3.client("cloudfront")
+    client = get_client("cloudfront")
     distribution_id = arn.split("/")[-1]
     tf.header_print(f"Waiting for CloudFront distribution {distribution_id} to be disabled...")
     waiter = client.get_waiter("distribution_deployed")
@@ -632,98 +685,121 @@ def wait_for_distribution_disabled(arn: str) -> None:
 #####################################################################
 
 
-def create_dynamodb_table_backup(arn: str, region: str) -> bool:
+def prompt_dynamodb_table_backup(table_name: str) -> str | None:
     """
-    Create a backup of a DynamoDB table
-
-    Called by delete_dynamodb_function if table is not empty.
+    Ask whether to back up a DynamoDB table before deleting it, and for an optional backup name suffix
 
-    1. Prompts user if they would like to create backup - if not, returns False
-    2. Prompts user for a name for the backup or accepts default
-    3. Attempts to create backup with a max of 5 retries, with exponential backoff (starting at 1 second)
-    4. If backup is created successfully, returns False. If not, returns True to prompt user for deletion
+    Called by delete_dynamodb_table while it holds tf.prompting(), so both prompts stay together. The backup itself
+    is created afterwards by create_dynamodb_table_backup, once the prompt lock has been released.
 
     Args:
-        arn (str): The ARN of the DynamoDB table to backup
-        region (str): The region the DynamoDB table is in
+        table_name (str): Name of the DynamoDB table
 
     Returns:
-        bool: True if user needs to be prompted for deletion (if backup creation fails)
+        str | None: The suffix for the backup name (empty for the default name), or None if no backup should be created
     """
 
-    table_name = arn.split("/")[-1]
-    client = boto3.client("dynamodb", region_name=region)
-
-    backup = tf.y_n_prompt(f"Would you like to create a backup before deleting table '{table_name}'?")
-    print()
+    # Both prompts are asked together, so another resource's prompt can't come between them
+    with tf.prompting():
+        backup = tf.y_n_prompt(f"Would you like to create a backup before deleting table '{table_name}'?")
+        print()
 
-    if backup != "y":
-        tf.indent_print("Skipping backup creation...")
-        return False
+        if backup != "y":
+            tf.indent_print("Skipping backup creation...")
+            return None
 
-    else:
         # Prompt users to enter a name for the backup or accept default (<table_name>-<timestamp in YYYYMMDD-HHMMSS format>)
         # If a name is provided, it will be prefixed to table name but still append timestamp (<table_name>-<user_name>-<timestamp>)
         tf.indent_print("Optional: Enter a suffix for the backup name or press Enter to accept the default")
         tf.indent_print("Default: {table_name}-{timestamp} | With suffix: {table_name}-{user_suffix}-{timestamp}")
-        table_suffix = tf.custom_prompt("Optional suffix: ")
+        table_suffix = tf.custom_prompt(f"Optional suffix for the backup of table '{table_name}'")
         print()
-        tf.subheader_print(f"Creating backup for DynamoDB table '{table_name}'...")
-        table_suffix = f"{table_suffix}-" if table_suffix else ""
-        backup_prefix = f"{table_name}-{table_suffix}"
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        backup_name = f"{backup_prefix}{timestamp}"
 
-        max_retries = 5
-        retry_delay = 1
-        retry_number = 0
+    return table_suffix
 
-        while retry_number < max_retries:
-            try:
-                response = client.create_backup(TableName=table_name, BackupName=backup_name)
 
-                if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-                    tf.success_print("Backup created successfully:")
-                    tf.response_print(json.dumps(response, indent=4, default=str))
-                    return False
-                else:
-                    tf.failure_print("Backup creation failed:")
-                    tf.response_print(json.dumps(response, indent=4, default=str))
-                    retry_number += 1
-                    time.sleep(retry_delay)
-                    retry_delay += 1
+def create_dynamodb_table_backup(arn: str, region: str, table_suffix: str = "") -> bool:
+    """
+    Create a backup of a DynamoDB table
 
-            except botocore.exceptions.ClientError as e:
-                error_code = e.response["Error"]["Code"]
+    Called by delete_dynamodb_table if the table is not empty and the user chose to back it up with
+    prompt_dynamodb_table_backup. No prompts are asked here, so the retries don't hold up other threads' prompts.
 
-                if error_code == "TableNotFoundException":
-                    tf.indent_print(f"Could not create backup because of error '{error_code}'.")
-                    return False
+    1. Builds the backup name from the table name, the optional suffix and a timestamp
+    2. Attempts to create backup with a max of 5 retries, with exponential backoff (starting at 1 second)
+    3. If backup is created successfully, returns False. If not, returns True to prompt user for deletion
 
-                else:
-                    tf.failure_print(f"Error backing up DynamoDB table {table_name}: {e}\n")
-                    tf.indent_print("Trying again...")
-                    retry_number += 1
-                    time.sleep(retry_delay)
-                    retry_delay += 1
+    Args:
+        arn (str): The ARN of the DynamoDB table to backup
+        region (str): The region the DynamoDB table is in
+        table_suffix (str, optional): Suffix to add to the backup name after the table name. Defaults to "".
+
+    Returns:
+        bool: True if user needs to be prompted for deletion (if backup creation fails)
+    """
+
+    table_name = arn.split("/")[-1]
+    client = get_client("dynamodb", region)
 
-        tf.failure_print("Max retries reached. Skipping backup creation...")
-        return True
+    tf.subheader_print(f"Creating backup for DynamoDB table '{table_name}'...")
+    table_suffix = f"{table_suffix}-" if table_suffix else ""
+    backup_prefix = f"{table_name}-{table_suffix}"
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    backup_name = f"{backup_prefix}{timestamp}"
+
+    max_retries = 5
+    retry_delay = 1
+    retry_number = 0
+
+    while retry_number < max_retries:
+        try:
+            response = client.create_backup(TableName=table_name, BackupName=backup_name)
+
+            if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
+                tf.success_print(f"Backup '{backup_name}' created successfully")
+                tf.api_response_print(response)
+                return False
+            else:
+                tf.failure_print("Backup creation failed")
+                tf.api_response_print(response)
+                retry_number += 1
+                time.sleep(retry_delay)
+                retry_delay += 1
+
+        except botocore.exceptions.ClientError as e:
+            error_code = client_error_code(e)
+
+            if error_code == "TableNotFoundException":
+                tf.indent_print(f"Could not create backup because of error '{error_code}'.")
+                return False
+
+            else:
+                tf.failure_print(f"Error backing up DynamoDB table {table_name}: {e}\n")
+                tf.indent_print("Trying again...")
+                retry_number += 1
+                time.sleep(retry_delay)
+                retry_delay += 1
+
+    tf.failure_print("Max retries reached. Skipping backup creation...")
+    return True
 
 
 def delete_dynamodb_table(arn: str, region: str) -> list[dict] | None:
     """
     Delete a DynamoDB table.
 
-    If the table has deletion protection or items, the user will be prompted before proceeding.
+    If the table has deletion protection or items, the user will be prompted before proceeding. The table's prompts
+    are asked while holding tf.prompting(), so they aren't split up by prompts from other threads. The backup is
+    created after the lock is released.
     1. Table is checked for billing mode and deletion protection
-    2. If deletion protection is enabled, user is warned and prompted to disable it
-    3. Deletion protection is disabled if user confirms
-    4. Table is checked for items by a scan with a limit of 1
-    5. If items are found, user is warned and prompted to delete them and the table
-    6. If user confirms, create_dynamodb_table_backup is called to prompt user to create backup
-    7. If billing mode is PROVISIONED, application autoscaling policies and targets are checked for and deleted
-    8. Table is deleted - if failure response table is returned for retry.
+    2. Table is checked for items using its ItemCount, or a COUNT scan with a limit of 1 if ItemCount is 0
+    3. If deletion protection is enabled, user is warned and prompted to disable it
+    4. If items are found, user is warned and prompted to delete them and the table
+    5. If user confirms, prompt_dynamodb_table_backup asks whether to create a backup and for its name
+    6. The backup is created with create_dynamodb_table_backup. If it fails, the user is asked whether to delete anyway
+    7. Deletion protection is disabled once everything has been confirmed
+    8. If billing mode is PROVISIONED, application autoscaling policies and targets are checked for and deleted
+    9. Table is deleted - if failure response table is returned for retry.
 
     Args:
         arn (str): The ARN of the DynamoDB table to delete
@@ -737,7 +813,7 @@ def delete_dynamodb_table(arn: str, region: str) -> list[dict] | None:
     """
 
     tf.header_print(f"Deleting DynamoDB table '{arn}' in {region}...")
-    client = boto3.client("dynamodb", region_name=region)
+    client = get_client("dynamodb", region)
     table_name = arn.split("/")[-1]
     service_namespace = "dynamodb"
     table_resource_id = f"table/{table_name}"
@@ -752,36 +828,48 @@ def delete_dynamodb_table(arn: str, region: str) -> list[dict] | None:
         return None
 
     deletion_protection = table_info.get("DeletionProtectionEnabled", False)
-    if deletion_protection:
-        disable_protection = tf.warning_confirmation(f"Table '{table_name}' has deletion protection enabled. Disable it?")
-        if disable_protection != "yes":
-            tf.indent_print(f"Skipping deletion of DynamoDB table '{table_name}'...\n")
-            return None
-
-        # Disable deletion protection
-        response = client.update_table(TableName=table_name, DeletionProtectionEnabled=False)
-        tf.success_print(f"Deletion protection disabled for table '{table_name}'")
-        tf.response_print(json.dumps(response, indent=4, default=str))
 
     # Check if table has items
-    response = client.scan(TableName=table_name, Limit=1)
-    if len(response.get("Items", [])) > 0:
-        confirm = tf.warning_confirmation(f"Table '{table_name}' is not empty. Delete all items and the table?")
-        print()
-        if confirm != "yes":
-            tf.indent_print(f"Skipping deletion of DynamoDB table '{table_name}'...\n")
-            return None
+    # ItemCount from describe_table is only refreshed about every six hours, so it is trusted when it shows items,
+    # but a count of 0 is confirmed with a COUNT scan that stops at the first item
+    has_items = table_info.get("ItemCount", 0) > 0
+    if not has_items:
+        response = client.scan(TableName=table_name, Limit=1, Select="COUNT")
+        has_items = response.get("Count", 0) > 0
+
+    # All of the table's prompts are asked together, so another resource's prompt can't come between them
+    backup_suffix = None
+    with tf.prompting():
+        if deletion_protection:
+            disable_protection = tf.warning_confirmation(f"Table '{table_name}' has deletion protection enabled. Disable it?")
+            if disable_protection != "yes":
+                tf.indent_print(f"Skipping deletion of DynamoDB table '{table_name}'...\n")
+                return None
 
-        # Prompt and create backup if table is not empty
+        if has_items:
+            confirm = tf.warning_confirmation(f"Table '{table_name}' is not empty. Delete all items and the table?")
+            print()
+            if confirm != "yes":
+                tf.indent_print(f"Skipping deletion of DynamoDB table '{table_name}'...\n")
+                return None
 
-        prompt_for_deletion = create_dynamodb_table_backup(arn, region)
+            # Ask about a backup if the table is not empty
+            backup_suffix = prompt_dynamodb_table_backup(table_name)
 
-        if prompt_for_deletion:
+    # The backup is created after the prompt lock is released, since its retries can take several seconds
+    if backup_suffix is not None and create_dynamodb_table_backup(arn, region, backup_suffix):
+        with tf.prompting():
             delete = tf.warning_confirmation(f"Backup of table '{table_name}' could not be created. Do you still want to delete the table?")
 
-            if delete != "yes":
-                tf.indent_print(f"Skipping deletion of DynamoDB table '{table_name}'...\n")
-                return None
+        if delete != "yes":
+            tf.indent_print(f"Skipping deletion of DynamoDB table '{table_name}'...\n")
+            return None
+
+    # Deletion protection is only disabled once every prompt has been confirmed
+    if deletion_protection:
+        response = client.update_table(TableName=table_name, DeletionProtectionEnabled=False)
+        tf.success_print(f"Deletion protection disabled for table '{table_name}'")
+        tf.api_response_print(response)
 
     # Delete the table
     tf.subheader_print(f"Proceeding with deletion of DynamoDB table '{table_name}'")
@@ -800,7 +888,7 @@ def delete_dynamodb_table(arn: str, region: str) -> list[dict] | None:
                     "region": region,
                 }
             ]
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
         if billing_mode == "PAY_PER_REQUEST":
             return None
@@ -812,7 +900,7 @@ def delete_dynamodb_table(arn: str, region: str) -> list[dict] | None:
             delete_application_autoscaling(service_namespace, f"table/{table_name}/index/{gsi}", region)
 
     except botocore.exceptions.ClientError as e:
-        error_code = e.response["Error"]["Code"]
+        error_code = client_error_code(e)
         if error_code == "ValidationException" and "has acted as a source region for new replica(s)" in e.response["Error"]["Message"]:
             tf.failure_print(f"Cannot delete table '{table_name}': It was used to provision replicas in the last 24 hours.\n")
             tf.indent_print("You must either:", 6)
@@ -838,14 +926,14 @@ def deregister_ami(arn: str, region: str) -> None:
 
     tf.header_print(f"Deregistering AMI '{ami_id}' in {region}...")
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     response = client.deregister_image(ImageId=ami_id)
 
     if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
         tf.success_print(f"AMI '{ami_id}' was successfully deregistered")
     else:
         tf.failure_print(f"AMI '{ami_id}' was not successfully deregistered")
-    tf.response_print(json.dumps(response, indent=4, default=str))
+    tf.api_response_print(response)
 
 
 def delete_ec2_instance(arn: str, region: str, autoscaling: bool = False) -> None:
@@ -854,8 +942,8 @@ def delete_ec2_instance(arn: str, region: str, autoscaling: bool = False) -> Non
 
     Can be called by the main delete function or by delete_autoscaling_group.
 
-    1. A describe_instance request is first made to check if the instance exists and has not already been terminated.
-    2. If it hasn't, the termination request is made.
+    1. The termination request is made directly. If the instance doesn't exist or was already terminated or shutting down, it is skipped.
+    2. Otherwise the instance is now shutting down.
     3. If the instance was not terminated as part of an autoscaling group deletion, the ec2_waiter function is called to ensure the instance is
     fully terminated to avoid any dependency issues.
     4. If the instance was terminated as part of an autoscaling group deletion, the ec2_waiter function is called by the delete_autoscaling_group
@@ -867,7 +955,7 @@ def delete_ec2_instance(arn: str, region: str, autoscaling: bool = False) -> Non
         autoscaling (bool, optional): Whether or not the function was called by delete_autoscaling_group. Defaults to False.
     """
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     instance_id = arn.split("/")[-1]
 
     if autoscaling:
@@ -875,40 +963,22 @@ def delete_ec2_instance(arn: str, region: str, autoscaling: bool = False) -> Non
     else:
         tf.header_print(f"Terminating EC2 instance '{instance_id}' in {region}...")
 
-    try:
-        response = client.describe_instances(InstanceIds=[instance_id])
-
-    except botocore.exceptions.ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "")
-
-        if error_code == "InvalidInstanceID.NotFound":
-            tf.success_print(f"EC2 instance '{instance_id}' not found. It may have already been terminated.\n")
-            return
-
-        else:
-            tf.failure_print(f"Error describing EC2 instance '{instance_id}': {e}\n")
-            raise
-
-    if not response["Reservations"]:
-        tf.success_print(f"EC2 instance '{instance_id}' not found. It may have already been terminated.\n")
-        return
-
-    instance_status = response["Reservations"][0]["Instances"][0]["State"]["Name"]
-
-    if instance_status in ["terminated", "shutting-down"]:
-        tf.success_print(f"Current status of EC2 instance '{instance_id}' is: '{instance_status}'. Skipping...\n")
-        return
-
+    # terminate_instances is idempotent, so the instance's previous state comes from its response instead of a separate describe call
     try:
         response = client.terminate_instances(InstanceIds=[instance_id])
         status_code = response["ResponseMetadata"]["HTTPStatusCode"]
 
-        if 200 <= status_code < 300:
-            tf.success_print(f"EC2 instance '{instance_id}' is shutting down.")
-        else:
+        if not 200 <= status_code < 300:
             raise RuntimeError(f"Failed to initiate termination of EC2 instance '{instance_id}': Status Code: {status_code}")
 
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        previous_status = response["TerminatingInstances"][0]["PreviousState"]["Name"]
+
+        if previous_status in ["terminated", "shutting-down"]:
+            tf.success_print(f"Current status of EC2 instance '{instance_id}' is: '{previous_status}'. Skipping...\n")
+            return
+
+        tf.success_print(f"EC2 instance '{instance_id}' is shutting down.")
+        tf.api_response_print(response)
 
         if not autoscaling:
             tf.indent_print(f"Waiting for EC2 instance '{instance_id}' to terminate to avoid dependency violations...\n")
@@ -917,6 +987,10 @@ def delete_ec2_instance(arn: str, region: str, autoscaling: bool = False) -> Non
             print()
 
     except botocore.exceptions.ClientError as e:
+        if client_error_code(e) == "InvalidInstanceID.NotFound":
+            tf.success_print(f"EC2 instance '{instance_id}' not found. It may have already been terminated.\n")
+            return
+
         tf.failure_print(f"ClientError while terminating EC2 instance '{instance_id}':")
         tf.indent_print(f"{e}", 6)
         raise
@@ -930,7 +1004,7 @@ def delete_ec2_instance(arn: str, region: str, autoscaling: bool = False) -> Non
 def ec2_waiter(instance_ids: list[str], region: str) -> None:
     """Wait for list of EC2 instances to be fully terminated."""
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     waiter = client.get_waiter("instance_terminated")
     waiter.wait(InstanceIds=instance_ids, WaiterConfig={"Delay": 15, "MaxAttempts": 20})
 
@@ -940,7 +1014,7 @@ def ec2_waiter(instance_ids: list[str], region: str) -> None:
 def release_eip(arn: str, region: str) -> None:
     """Release an elastic IP address in a given region by ARN."""
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     allocation_id = arn.split("/")[-1]
     tf.header_print(f"Releasing Elastic IP '{allocation_id}' in {region}...")
     response = client.release_address(AllocationId=allocation_id)
@@ -948,7 +1022,53 @@ def release_eip(arn: str, region: str) -> None:
         tf.success_print(f"Elastic IP '{allocation_id}' was successfully released")
     else:
         tf.failure_print(f"Elastic IP '{allocation_id}' was not successfully released")
-    tf.response_print(json.dumps(response, indent=4, default=str))
+    tf.api_response_print(response)
+
+
+# VPC attachments of every internet gateway, cached per region so deleting several gateways takes one describe call
+_internet_gateway_attachments: dict[str, dict[str, list[str]]] = {}
+_internet_gateway_attachments_lock = threading.Lock()
+
+
+def get_internet_gateway_attachments(gateway_id: str, region: str) -> list[str]:
+    """
+    Get the IDs of the VPCs an internet gateway is attached to, removing them from the cache
+
+    The first call for a region describes all internet gateways in it and caches their attachments. Gateways missing
+    from the cache (e.g. created after it was built) are described individually.
+
+    Args:
+        gateway_id (str): ID of the internet gateway
+        region (str): The region the internet gateway is in
+
+    Returns:
+        list[str]: IDs of the attached VPCs
+    """
+
+    client = get_client("ec2", region)
+
+    with _internet_gateway_attachments_lock:
+        if region not in _internet_gateway_attachments:
+            _internet_gateway_attachments[region] = {
+                igw["InternetGatewayId"]: [attachment["VpcId"] for attachment in igw.get("Attachments", []) if attachment.get("VpcId")]
+                for page in client.get_paginator("describe_internet_gateways").paginate()
+                for igw in page["InternetGateways"]
+            }
+
+        vpc_ids = _internet_gateway_attachments[region].pop(gateway_id, None)
+
+    if vpc_ids is None:
+        response = client.describe_internet_gateways(InternetGatewayIds=[gateway_id])
+        vpc_ids = [attachment["VpcId"] for attachment in response["InternetGateways"][0].get("Attachments", []) if attachment.get("VpcId")]
+
+    return vpc_ids
+
+
+def clear_internet_gateway_attachments() -> None:
+    """Remove all cached internet gateway attachments."""
+
+    with _internet_gateway_attachments_lock:
+        _internet_gateway_attachments.clear()
 
 
 def delete_internet_gateway(arn: str, region: str, dependency_checker: bool = False) -> None:
@@ -963,7 +1083,7 @@ def delete_internet_gateway(arn: str, region: str, dependency_checker: bool = Fa
         region (str): The region the internet gateway is in
     """
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     gateway_id = arn.split("/")[-1]
     if dependency_checker:
         tf.subheader_print(f"Deleting Internet Gateway '{gateway_id}' in {region}...")
@@ -973,14 +1093,9 @@ def delete_internet_gateway(arn: str, region: str, dependency_checker: bool = Fa
     # Detach Internet Gateway if it is attached to a VPC
     tf.subheader_print("Checking for VPC attachments...")
     try:
-        response = client.describe_internet_gateways(InternetGatewayIds=[gateway_id])
-        attachments = response.get("InternetGateways", [])[0].get("Attachments", [])
-
-        for attachment in attachments:
-            vpc_id = attachment.get("VpcId")
-            if vpc_id:
-                client.detach_internet_gateway(InternetGatewayId=gateway_id, VpcId=vpc_id)
-                tf.success_print(f"Internet Gateway '{gateway_id}' was successfully detached from VPC {vpc_id}")
+        for vpc_id in get_internet_gateway_attachments(gateway_id, region):
+            client.detach_internet_gateway(InternetGatewayId=gateway_id, VpcId=vpc_id)
+            tf.success_print(f"Internet Gateway '{gateway_id}' was successfully detached from VPC {vpc_id}")
 
     except botocore.exceptions.ClientError as e:
         tf.failure_print(f"Failed to detach Internet Gateway '{gateway_id}', error: {str(e)}")
@@ -996,7 +1111,7 @@ def delete_internet_gateway(arn: str, region: str, dependency_checker: bool = Fa
             tf.success_print(f"Internet gateway '{gateway_id}' was successfully deleted")
         else:
             tf.failure_print(f"Internet gateway '{gateway_id}' was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
     except botocore.exceptions.ClientError as e:
         tf.failure_print(f"Failed to delete '{gateway_id}': {str(e)}\n")
@@ -1017,7 +1132,7 @@ def delete_launch_template(arn: str, region: str) -> None:
         botocore.exceptions.ClientError: Any client errors that occur during the process
     """
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     template_id = arn.split("/")[-1]
 
     tf.header_print(f"Deleting Launch Template '{template_id}' in {region}...")
@@ -1028,10 +1143,10 @@ def delete_launch_template(arn: str, region: str) -> None:
             tf.success_print(f"Launch template '{template_id}' was successfully deleted")
         else:
             tf.failure_print(f"Launch template '{template_id}' was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
     except botocore.exceptions.ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "")
+        error_code = client_error_code(e)
         if error_code == "InvalidLaunchTemplateName.NotFoundException":
             tf.success_print(f"Launch template '{template_id}' not found. It may have already been deleted.\n")
             return None
@@ -1052,7 +1167,7 @@ def delete_nat_gateway(arn: str, region: str, dependency_checker: bool = False)
         region (str): The region the NAT gateway is in
     """
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     nat_gateway_id = arn.split("/")[-1]
     if dependency_checker:
         tf.subheader_print(f"Deleting Nat Gateway '{nat_gateway_id}' in {region}...")
@@ -1073,7 +1188,7 @@ def delete_nat_gateway(arn: str, region: str, dependency_checker: bool = False)
             WaiterConfig={"Delay": 10, "MaxAttempts": 12},
         )
         tf.success_print(f"Nat gateway '{nat_gateway_id}' has been fully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
     except Exception as e:
         tf.failure_print(f"Nat gateway '{nat_gateway_id}' was not fully deleted: {e}\n")
         return None
@@ -1084,7 +1199,7 @@ def delete_nat_gateway(arn: str, region: str, dependency_checker: bool = False)
 def delete_route_table(arn: str, region: str, dependency_checker=False) -> None:
     """Delete a route table in a given region by ARN."""
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     route_table_id = arn.split("/")[-1]
     if dependency_checker:
         tf.subheader_print(f"Deleting route table '{route_table_id}' in {region}...")
@@ -1096,7 +1211,7 @@ def delete_route_table(arn: str, region: str, dependency_checker=False) -> None:
         tf.success_print(f"Route table '{route_table_id}' was successfully deleted")
     else:
         tf.failure_print(f"Route table '{route_table_id}' was not successfully deleted")
-    tf.response_print(json.dumps(response, indent=4, default=str))
+    tf.api_response_print(response)
 
     return None
 
@@ -1118,7 +1233,7 @@ def delete_security_group(arn: str, region: str, dependency_checker: bool = Fals
         botocore.exceptions.ClientError: Any client errors that occur during the process
     """
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     sg_id = arn.split("/")[-1]
 
     if dependency_checker:
@@ -1126,16 +1241,64 @@ def delete_security_group(arn: str, region: str, dependency_checker: bool = Fals
     else:
         tf.header_print(f"Deleting security group '{sg_id}' in {region}...")
 
+    response = client.delete_security_group(GroupId=sg_id)
+    tf.success_print(f"Security group '{sg_id}' was successfully deleted")
+    tf.api_response_print(response)
+
+
+def delete_security_groups(security_groups: list[dict[str, str]], region: str) -> list[dict[str, str]]:
+    """
+    Delete several security groups in a given region at the same time
+
+    Used by delete_vpc. Security groups in the same VPC often reference each other in their rules, which blocks
+    deletion, so rules that reference another group being deleted are revoked first. The groups are then deleted
+    concurrently with delete_security_group.
+
+    Args:
+        security_groups (list[dict[str, str]]): Security group resources to delete
+        region (str): The region the security groups are in
+
+    Returns:
+        list[dict[str, str]]: Security groups that could not be deleted and should be retried
+    """
+    from awsweepbytag import main_delete as md
+
+    client = get_client("ec2", region)
+    sg_ids = {sg["arn"].split("/")[-1] for sg in security_groups}
+
+    tf.subheader_print(f"Removing rules that reference other security groups in '{', '.join(sorted(sg_ids))}'...")
+
     try:
-        response = client.delete_security_group(GroupId=sg_id)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.success_print(f"Security group '{sg_id}' was successfully deleted")
-        else:
-            tf.failure_print(f"Security group '{sg_id}' was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        described_groups = client.describe_security_groups(GroupIds=sorted(sg_ids))["SecurityGroups"]
+    except botocore.exceptions.ClientError as e:
+        tf.failure_print(f"Error describing security groups: {e}")
+        described_groups = []
+
+    for group in described_groups:
+        for permissions_key, revoke in (
+            ("IpPermissions", client.revoke_security_group_ingress),
+            ("IpPermissionsEgress", client.revoke_security_group_egress),
+        ):
+            referencing_permissions = [
+                permission
+                for permission in group.get(permissions_key, [])
+                if any(pair.get("GroupId") in sg_ids for pair in permission.get("UserIdGroupPairs", []))
+            ]
+            if not referencing_permissions:
+                continue
 
-    except:
-        raise
+            try:
+                revoke(GroupId=group["GroupId"], IpPermissions=referencing_permissions)
+            except botocore.exceptions.ClientError as e:
+                tf.failure_print(f"Error removing rules from security group '{group['GroupId']}': {e}")
+
+    failed_deletions = []
+    with ThreadPoolExecutor(max_workers=min(len(security_groups), MAX_WORKERS)) as executor:
+        for result in executor.map(lambda sg: md.delete_resource(sg, True), security_groups):
+            if result:
+                failed_deletions.extend(result)
+
+    return failed_deletions
 
 
 def delete_snapshot(arn: str, region: str) -> None:
@@ -1145,17 +1308,17 @@ def delete_snapshot(arn: str, region: str) -> None:
 
     tf.header_print(f"Deleting snapshot '{snapshot_id}' in {region}...")
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     try:
         response = client.delete_snapshot(SnapshotId=snapshot_id)
         if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
             tf.success_print(f"Snapshot '{snapshot_id}' was successfully deleted")
         else:
             tf.failure_print(f"Snapshot '{snapshot_id}' was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
     except botocore.exceptions.ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code", "")
+        error_code = client_error_code(e)
 
         if error_code == "InvalidSnapshot.NotFound":
             tf.success_print(f"Snapshot '{snapshot_id}' not found. It may have already been deleted.\n")
@@ -1187,7 +1350,7 @@ def delete_subnet(arn: str, region: str, dependency_checker: bool = False) -> li
     from awsweepbytag import dep_checkers
     from awsweepbytag import main_delete as md
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     subnet_id = arn.split("/")[-1]
 
     if dependency_checker:
@@ -1197,15 +1360,15 @@ def delete_subnet(arn: str, region: str, dependency_checker: bool = False) -> li
 
     # Check if subnet still exists
     try:
-        client.describe_subnets(SubnetIds=[subnet_id])
+        vpc_id = client.describe_subnets(SubnetIds=[subnet_id])["Subnets"][0]["VpcId"]
     except botocore.exceptions.ClientError as e:
-        if e.response.get("Error", {}).get("Code") == "InvalidSubnetID.NotFound":
+        if client_error_code(e) == "InvalidSubnetID.NotFound":
             tf.success_print(f"Subnet '{subnet_id}' was already deleted")
             return None
         raise
 
     # Check for and collect dependencies
-    dependencies, skip = dep_checkers.subnet_dependency_checker(arn, region)
+    dependencies, skip = dep_checkers.subnet_dependency_checker(arn, region, vpc_id)
 
     # If user chose to skip deletion, return None
     if skip:
@@ -1261,16 +1424,10 @@ def delete_subnet(arn: str, region: str, dependency_checker: bool = False) -> li
 
     # Delete subnet
     tf.indent_print("Initiating subnet deletion...\n")
-    try:
-        response = client.delete_subnet(SubnetId=subnet_id)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.success_print(f"Subnet '{subnet_id}' was successfully deleted")
-        else:
-            tf.failure_print(f"Subnet '{subnet_id}' was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
-    except botocore.exceptions.ClientError as e:
-        # Re-raise all errors to be handled by delete_resource() in main_delete.py
-        raise
+    # Errors are raised to be handled by delete_resource() in main_delete.py
+    response = client.delete_subnet(SubnetId=subnet_id)
+    tf.success_print(f"Subnet '{subnet_id}' was successfully deleted")
+    tf.api_response_print(response)
 
 
 
@@ -1288,7 +1445,7 @@ def delete_vpc_endpoint(arn: str, region: str, dependency_checker: bool = False)
         region (str): The region the VPC endpoint is in
     """
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     endpoint_id = arn.split("/")[-1]
 
     if dependency_checker:
@@ -1310,7 +1467,7 @@ def delete_vpc_endpoint(arn: str, region: str, dependency_checker: bool = False)
                     tf.success_print(f"VPC endpoint '{resource_id}' was already deleted.")
                 else:
                     tf.failure_print(f"Failed to delete VPC endpoint '{resource_id}': {error_code} - {error_msg}")
-                tf.response_print(json.dumps(response, indent=4, default=str))
+                tf.api_response_print(response)
                 return
 
         # If deletion is successful
@@ -1318,13 +1475,70 @@ def delete_vpc_endpoint(arn: str, region: str, dependency_checker: bool = False)
             tf.success_print(f"VPC endpoint '{endpoint_id}' was successfully deleted")
         else:
             tf.failure_print(f"VPC endpoint '{endpoint_id}' was not successfully delete")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
     except botocore.exceptions.ClientError as e:
         tf.failure_print(f"Failed to delete VPC endpoint '{endpoint_id}': {str(e)}\n")
         return None
 
 
+# Number of VPC endpoints deleted per DeleteVpcEndpoints call
+VPC_ENDPOINT_BATCH_SIZE = 25
+
+
+def delete_vpc_endpoints(endpoints: list[dict[str, str]], region: str) -> list[dict[str, str]]:
+    """
+    Delete several VPC endpoints in a given region with as few calls as possible
+
+    Used by delete_vpc. DeleteVpcEndpoints takes a list of IDs, so endpoints are deleted in batches of
+    VPC_ENDPOINT_BATCH_SIZE instead of one call per endpoint. Endpoints that were already deleted count as deleted.
+
+    Args:
+        endpoints (list[dict[str, str]]): VPC endpoint resources to delete
+        region (str): The region the VPC endpoints are in
+
+    Returns:
+        list[dict[str, str]]: VPC endpoints that could not be deleted and should be retried
+    """
+
+    client = get_client("ec2", region)
+    endpoints_by_id = {endpoint["arn"].split("/")[-1]: endpoint for endpoint in endpoints}
+    endpoint_ids = list(endpoints_by_id)
+    failed_deletions = []
+
+    for i in range(0, len(endpoint_ids), VPC_ENDPOINT_BATCH_SIZE):
+        batch = endpoint_ids[i : i + VPC_ENDPOINT_BATCH_SIZE]
+        tf.subheader_print(f"Deleting VPC endpoints '{', '.join(batch)}' in {region}...")
+
+        try:
+            response = client.delete_vpc_endpoints(VpcEndpointIds=batch)
+        except botocore.exceptions.ClientError as e:
+            tf.failure_print(f"Failed to delete VPC endpoints '{', '.join(batch)}': {str(e)}\n")
+            failed_deletions.extend(endpoints_by_id[endpoint_id] for endpoint_id in batch)
+            continue
+
+        unsuccessful = set()
+        for error in response.get("Unsuccessful", []):
+            error_code = error.get("Error", {}).get("Code")
+            error_msg = error.get("Error", {}).get("Message", "No message provided")
+            resource_id = error.get("ResourceId")
+
+            if error_code == "InvalidVpcEndpoint.NotFound":
+                tf.success_print(f"VPC endpoint '{resource_id}' was already deleted.")
+            else:
+                tf.failure_print(f"Failed to delete VPC endpoint '{resource_id}': {error_code} - {error_msg}")
+                if resource_id in endpoints_by_id:
+                    failed_deletions.append(endpoints_by_id[resource_id])
+            unsuccessful.add(resource_id)
+
+        for endpoint_id in batch:
+            if endpoint_id not in unsuccessful:
+                tf.success_print(f"VPC endpoint '{endpoint_id}' was successfully deleted")
+        tf.api_response_print(response)
+
+    return failed_deletions
+
+
 def delete_vpc(arn: str, region: str) -> None:
     """
     Deletes a VPC and all of its dependencies in a given region by ARN
@@ -1342,7 +1556,7 @@ def delete_vpc(arn: str, region: str) -> None:
     from awsweepbytag import dep_checkers
     from awsweepbytag import main_delete as md
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     vpc_id = arn.split("/")[-1]
     tf.header_print(f"Deleting VPC '{vpc_id}' in {region}...")
 
@@ -1355,7 +1569,17 @@ def delete_vpc(arn: str, region: str) -> None:
     # Delete dependencies if any were found
     if dependencies:
         failed_deletions = []
+        vpc_endpoints = [dependency for dependency in dependencies if dependency["resource_type"] == "vpcendpoint"]
+        security_groups = [dependency for dependency in dependencies if dependency["resource_type"] == "securitygroup"]
+
+        # VPC endpoints are deleted first and together, since a single call can delete several of them
+        if vpc_endpoints:
+            failed_deletions.extend(delete_vpc_endpoints(vpc_endpoints, region))
+
         for dependency in dependencies:
+            if dependency["resource_type"] in ("vpcendpoint", "securitygroup"):
+                continue
+
             result = md.delete_resource(dependency, True)
             if result:
                 if isinstance(result, list):
@@ -1363,6 +1587,10 @@ def delete_vpc(arn: str, region: str) -> None:
                 else:
                     failed_deletions.append(result)
 
+        # Security groups are deleted last and together, since they can only be deleted once nothing else in the VPC uses them
+        if security_groups:
+            failed_deletions.extend(delete_security_groups(security_groups, region))
+
         if failed_deletions:
             md.retry_failed_deletions(failed_deletions)
         else:
@@ -1370,29 +1598,10 @@ def delete_vpc(arn: str, region: str) -> None:
             tf.success_print("All VPC dependencies were successfully deleted.\n")
 
     tf.subheader_print("Deleting VPC...")
-    try:
-        response = client.delete_vpc(VpcId=vpc_id)
-        status_code = response["ResponseMetadata"]["HTTPStatusCode"]
-
-        if 200 <= status_code < 300:
-            tf.success_print(f"VPC '{vpc_id}' was successfully deleted")
-        else:
-            tf.failure_print(f"VPC '{vpc_id}' was not successfully deleted")
-            tf.response_print(json.dumps(response, indent=4, default=str))
-            raise botocore.exceptions.ClientError(
-                error_response={
-                    "Error": {
-                        "Code": "DependencyViolation",
-                        "Message": "VPC deletion failed",
-                    }
-                },
-                operation_name="DeleteVpc",
-            )
-
-        tf.response_print(json.dumps(response, indent=4, default=str))
-
-    except botocore.exceptions.ClientError:
-        raise
+    # A VPC with dependencies left raises a DependencyViolation ClientError, which the retry logic picks up
+    response = client.delete_vpc(VpcId=vpc_id)
+    tf.success_print(f"VPC '{vpc_id}' was successfully deleted")
+    tf.api_response_print(response)
 
     return None
 
@@ -1411,7 +1620,7 @@ def delete_elastic_load_balancer(arn: str, region: str) -> None:
     3. If target groups are attached to other ELBs, the ELB will not be deleted
     4. User is prompted to confirm deletion of listeners and target groups
     5. If target groups are not attached to other ELBs and confirmation is given: the listeners, target groups and finally the ELB are deleted
-    6. After deletion is initiated, a waiter is used to ensure the ELB is fully deleted before exiting the function
+    6. After deletion is initiated, the ELB is polled with exponential backoff until it is fully deleted before exiting the function
 
     Args:
         arn (str): The ARN of the ELB to delete
@@ -1419,7 +1628,7 @@ def delete_elastic_load_balancer(arn: str, region: str) -> None:
     """
 
     tf.header_print(f"Deleting ELB {arn} in {region}...")
-    client = boto3.client("elbv2", region_name=region)
+    client = get_client("elbv2", region)
 
     tf.indent_print("Checking ELB for listeners and target groups...\n")
     response = client.describe_listeners(LoadBalancerArn=arn)
@@ -1435,11 +1644,13 @@ def delete_elastic_load_balancer(arn: str, region: str) -> None:
                     target_group_arns.add(tg["TargetGroupArn"])
 
     # Check if target groups are attached to other ELBs and exit if they are
+    # Target groups are described in batches of 20 rather than one call per target group
     tgs_attached_to_other_elbs = []
-    for tg_arn in target_group_arns:
-        tg_info = client.describe_target_groups(TargetGroupArns=[tg_arn])["TargetGroups"][0]
-        if len(tg_info["LoadBalancerArns"]) > 1:
-            tgs_attached_to_other_elbs.append(tg_arn)
+    sorted_tg_arns = sorted(target_group_arns)
+    for i in range(0, len(sorted_tg_arns), 20):
+        for tg_info in client.describe_target_groups(TargetGroupArns=sorted_tg_arns[i : i + 20])["TargetGroups"]:
+            if len(tg_info["LoadBalancerArns"]) > 1:
+                tgs_attached_to_other_elbs.append(tg_info["TargetGroupArn"])
 
     if tgs_attached_to_other_elbs:
         tf.indent_print("The following target groups are used by other ELBs and will not be deleted:\n")
@@ -1449,62 +1660,79 @@ def delete_elastic_load_balancer(arn: str, region: str) -> None:
         return
 
     # Confirm deletion of listeners and target groups
-    tf.subheader_print(f"Proceeding with deleting ELB {arn} will also delete the following listeners and target groups:")
-    tf.subheader_print("Listeners:", 6)
-    for listener in listener_arns:
-        tf.indent_print(listener, 8)
-    print()
-    tf.subheader_print("Target groups:", 6)
-    for tg in target_group_arns:
-        tf.indent_print(tg, 8)
-    print()
-    delete_tgs_and_listeners = tf.y_n_prompt("Proceed with deletion process?")
-    print()
+    # The lists and the prompt are shown together, so another resource's prompt can't come between them
+    with tf.prompting():
+        tf.subheader_print(f"Proceeding with deleting ELB {arn} will also delete the following listeners and target groups:")
+        tf.subheader_print("Listeners:", 6)
+        for listener in listener_arns:
+            tf.indent_print(listener, 8)
+        print()
+        tf.subheader_print("Target groups:", 6)
+        for tg in target_group_arns:
+            tf.indent_print(tg, 8)
+        print()
+        delete_tgs_and_listeners = tf.y_n_prompt(f"Delete ELB {arn} and its listeners and target groups?")
+        print()
 
     if delete_tgs_and_listeners != "y":
         tf.indent_print("Skipping ELB deletion...")
         return
 
-    # Delete listeners
-    # TODO: Modify to use the delete_listener function instead
-    tf.indent_print("Deleting target groups and listeners...")
-    for listener in listener_arns:
-        response = client.delete_listener(ListenerArn=listener)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.success_print(f"Listener {listener} was successfully deleted")
-        else:
-            tf.failure_print(f"Listener {listener} was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
-
-    # Delete target groups
-    # TODO: Modify to use the delete_target_group function instead
-    tf.indent_print("Deleting target groups...")
-    for tg in target_group_arns:
-        response = client.delete_target_group(TargetGroupArn=tg)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.success_print(f"Target group {tg} was successfully deleted")
-        else:
-            tf.failure_print(f"Target group {tg} was not successfully deleted")
-        tf.response_print(json.dumps(response, indent=4, default=str))
+    # TODO: Modify to use the delete_listener and delete_target_group functions instead
+    # Failed calls raise a ClientError, so reaching the success print means the deletion went through
+    def delete_elb_listener(listener: str) -> None:
+        try:
+            response = client.delete_listener(ListenerArn=listener)
+        except client.exceptions.ListenerNotFoundException:
+            tf.indent_print(f"Listener {listener} was not found and may have already been deleted")
+            return
+        tf.success_print(f"Listener {listener} was successfully deleted")
+        tf.api_response_print(response)
+
+    def delete_elb_target_group(tg: str) -> None:
+        try:
+            response = client.delete_target_group(TargetGroupArn=tg)
+        except client.exceptions.TargetGroupNotFoundException:
+            tf.indent_print(f"Target group {tg} was not found and may have already been deleted")
+            return
+        tf.success_print(f"Target group {tg} was successfully deleted")
+        tf.api_response_print(response)
+
+    # Listeners are deleted concurrently, then target groups (which can't be deleted while a listener still uses them)
+    # Each worker prints its own result, so formatting responses doesn't hold up this thread
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, max(len(listener_arns), len(sorted_tg_arns), 1))) as executor:
+        tf.indent_print("Deleting listeners...")
+        list(executor.map(delete_elb_listener, listener_arns))
+
+        tf.indent_print("Deleting target groups...")
+        list(executor.map(delete_elb_target_group, sorted_tg_arns))
 
     # Delete load balancer
     tf.indent_print("Initiating ELB deletion...")
     response = client.delete_load_balancer(LoadBalancerArn=arn)
-    if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-        tf.success_print(f"Deletion of load balancer {arn} was successfully initiated")
-    else:
-        tf.failure_print(f"Deletion of load balancer {arn} was not successfully initiated")
-    tf.response_print(json.dumps(response, indent=4, default=str))
+    tf.success_print(f"Deletion of load balancer {arn} was successfully initiated")
+    tf.api_response_print(response)
 
     # Check to make sure load balancer is fully deleted
     print()
     tf.indent_print(f"Waiting for ELB {arn} to be fully deleted...")
-    load_balancer_deleted = client.get_waiter("load_balancers_deleted")
-    try:
-        load_balancer_deleted.wait(LoadBalancerArns=[arn], WaiterConfig={"Delay": 10, "MaxAttempts": 12})
-        tf.success_print(f"Load balancer {arn} has been fully deleted")
-    except botocore.exceptions.WaiterError as e:
-        tf.failure_print(f"Load balancer {arn} has not been fully deleted: {e}")
+    # Polled with a short first delay that backs off exponentially, since most load balancers are gone within seconds
+    # The delays add up to roughly the two minutes the load_balancers_deleted waiter allowed
+    max_attempts = 16
+    for attempt in range(max_attempts):
+        try:
+            client.describe_load_balancers(LoadBalancerArns=[arn])
+        except client.exceptions.LoadBalancerNotFoundException:
+            tf.success_print(f"Load balancer {arn} has been fully deleted")
+            break
+        except botocore.exceptions.ClientError as e:
+            tf.failure_print(f"Error checking whether load balancer {arn} has been deleted: {e}")
+            break
+
+        if attempt < max_attempts - 1:
+            time.sleep(backoff_delay(attempt, base=0.5, cap=10.0))
+    else:
+        tf.failure_print(f"Load balancer {arn} has not been fully deleted after {max_attempts} checks")
 
     print()
 
@@ -1520,15 +1748,12 @@ def delete_listener(arn: str, region: str) -> None:
         region (str): The region the listener is in
     """
 
-    client = boto3.client("elbv2", region_name=region)
+    client = get_client("elbv2", region)
     try:
         tf.header_print(f"Deleting listener {arn} in {region}...")
         response = client.delete_listener(ListenerArn=arn)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            print(f"Listener {arn} was successfully deleted")
-        else:
-            print(f"Listener {arn} was not successfully deleted")
-        tf.indent_print(json.dumps(response, indent=4, default=str))
+        tf.indent_print(f"Listener {arn} was successfully deleted")
+        tf.api_response_print(response)
 
     except client.exceptions.ListenerNotFoundException:
         tf.indent_print(f"Listener {arn} was not found and may have already been deleted")
@@ -1546,15 +1771,12 @@ def delete_target_group(arn: str, region: str) -> None:
         arn (str): The ARN of the target group to delete
         region (str): The region the target group is in
     """
-    client = boto3.client("elbv2", region_name=region)
+    client = get_client("elbv2", region)
     try:
         tf.header_print(f"Deleting target group {arn} in {region}...")
         response = client.delete_target_group(TargetGroupArn=arn)
-        if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-            tf.indent_print(f"Target group {arn} was successfully deleted")
-        else:
-            tf.indent_print(f"Target group {arn} was not successfully deleted")
-        tf.indent_print(json.dumps(response, indent=4, default=str))
+        tf.indent_print(f"Target group {arn} was successfully deleted")
+        tf.api_response_print(response)
 
     except client.exceptions.TargetGroupNotFoundException:
         tf.indent_print(f"Target group {arn} was not found and may have already been deleted")
@@ -1573,13 +1795,10 @@ def delete_target_group(arn: str, region: str) -> None:
 
 def delete_lambda_function(arn: str, region: str) -> None:
     tf.header_print(f"Deleting Lambda function {arn} in {region}...")
-    client = boto3.client("lambda", region_name=region)
+    client = get_client("lambda", region)
     response = client.delete_function(FunctionName=arn)
-    if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-        tf.indent_print(f"Lambda function {arn} was successfully deleted")
-    else:
-        tf.indent_print(f"Lambda function {arn} was not successfully deleted")
-    tf.indent_print(json.dumps(response, indent=4, default=str))
+    tf.indent_print(f"Lambda function {arn} was successfully deleted")
+    tf.api_response_print(response)
 
     print()
 
@@ -1589,69 +1808,276 @@ def delete_lambda_function(arn: str, region: str) -> None:
 #####################################################################
 
 
-def delete_s3_bucket(arn: str, region: str) -> None:
+# Maximum number of delete_objects calls in flight while emptying a bucket
+S3_DELETE_WORKERS = 8
+
+# When True, non-empty buckets are given a lifecycle rule that expires their contents instead of being emptied
+# with list and delete calls. Set by the --lifecycle command line flag.
+EXPIRE_S3_OBJECTS = False
+
+S3_EXPIRATION_RULES = [
+    {
+        "ID": "awsweepbytag-expire-objects",
+        "Status": "Enabled",
+        "Filter": {"Prefix": ""},
+        "Expiration": {"Days": 1},
+        "NoncurrentVersionExpiration": {"NoncurrentDays": 1},
+        "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 1},
+    },
+    {
+        "ID": "awsweepbytag-expire-delete-markers",
+        "Status": "Enabled",
+        "Filter": {"Prefix": ""},
+        "Expiration": {"ExpiredObjectDeleteMarker": True},
+    },
+]
+
+
+def expire_s3_bucket_objects(bucket_name: str, region: str) -> None:
     """
-    Checks to see if bucket has objects. If it does, the user will be prompted if they really
-    want to delete the bucket and all of its objects. Works with versioned as well as unversioned buckets.
+    Replace a bucket's lifecycle configuration with rules that expire all of its contents
+
+    S3 removes the objects, noncurrent versions, delete markers and incomplete multipart uploads itself over the
+    following days, so very large buckets don't have to be listed and deleted 1000 keys at a time. The bucket itself
+    can be deleted by running the sweep again once it is empty.
+
+    Args:
+        bucket_name (str): Name of the bucket to expire the contents of
+        region (str): The region the bucket is in
+    """
+
+    client = get_client("s3", region)
+    response = client.put_bucket_lifecycle_configuration(Bucket=bucket_name, LifecycleConfiguration={"Rules": S3_EXPIRATION_RULES})
+    tf.success_print(f"Lifecycle rules to expire all contents of bucket '{bucket_name}' were applied")
+    tf.indent_print("S3 will remove the contents over the next few days. Run the sweep again afterwards to delete the bucket.\n")
+    tf.api_response_print(response)
+
+
+# Non-empty buckets the user has already agreed to empty, so delete_s3_bucket doesn't prompt for them again
+CONFIRMED_S3_BUCKETS: set[str] = set()
+
+# Versioning status and first listing page of buckets checked by s3_bucket_has_objects, so delete_s3_bucket doesn't
+# fetch them again
+_s3_bucket_listings: dict[str, tuple[bool, dict]] = {}
+_s3_bucket_listings_lock = threading.Lock()
+
+
+def list_s3_bucket_first_page(bucket_name: str, region: str) -> tuple[bool, dict]:
+    """
+    Get whether a bucket is versioned and the first page of its objects, or of its versions and delete markers
+
+    Args:
+        bucket_name (str): Name of the bucket to list
+        region (str): The region the bucket is in
+
+    Returns:
+        tuple[bool, dict]: Whether versioning is enabled, and the first list_object_versions or list_objects_v2 response
+
+    Raises:
+        botocore.exceptions.ClientError: If the bucket cannot be listed (e.g. it no longer exists)
     """
-    client = boto3.client("s3", region_name=region)
-    bucket_name = arn.split(":")[-1]
+
+    client = get_client("s3", region)
+    is_versioned = client.get_bucket_versioning(Bucket=bucket_name).get("Status") == "Enabled"
+    if is_versioned:
+        return is_versioned, client.list_object_versions(Bucket=bucket_name)
+    return is_versioned, client.list_objects_v2(Bucket=bucket_name)
+
+
+def s3_bucket_listing_has_objects(is_versioned: bool, first_page: dict) -> bool:
+    """
+    Check whether the first listing page of a bucket contains any objects, versions or delete markers
+
+    Args:
+        is_versioned (bool): Whether versioning is enabled on the bucket
+        first_page (dict): First list_object_versions or list_objects_v2 response
+
+    Returns:
+        bool: True if the bucket has contents
+    """
+
+    if is_versioned:
+        return "Versions" in first_page or "DeleteMarkers" in first_page
+    return "Contents" in first_page
+
+
+def s3_bucket_has_objects(arn: str, region: str) -> bool:
+    """
+    Check whether a bucket contains any objects, or any versions or delete markers if it is versioned
+
+    The versioning status and first page are cached for delete_s3_bucket, so deleting the bucket doesn't list it again.
+
+    Args:
+        arn (str): The ARN of the bucket to check
+        region (str): The region the bucket is in
+
+    Returns:
+        bool: True if the bucket has contents, False if it is empty or could not be checked
+    """
+
+    bucket_name = parse_arn(arn).resource_id
 
     try:
-        tf.header_print(f"Deleting S3 bucket {bucket_name} in {region}...")
-        # Check if versioning is enabled
-        versioning = client.get_bucket_versioning(Bucket=bucket_name)
-        is_versioned = versioning.get("Status") == "Enabled"
+        is_versioned, first_page = list_s3_bucket_first_page(bucket_name, region)
+
+    # Errors (e.g. the bucket no longer exists) are reported when the bucket is deleted
+    except botocore.exceptions.ClientError:
+        return False
 
-        has_objects = False
+    with _s3_bucket_listings_lock:
+        _s3_bucket_listings[bucket_name] = (is_versioned, first_page)
 
-        if is_versioned:
-            response = client.list_object_versions(Bucket=bucket_name, MaxKeys=1)
-            has_objects = "Versions" in response or "DeleteMarkers" in response
-        else:
-            response = client.list_objects_v2(Bucket=bucket_name, MaxKeys=1)
-            has_objects = "Contents" in response
+    return s3_bucket_listing_has_objects(is_versioned, first_page)
 
-        if has_objects:
-            confirm = tf.warning_confirmation(
-                f"S3 bucket {bucket_name} is not empty. Are you sure you want to delete all contents and the bucket?"
+
+def clear_s3_bucket_listings() -> None:
+    """Remove all cached bucket versioning statuses and first pages."""
+
+    with _s3_bucket_listings_lock:
+        _s3_bucket_listings.clear()
+
+
+def list_s3_bucket_pages(bucket_name: str, region: str, is_versioned: bool, first_page: dict | None = None) -> Iterator[dict]:
+    """
+    List every page of a bucket's objects, or of its versions and delete markers if the bucket is versioned
+
+    Args:
+        bucket_name (str): Name of the bucket to list
+        region (str): The region the bucket is in
+        is_versioned (bool): Whether versioning is enabled on the bucket
+        first_page (dict | None, optional): First page if it has already been listed, so listing continues after it.
+            Defaults to None.
+
+    Yields:
+        dict: Each list_object_versions or list_objects_v2 response
+    """
+
+    client = get_client("s3", region)
+    paginator = client.get_paginator("list_object_versions" if is_versioned else "list_objects_v2")
+
+    if first_page is None:
+        yield from paginator.paginate(Bucket=bucket_name)
+        return
+
+    yield first_page
+    if not first_page.get("IsTruncated"):
+        return
+
+    if is_versioned:
+        yield from paginator.paginate(
+            Bucket=bucket_name, KeyMarker=first_page["NextKeyMarker"], VersionIdMarker=first_page["NextVersionIdMarker"]
+        )
+    else:
+        yield from paginator.paginate(Bucket=bucket_name, ContinuationToken=first_page["NextContinuationToken"])
+
+
+def empty_s3_bucket(bucket_name: str, region: str, is_versioned: bool, first_page: dict | None = None) -> list[dict]:
+    """
+    Delete every object in a bucket, including all versions and delete markers if the bucket is versioned
+
+    Each page of up to 1000 keys is handed to a thread pool as soon as it is listed, so the next page is listed while
+    earlier pages are being deleted. At most twice S3_DELETE_WORKERS pages are held at once. Deletes are sent in quiet
+    mode so responses only list the objects that could not be deleted.
+
+    Args:
+        bucket_name (str): Name of the bucket to empty
+        region (str): The region the bucket is in
+        is_versioned (bool): Whether versioning is enabled on the bucket
+        first_page (dict | None, optional): First page of the listing if it has already been fetched, so it isn't
+            listed twice. Defaults to None.
+
+    Returns:
+        list[dict]: Errors returned by delete_objects, empty if every object was deleted
+    """
+
+    client = get_client("s3", region)
+    listed_pages = list_s3_bucket_pages(bucket_name, region, is_versioned, first_page)
+
+    if is_versioned:
+        pages = (
+            [
+                {"Key": version["Key"], "VersionId": version["VersionId"]}
+                for version in chain(page.get("Versions", []), page.get("DeleteMarkers", []))
+            ]
+            for page in listed_pages
+        )
+    else:
+        pages = ([{"Key": obj["Key"]} for obj in page.get("Contents", [])] for page in listed_pages)
+
+    errors = []
+    in_flight: deque[Future] = deque()
+
+    with ThreadPoolExecutor(max_workers=S3_DELETE_WORKERS) as executor:
+        for objects_to_delete in pages:
+            if not objects_to_delete:
+                continue
+            if len(in_flight) >= 2 * S3_DELETE_WORKERS:
+                errors.extend(in_flight.popleft().result().get("Errors", []))
+            in_flight.append(
+                executor.submit(client.delete_objects, Bucket=bucket_name, Delete={"Objects": objects_to_delete, "Quiet": True})
             )
+
+        for future in in_flight:
+            errors.extend(future.result().get("Errors", []))
+
+    return errors
+
+
+def delete_s3_bucket(arn: str, region: str) -> None:
+    """
+    Checks to see if bucket has objects. If it does, the user will be prompted if they really
+    want to delete the bucket and all of its objects, unless the bucket is in CONFIRMED_S3_BUCKETS. Works with
+    versioned as well as unversioned buckets.
+
+    If EXPIRE_S3_OBJECTS is True, a non-empty bucket is given lifecycle rules that expire its contents
+    instead of being emptied, and is left to be deleted by a later sweep.
+    """
+    client = get_client("s3", region)
+    bucket_name = parse_arn(arn).resource_id
+
+    try:
+        tf.header_print(f"Deleting S3 bucket {bucket_name} in {region}...")
+        # Reuse the listing from s3_bucket_has_objects if the bucket was already checked. It is removed from the cache
+        # so a retry lists the bucket again. The first page is kept so emptying the bucket starts from it.
+        with _s3_bucket_listings_lock:
+            listing = _s3_bucket_listings.pop(bucket_name, None)
+        is_versioned, first_page = listing or list_s3_bucket_first_page(bucket_name, region)
+
+        if s3_bucket_listing_has_objects(is_versioned, first_page):
+            if bucket_name in CONFIRMED_S3_BUCKETS:
+                confirm = "yes"
+            elif EXPIRE_S3_OBJECTS:
+                confirm = tf.warning_confirmation(
+                    f"S3 bucket {bucket_name} is not empty. Its lifecycle configuration will be replaced with rules that expire all of "
+                    "its contents, overwriting any existing lifecycle rules. Are you sure you want to expire the contents of the bucket?"
+                )
+            else:
+                confirm = tf.warning_confirmation(
+                    f"S3 bucket {bucket_name} is not empty. Are you sure you want to delete all contents and the bucket?"
+                )
             if confirm != "yes":
                 tf.indent_print(f"Skipping deletion of bucket '{bucket_name}'.")
                 return
 
-            tf.indent_print(f"Emptying bucket '{bucket_name}'...")
+            if EXPIRE_S3_OBJECTS:
+                expire_s3_bucket_objects(bucket_name, region)
+                return
 
-            if is_versioned:
-                paginator = client.get_paginator("list_object_versions")
-                for page in paginator.paginate(Bucket=bucket_name):
-                    objects_to_delete = []
-                    for version in page.get("Versions", []):
-                        objects_to_delete.append({"Key": version["Key"], "VersionId": version["VersionId"]})
-                    for marker in page.get("DeleteMarkers", []):
-                        objects_to_delete.append({"Key": marker["Key"], "VersionId": marker["VersionId"]})
-                    if objects_to_delete:
-                        response = client.delete_objects(Bucket=bucket_name, Delete={"Objects": objects_to_delete})
-                        errors = response.get("Errors", [])
-                        if errors:
-                            tf.indent_print(f"One or more objects in {bucket_name} encountered errors during the deletion process:")
-                            tf.indent_print(json.dumps(errors, indent=4, default=str))
-                            tf.indent_print("Bucket cannot be deleted at this time. Exiting...")
-                            print()
-                            return
+            tf.indent_print(f"Emptying bucket '{bucket_name}'...")
 
-            else:
-                paginator = client.get_paginator("list_objects_v2")
-                for page in paginator.paginate(Bucket=bucket_name):
-                    objects_to_delete = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
-                    if objects_to_delete:
-                        client.delete_objects(Bucket=bucket_name, Delete={"Objects": objects_to_delete})
+            errors = empty_s3_bucket(bucket_name, region, is_versioned, first_page)
+            if errors:
+                tf.indent_print(f"One or more objects in {bucket_name} encountered errors during the deletion process:")
+                tf.indent_print(json.dumps(errors, indent=4, default=str))
+                tf.indent_print("Bucket cannot be deleted at this time. Exiting...")
+                print()
+                return
 
         # Delete the bucket
         tf.indent_print(f"Deleting bucket '{bucket_name}'...")
         response = client.delete_bucket(Bucket=bucket_name)
         tf.success_print(f"\nS3 bucket '{bucket_name}' successfully deleted.")
-        tf.indent_print(json.dumps(response, indent=4, default=str))
+        tf.api_response_print(response)
 
     except client.exceptions.NoSuchBucket:
         tf.header_print(f"Bucket {bucket_name} in {region} does not exist.")
@@ -1665,20 +2091,38 @@ def delete_s3_bucket(arn: str, region: str) -> None:
 
 
 def delete_sns_topic(arn: str, region: str) -> None:
-    client = boto3.client("sns", region_name=region)
+    """
+    Delete an SNS topic in a given region by ARN
+
+    If the topic has subscriptions, all of them are listed and the user is asked to confirm before the topic is deleted.
+    Every page of subscriptions is listed, so topics with more than one page are shown in full, and topics without any
+    stop after the first page.
+
+    Args:
+        arn (str): The ARN of the SNS topic to delete
+        region (str): The region the SNS topic is in
+    """
+
+    client = get_client("sns", region)
     topic_arn = arn
     tf.header_print(f"Deleting SNS topic {topic_arn} in {region}...")
 
-    response = client.list_subscriptions_by_topic(TopicArn=topic_arn)
-    subscriptions = response.get("Subscriptions", [])
-    if subscriptions:
-        tf.indent_print(f"{tf.Format.yellow}SNS topic has the following subscriptions:{tf.Format.end}")
-        for subscription in subscriptions:
-            tf.indent_print(json.dumps(subscription, indent=4, default=str), 6)
-        confirm = tf.y_n_prompt("Do you wish to proceed with deleting the topic and all of its subscriptions?")
+    pages = iter(client.get_paginator("list_subscriptions_by_topic").paginate(TopicArn=topic_arn))
+    first_page = next(pages, {})
+    if first_page.get("Subscriptions"):
+        # Every page is listed before prompting, so no API calls are made while other threads wait to prompt
+        remaining_subscriptions = (subscription for page in pages for subscription in page.get("Subscriptions", []))
+        subscriptions = list(chain(first_page["Subscriptions"], remaining_subscriptions))
+
+        # The subscriptions and the prompt are shown together, so another resource's prompt can't come between them
+        with tf.prompting():
+            tf.indent_print(f"{tf.Format.yellow}SNS topic {topic_arn} has the following subscriptions:{tf.Format.end}")
+            for subscription in subscriptions:
+                tf.indent_print(json.dumps(subscription, indent=4, default=str), 6)
+            confirm = tf.y_n_prompt(f"Do you wish to proceed with deleting SNS topic {topic_arn} and all of its subscriptions?")
 
         if confirm != "y":
-            tf.indent_print("Skipping SNS topic deletion...\n")
+            tf.indent_print(f"Skipping deletion of SNS topic {topic_arn}...\n")
             return
 
     print()
@@ -1687,22 +2131,57 @@ def delete_sns_topic(arn: str, region: str) -> None:
         tf.success_print(f"SNS topic {topic_arn} was successfully deleted")
     else:
         tf.failure_print(f"SNS topic {topic_arn} was not successfully deleted")
-    tf.response_print(json.dumps(response, indent=4, default=str))
+    tf.api_response_print(response)
 
 
 #####################################################################
 # SQS Service
 #####################################################################
 
+# Domain used in SQS queue URLs for each AWS partition
+SQS_PARTITION_DOMAINS = {
+    "aws": "amazonaws.com",
+    "aws-cn": "amazonaws.com.cn",
+    "aws-us-gov": "amazonaws.com",
+}
+
 
 def delete_sqs_queue(arn: str, region: str) -> None:
-    client = boto3.client("sqs", region_name=region)
-    queue_name = arn.split(":")[-1]
+    """
+    Delete an SQS queue in a given region by ARN
+
+    The queue URL is built from the ARN instead of being looked up with get_queue_url, saving a
+    round trip per queue. If the built URL is rejected (e.g. a non-standard endpoint), the URL is
+    looked up with get_queue_url and the deletion is tried again.
+
+    Args:
+        arn (str): The ARN of the SQS queue to delete
+        region (str): The region the SQS queue is in
+
+    Raises:
+        botocore.exceptions.ClientError: If the queue could not be deleted
+    """
+
+    # The ARN's region is used for the client so each queue is deleted through its own region's endpoint
+    partition, _, queue_region, account_id, queue_name = parse_arn(arn)
+    client = get_client("sqs", queue_region)
     tf.header_print(f"Deleting SQS queue {queue_name} in {region}...")
-    queue_url = client.get_queue_url(QueueName=queue_name)["QueueUrl"]
-    response = client.delete_queue(QueueUrl=queue_url)
-    if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
-        tf.success_print(f"SQS queue {arn} was successfully deleted")
-    else:
-        tf.failure_print(f"SQS queue {arn} was not successfully deleted")
-    tf.response_print(json.dumps(response, indent=4, default=str))
+
+    domain = SQS_PARTITION_DOMAINS.get(partition, "amazonaws.com")
+    queue_url = f"https://sqs.{queue_region}.{domain}/{account_id}/{queue_name}"
+
+    try:
+        response = client.delete_queue(QueueUrl=queue_url)
+    except botocore.exceptions.ClientError as e:
+        if client_error_code(e) not in (
+            "AWS.SimpleQueueService.NonExistentQueue",
+            "QueueDoesNotExist",
+            "InvalidAddress",
+        ):
+            raise
+        queue_url = client.get_queue_url(QueueName=queue_name, QueueOwnerAWSAccountId=account_id)["QueueUrl"]
+        response = client.delete_queue(QueueUrl=queue_url)
+
+    # Failed calls raise a ClientError (after botocore's retries), so reaching this point means the queue was deleted
+    tf.success_print(f"SQS queue {arn} was successfully deleted")
+    tf.api_response_print(response)
@@ -1,77 +1,86 @@
-"""Map services and resource types to appropriate delete function."""
+"""
+Map services and resource types to appropriate delete function.
+
+DELETE_FUNCTIONS is keyed by (service, resource_type) so each resource needs a single lookup, and is read-only
+since it is shared by every deletion thread. resolve_delete_function caches each lookup together with
+whether the function takes a dependency_checker argument, so the signature is only inspected once per resource type.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable, Mapping
+from types import MappingProxyType
+from typing import Any
 
 from awsweepbytag import delete_functions as df
+from awsweepbytag import text_formatting as tf
+
+
+def not_implemented(arn: str, region: str) -> None:
+    """Placeholder for resource types that are recognized but do not have a delete function yet."""
+
+    tf.header_print(f"No delete function implemented yet for '{arn}' in {region}. Resource must be deleted manually\n")
+
 
 # fmt: off
-DELETE_FUNCTIONS = {
-    "apigateway": {
-        "restapi": df.delete_rest_api,  # For REST APIs
-    },
-    "apigatewayv2": {
-        "api": df.delete_api,  # For HTTP and websocket APIs
-        "vpclink": df.delete_vpc_link,
-    },
-    "autoscaling": {
-        "autoscalinggroup": df.delete_autoscaling_group,
-    },
-    "certificatemanager": {
-        "certificate": lambda resource: print("deleting certificate"),  # delete_certificate(resource['arn'])
-    },
-    "cloudfront": {
-        "distribution": df.delete_cloudfront_distribution,  # delete_distribution(resource['arn'])
-    },
-    "dynamodb": {
-        "table": df.delete_dynamodb_table,
-    },
-    "ec2": {
-        "ami": df.deregister_ami,
-        "eip": df.release_eip,
-        "instance": df.delete_ec2_instance,
-        "internetgateway": df.delete_internet_gateway,
-        "launchtemplate": df.delete_launch_template,
-        "natgateway": df.delete_nat_gateway,
-        "routetable": df.delete_route_table,
-        "securitygroup": df.delete_security_group,
-        "snapshot": df.delete_snapshot,
-        "subnet": df.delete_subnet,
-        "transitgatewayattachment": lambda resource: print("deleting transit gateway attachment"),  # delete_transit_gateway_vpc_attachment(resource['arn'])
-        "vpc": df.delete_vpc,
-        "vpcendpoint": df.delete_vpc_endpoint,
-        "vpcpeering": lambda resource: print("deleting vpc peering"),  # delete_vpc_peering_connection(resource['arn'])
-    },
-    "elasticloadbalancingv2": {
-        "loadbalancer": df.delete_elastic_load_balancer,
-        "listener": df.delete_listener,
-        "targetgroup": df.delete_target_group,
-    },
-    # "iam": {
-    #     "managedpolicy": lambda resource: print("deleting managed policy"),  # delete_managed_policy(resource['arn'])
-    #     "policy": lambda resource: print("deleting policy"),  # delete_policy(resource['arn'])
-    #     "role": lambda resource: print("deleting role"),  # delete_role(resource['arn'])
-    # },
-    "kms": {
-        "key": lambda resource: print("deleting key"),  # delete_key(resource['arn'])
-    },
-    "lambda": {
-        "function": df.delete_lambda_function,
-    },
-    "rds": {
-        "dbinstance": lambda resource: print("deleting db instance"),  # delete_db_instance(resource['arn'])
-    },
-    "route53": {
-        "hostedzone": lambda resource: print("deleting hosted zone"),  # delete_hosted_zone(resource['arn'])
-    },
-    "s3": {
-        "bucket": df.delete_s3_bucket,
-    },
-    "secretsmanager": {
-        "secret": lambda resource: print("deleting secret"),  # delete_secret(resource['arn'])
-    },
-    "sns": {
-        "topic": df.delete_sns_topic,
-    },
-    "sqs": {
-        "queue": df.delete_sqs_queue,
-    },
-}
+DELETE_FUNCTIONS: Mapping[tuple[str, str], Callable[..., Any]] = MappingProxyType({
+    ("apigateway", "restapi"): df.delete_rest_api,  # For REST APIs
+    ("apigatewayv2", "api"): df.delete_api,  # For HTTP and websocket APIs
+    ("apigatewayv2", "vpclink"): df.delete_vpc_link,
+    ("autoscaling", "autoscalinggroup"): df.delete_autoscaling_group,
+    ("certificatemanager", "certificate"): not_implemented,  # delete_certificate(resource['arn'])
+    ("cloudfront", "distribution"): df.delete_cloudfront_distribution,  # delete_distribution(resource['arn'])
+    ("dynamodb", "table"): df.delete_dynamodb_table,
+    ("ec2", "ami"): df.deregister_ami,
+    ("ec2", "eip"): df.release_eip,
+    ("ec2", "instance"): df.delete_ec2_instance,
+    ("ec2", "internetgateway"): df.delete_internet_gateway,
+    ("ec2", "launchtemplate"): df.delete_launch_template,
+    ("ec2", "natgateway"): df.delete_nat_gateway,
+    ("ec2", "routetable"): df.delete_route_table,
+    ("ec2", "securitygroup"): df.delete_security_group,
+    ("ec2", "snapshot"): df.delete_snapshot,
+    ("ec2", "subnet"): df.delete_subnet,
+    ("ec2", "transitgatewayattachment"): not_implemented,  # delete_transit_gateway_vpc_attachment(resource['arn'])
+    ("ec2", "vpc"): df.delete_vpc,
+    ("ec2", "vpcendpoint"): df.delete_vpc_endpoint,
+    ("ec2", "vpcpeering"): not_implemented,  # delete_vpc_peering_connection(resource['arn'])
+    ("elasticloadbalancingv2", "loadbalancer"): df.delete_elastic_load_balancer,
+    ("elasticloadbalancingv2", "listener"): df.delete_listener,
+    ("elasticloadbalancingv2", "targetgroup"): df.delete_target_group,
+    # ("iam", "managedpolicy"): not_implemented,  # delete_managed_policy(resource['arn'])
+    # ("iam", "policy"): not_implemented,  # delete_policy(resource['arn'])
+    # ("iam", "role"): not_implemented,  # delete_role(resource['arn'])
+    ("kms", "key"): not_implemented,  # delete_key(resource['arn'])
+    ("lambda", "function"): df.delete_lambda_function,
+    ("rds", "dbinstance"): not_implemented,  # delete_db_instance(resource['arn'])
+    ("route53", "hostedzone"): not_implemented,  # delete_hosted_zone(resource['arn'])
+    ("s3", "bucket"): df.delete_s3_bucket,
+    ("secretsmanager", "secret"): not_implemented,  # delete_secret(resource['arn'])
+    ("sns", "topic"): df.delete_sns_topic,
+    ("sqs", "queue"): df.delete_sqs_queue,
+})
 # fmt: on
+
+# Resource types that have a real delete function, so unsupported or not yet implemented ones (like IAM) are rejected with one lookup
+SUPPORTED_RESOURCE_TYPES = frozenset(key for key, delete_fn in DELETE_FUNCTIONS.items() if delete_fn is not not_implemented)
+
+
+@functools.lru_cache(maxsize=128)
+def resolve_delete_function(service: str, resource_type: str) -> tuple[Callable[..., Any] | None, bool]:
+    """
+    Look up the delete function for a service and resource type
+
+    Args:
+        service (str): Service of the resource (e.g. 'ec2')
+        resource_type (str): Type of the resource (e.g. 'instance')
+
+    Returns:
+        tuple[Callable[..., Any] | None, bool]: The delete function, or None if there isn't one, and whether it takes a dependency_checker argument.
+    """
+
+    delete_fn = DELETE_FUNCTIONS.get((service, resource_type))
+    if delete_fn is None:
+        return None, False
+
+    return delete_fn, "dependency_checker" in inspect.signature(delete_fn).parameters
@@ -1,11 +1,109 @@
 import json
-
-import boto3
+import threading
 
 from awsweepbytag import text_formatting as tf
+from awsweepbytag.arns import parse_arn
+from awsweepbytag.aws_clients import get_client
+
+# Route table associations by subnet, cached per (region, VPC) so subnets in the same VPC share one describe_route_tables call
+_route_table_associations: dict[tuple[str, str], dict[str, list[dict[str, str]]]] = {}
+_route_table_associations_lock = threading.Lock()
+
+
+def describe_subnet_route_table_associations(subnet_id: str, region: str) -> list[dict[str, str]]:
+    """
+    Describe the route table associations of a single subnet
 
+    Args:
+        subnet_id (str): ID of the subnet
+        region (str): The region the subnet is in
 
-def subnet_dependency_checker(subnet_arn: str, region: str) -> tuple[list[dict], bool]:
+    Returns:
+        list[dict[str, str]]: Associations for the subnet, each with 'route_table_id' and 'association_id'
+    """
+
+    client = get_client("ec2", region)
+    route_tables = client.describe_route_tables(Filters=[{"Name": "association.subnet-id", "Values": [subnet_id]}])["RouteTables"]
+    return [
+        {
+            "route_table_id": rt["RouteTableId"],
+            "association_id": assoc["RouteTableAssociationId"],
+        }
+        for rt in route_tables
+        for assoc in rt.get("Associations", [])
+        if assoc.get("SubnetId") == subnet_id
+    ]
+
+
+def get_route_table_associations(subnet_id: str, vpc_id: str, region: str) -> list[dict[str, str]]:
+    """
+    Get the route table associations for a subnet
+
+    The first call for a VPC describes all of its subnets and route tables and caches the associations of every
+    subnet, including subnets without any. Subnets missing from the cache (e.g. created after it was built) are
+    described individually. Associations stay cached until remove_route_table_association is called for them, so a
+    subnet retried after a failed disassociation still gets them.
+
+    Args:
+        subnet_id (str): ID of the subnet
+        vpc_id (str): ID of the VPC the subnet is in
+        region (str): The region the subnet is in
+
+    Returns:
+        list[dict[str, str]]: Associations for the subnet, each with 'route_table_id' and 'association_id'
+    """
+
+    key = (region, vpc_id)
+    with _route_table_associations_lock:
+        if key not in _route_table_associations:
+            client = get_client("ec2", region)
+            vpc_filter = [{"Name": "vpc-id", "Values": [vpc_id]}]
+            associations_by_subnet: dict[str, list[dict[str, str]]] = {
+                subnet["SubnetId"]: []
+                for page in client.get_paginator("describe_subnets").paginate(Filters=vpc_filter)
+                for subnet in page["Subnets"]
+            }
+            for page in client.get_paginator("describe_route_tables").paginate(Filters=vpc_filter):
+                for rt in page["RouteTables"]:
+                    for assoc in rt.get("Associations", []):
+                        if assoc.get("SubnetId"):
+                            associations_by_subnet.setdefault(assoc["SubnetId"], []).append(
+                                {"route_table_id": rt["RouteTableId"], "association_id": assoc["RouteTableAssociationId"]}
+                            )
+            _route_table_associations[key] = associations_by_subnet
+
+        associations = _route_table_associations[key].get(subnet_id)
+        if associations is not None:
+            return list(associations)
+
+    return describe_subnet_route_table_associations(subnet_id, region)
+
+
+def remove_route_table_association(subnet_id: str, vpc_id: str, region: str, association_id: str) -> None:
+    """
+    Remove a route table association from the cache once it has been disassociated
+
+    Args:
+        subnet_id (str): ID of the subnet
+        vpc_id (str): ID of the VPC the subnet is in
+        region (str): The region the subnet is in
+        association_id (str): ID of the disassociated route table association
+    """
+
+    with _route_table_associations_lock:
+        associations = _route_table_associations.get((region, vpc_id), {}).get(subnet_id)
+        if associations:
+            associations[:] = [assoc for assoc in associations if assoc["association_id"] != association_id]
+
+
+def clear_route_table_associations() -> None:
+    """Remove all cached route table associations."""
+
+    with _route_table_associations_lock:
+        _route_table_associations.clear()
+
+
+def subnet_dependency_checker(subnet_arn: str, region: str, vpc_id: str | None = None) -> tuple[list[dict], bool]:
     """
     Checks for subnet dependencies and prompts for deletion confirmation if Lambda functions are found.
 
@@ -17,31 +115,28 @@ def subnet_dependency_checker(subnet_arn: str, region: str) -> tuple[list[dict],
     Args:
         subnet_arn (str): The ARN of the subnet to check for dependencies
         region (str): The region the subnet is in
+        vpc_id (str | None, optional): ID of the VPC the subnet is in. If given, route tables are looked up once per VPC
+            with get_route_table_associations. Defaults to None.
 
     Returns:
         tuple[list[dict], bool]: (list of dependencies to delete, whether to skip subnet deletion)
             - dependencies: List of resource dictionaries that need to be deleted
             - skip: True if subnet deletion should be skipped, False otherwise
     """
-    subnet_id = subnet_arn.split("/")[-1]
-    account_id = subnet_arn.split(":")[4]
+    arn_parts = parse_arn(subnet_arn)
+    subnet_id = arn_parts.resource_id
+    account_id = arn_parts.account_id
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
     tf.subheader_print(f"Checking for resources attached to subnet '{subnet_id}'...")
 
     # Find any route tables associated with the subnet and disassociate them
     # This is a prerequisite for subnet deletion, not a resource deletion
     tf.indent_print("Looking for associated route tables...\n")
-    route_tables = client.describe_route_tables(Filters=[{"Name": "association.subnet-id", "Values": [subnet_id]}])["RouteTables"]
-    associations = [
-        {
-            "route_table_id": rt["RouteTableId"],
-            "association_id": assoc["RouteTableAssociationId"],
-        }
-        for rt in route_tables
-        for assoc in rt.get("Associations", [])
-        if assoc.get("SubnetId") == subnet_id
-    ]
+    if vpc_id:
+        associations = get_route_table_associations(subnet_id, vpc_id, region)
+    else:
+        associations = describe_subnet_route_table_associations(subnet_id, region)
 
     # Disassociate route tables from subnet if they are associated
     if associations:
@@ -54,14 +149,16 @@ def subnet_dependency_checker(subnet_arn: str, region: str) -> tuple[list[dict],
             response = client.disassociate_route_table(AssociationId=rt["association_id"])
             if 200 <= response["ResponseMetadata"]["HTTPStatusCode"] < 300:
                 tf.success_print(f"Route table {rt['route_table_id']} was successfully disassociated from subnet '{subnet_id}'")
+                if vpc_id:
+                    remove_route_table_association(subnet_id, vpc_id, region, rt["association_id"])
             else:
                 tf.failure_print(f"Route table {rt['route_table_id']} was not successfully disassociated from subnet '{subnet_id}'")
-            tf.response_print(json.dumps(response, indent=4, default=str))
+            tf.api_response_print(response)
 
     # Check for resources that need to be deleted before the subnet can be deleted
     tf.indent_print("Checking for NAT Gateways, EC2 instances, and Lambda functions...\n")
 
-    lambda_client = boto3.client("lambda", region_name=region)
+    lambda_client = get_client("lambda", region)
 
     subnet_resource_map = [
         {
@@ -98,7 +195,7 @@ def subnet_dependency_checker(subnet_arn: str, region: str) -> tuple[list[dict],
                         continue
                     resource_type = meta["resource_type"]
                     service = meta["service"]
-                    arn = f"arn:aws:{service}:{region}:{account_id}:{resource_type}/{resource_id}"
+                    arn = f"arn:{arn_parts.partition}:{service}:{region}:{account_id}:{resource_type}/{resource_id}"
                     dependencies.append({"resource_type": resource_type.replace("-", ""), "arn": arn, "service": service, "region": region})
         else:
             # Handle standard response structure for NAT Gateways
@@ -108,7 +205,7 @@ def subnet_dependency_checker(subnet_arn: str, region: str) -> tuple[list[dict],
                     continue
                 resource_type = meta["resource_type"]
                 service = meta["service"]
-                arn = f"arn:aws:{service}:{region}:{account_id}:{resource_type}/{resource_id}"
+                arn = f"arn:{arn_parts.partition}:{service}:{region}:{account_id}:{resource_type}/{resource_id}"
                 dependencies.append({"resource_type": resource_type.replace("-", ""), "arn": arn, "service": service, "region": region})
 
     # Check for Lambda functions attached to this subnet
@@ -126,13 +223,15 @@ def subnet_dependency_checker(subnet_arn: str, region: str) -> tuple[list[dict],
         # Continue with other dependencies even if Lambda check fails
 
     # If Lambda functions are found, prompt for confirmation
+    # The functions and the prompt are shown together, so another resource's prompt can't come between them
     if lambda_dependencies:
-        tf.subheader_print(f"Found {len(lambda_dependencies)} Lambda function(s) attached to subnet '{subnet_id}':")
-        for dep in lambda_dependencies:
-            print(json.dumps(dep, indent=4))
-        print()
-        delete = tf.y_n_prompt("Lambda functions must be deleted before the subnet can be deleted. Continue?")
-        print()
+        with tf.prompting():
+            tf.subheader_print(f"Found {len(lambda_dependencies)} Lambda function(s) attached to subnet '{subnet_id}':")
+            for dep in lambda_dependencies:
+                print(json.dumps(dep, indent=4))
+            print()
+            delete = tf.y_n_prompt(f"Lambda functions must be deleted before subnet '{subnet_id}' can be deleted. Continue?")
+            print()
 
         if delete != "y":
             print()
@@ -179,12 +278,13 @@ def vpc_dependency_checker(vpc_arn: str, region: str) -> tuple[list[dict], bool]
             - dependencies: List of resource dictionaries that need to be deleted
             - skip: True if VPC deletion should be skipped, False otherwise
     """
-    vpc_id = vpc_arn.split("/")[-1]
-    account_id = vpc_arn.split(":")[4]
+    arn_parts = parse_arn(vpc_arn)
+    vpc_id = arn_parts.resource_id
+    account_id = arn_parts.account_id
 
     tf.subheader_print(f"Checking VPC '{vpc_id}' for attached resources...")
 
-    client = boto3.client("ec2", region_name=region)
+    client = get_client("ec2", region)
 
     # Check for attached resources that would prevent VPC deletion
     vpc_resource_map = [
@@ -228,7 +328,7 @@ def vpc_dependency_checker(vpc_arn: str, region: str) -> tuple[list[dict], bool]
             if not resource_id:
                 continue
             resource_type = meta["resource_type"]
-            arn = f"arn:aws:ec2:{region}:{account_id}:{resource_type}/{resource_id}"
+            arn = f"arn:{arn_parts.partition}:ec2:{region}:{account_id}:{resource_type}/{resource_id}"
             dependencies.append({"resource_type": resource_type.replace("-", ""), "arn": arn, "service": "ec2", "region": region})
 
     # Security groups handled separately since "default" needs to be filtered out
@@ -236,11 +336,11 @@ def vpc_dependency_checker(vpc_arn: str, region: str) -> tuple[list[dict], bool]
     for sg in security_groups:
         if sg["GroupName"] != "default":
             resource_id = sg["GroupId"]
-            arn = f"arn:aws:ec2:{region}:{account_id}:security-group/{resource_id}"
+            arn = f"arn:{arn_parts.partition}:ec2:{region}:{account_id}:security-group/{resource_id}"
             dependencies.append({"resource_type": "securitygroup", "arn": arn, "service": "ec2", "region": region})
 
     # Check for Lambda functions attached to this VPC
-    lambda_client = boto3.client("lambda", region_name=region)
+    lambda_client = get_client("lambda", region)
     try:
         lambda_response = lambda_client.list_functions()
         for function in lambda_response.get("Functions", []):
@@ -258,13 +358,15 @@ def vpc_dependency_checker(vpc_arn: str, region: str) -> tuple[list[dict], bool]
         tf.indent_print(f"No dependencies found for VPC '{vpc_id}'.\n")
         return [], False
 
-    tf.subheader_print(f"Found the following dependencies attached to VPC '{vpc_id}':")
-    for dependency in dependencies:
-        print(json.dumps(dependency, indent=4))
+    # The dependencies and the prompt are shown together, so another resource's prompt can't come between them
+    with tf.prompting():
+        tf.subheader_print(f"Found the following dependencies attached to VPC '{vpc_id}':")
+        for dependency in dependencies:
+            print(json.dumps(dependency, indent=4))
 
-    print()
-    delete = tf.y_n_prompt("If you continue all dependencies will be deleted as well. Continue?")
-    print()
+        print()
+        delete = tf.y_n_prompt(f"If you continue all dependencies of VPC '{vpc_id}' will be deleted as well. Continue?")
+        print()
 
     if delete != "y":
         print()
@@ -1,11 +1,24 @@
 import json
 import time
 
-import boto3
 import botocore.exceptions
 
 from awsweepbytag import get_other_ids
 from awsweepbytag import text_formatting as tf
+from awsweepbytag.aws_clients import get_client
+
+# Deletion order for networking resources (and EC2 instances) - each type is deleted in its own wave
+NETWORKING_DELETION_ORDER = (
+    "instance",
+    "vpcendpoint",
+    "natgateway",
+    "subnet",
+    "eip",
+    "internetgateway",
+    "routetable",
+    "securitygroup",
+    "vpc",
+)
 
 
 def get_resources_by_tag(tag_key: str, tag_value: str, regions: list[str]) -> list[dict[str, str]]:
@@ -33,7 +46,7 @@ def get_resources_by_tag(tag_key: str, tag_value: str, regions: list[str]) -> li
     resources = []
     for region in regions:
 
-        client = boto3.client("resource-groups", region_name=region)
+        client = get_client("resource-groups", region)
 
         query = {
             "Type": "TAG_FILTERS_1_0",
@@ -165,29 +178,37 @@ def parse_resource_by_type(resource: dict[str, str]) -> dict[str, str]:
     return resource_for_deletion
 
 
-def order_resources_for_deletion(
+def order_resources_into_waves(
     resources: list[dict[str, str]],
-) -> list[dict[str, str]]:
+) -> list[list[dict[str, str]]]:
     """
-    Orders resources for deletion based on their potential dependencies
+    Groups resources into ordered "waves" based on their potential dependencies
 
-    1. Application autoscaling resources are removed - their deletion is handled when the resource they are scaling is deleted.
+    1. Duplicate resources (e.g. found by both the tagging API and get_other_resources) are removed, keeping the first of each ARN
+    or resource ID. Application autoscaling resources are removed - their deletion is handled when the resource they are scaling is deleted.
     2. Resources are then grouped into 4 lists based on their deletion order:
 
         1. Networking resources - must be ordered internally + they need to be placed last since other resources depend on them
         2. Other resources that must follow a deletion order - currently this includes ELBs (and associated resources) and ASGs
-        3. Resources that do not contain an arn (e.g., snapshots, AMIs) - Can be deleted at any time
+        3. Resources that do not contain an arn (e.g., snapshots, AMIs) - Can be deleted at any time, except snapshots which follow AMIs
         4. Other resources - Can be deleted at any time
 
-    3. Resources are ordered based based on order of deletion and returned
+    3. Resources are split into waves. Every wave must be fully deleted before the next one is started, but resources
+    within the same wave do not depend on each other and can be deleted concurrently.
 
     Args:
         resources (list[dict[str, str]]): List of resources to be deleted.
 
     Returns:
-        list[dict[str, str]] - Ordered list of resources to be deleted.
+        list[list[dict[str, str]]] - Ordered list of waves, each containing resources that can be deleted concurrently.
     """
 
+    # Remove duplicates so the same resource isn't deleted twice, keeping the order they were found in
+    unique_resources: dict[tuple[str | None, str], dict[str, str]] = {}
+    for r in resources:
+        unique_resources.setdefault((r.get("arn") or r.get("resource_id"), r["region"]), r)
+    resources = list(unique_resources.values())
+
     # Remove application autoscaling resource from the list - any application autoscaling resource is deleted when the resource it is scaling is deleted
     resources = [r for r in resources if r.get("service") != "applicationautoscaling"]
 
@@ -243,21 +264,15 @@ def order_resources_for_deletion(
         if r not in ordered_networking_resources and r not in ordered_non_networking_resources and r not in other_resources
     ]
 
-    ordered_resources = []
-    ordered_resources.extend(non_ordered_resources)
-    ordered_resources.extend(other_resources)
-    ordered_resources.extend([r for r in ordered_non_networking_resources if r["service"] == "autoscaling"])
-    ordered_resources.extend([r for r in ordered_non_networking_resources if "loadbalancer" in r["resource_type"]])
-    ordered_resources.extend([r for r in ordered_non_networking_resources if "listener" in r["resource_type"]])
-    ordered_resources.extend([r for r in ordered_non_networking_resources if "targetgroup" in r["resource_type"]])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "instance"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "vpcendpoint"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "natgateway"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "subnet"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "eip"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "internetgateway"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "routetable"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "securitygroup"])
-    ordered_resources.extend([r for r in ordered_networking_resources if r["resource_type"] == "vpc"])
-
-    return ordered_resources
+    # Snapshots get their own wave after AMIs, since a snapshot can't be deleted while a registered AMI still uses it
+    first_wave = non_ordered_resources + other_resources
+    waves = [[r for r in first_wave if r["resource_type"] != "snapshot"]]
+    waves.append([r for r in first_wave if r["resource_type"] == "snapshot"])
+    waves.append([r for r in ordered_non_networking_resources if r["service"] == "autoscaling"])
+    waves.append([r for r in ordered_non_networking_resources if "loadbalancer" in r["resource_type"]])
+    waves.append([r for r in ordered_non_networking_resources if "listener" in r["resource_type"]])
+    waves.append([r for r in ordered_non_networking_resources if "targetgroup" in r["resource_type"]])
+    for resource_type in NETWORKING_DELETION_ORDER:
+        waves.append([r for r in ordered_networking_resources if r["resource_type"] == resource_type])
+
+    return [wave for wave in waves if wave]
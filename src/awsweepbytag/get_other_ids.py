@@ -5,15 +5,40 @@ Most resources can be gathered using the 'resource-groups' client, but not all o
 This file is used to get resource information needed for deletion that are not returned
 from the 'resource-groups' client.
 
+Each region is queried on its own thread, so searching many regions takes about as long as the
+slowest one instead of the sum of all of them.
+
 Functions:
     - get_images: Gathers AMIs and associated snapshots and returns them as a list of dicts.
+    - get_autoscaling_groups: Gathers autoscaling groups and returns them as a list of dicts.
 
 """
 
-import boto3
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
 import botocore.exceptions
 
 import awsweepbytag.text_formatting as tf
+from awsweepbytag.aws_clients import MAX_WORKERS, get_client
+
+
+def query_regions(query_region: Callable[[str], list[dict]], regions: list[str]) -> list[dict]:
+    """
+    Call query_region for every region at the same time and combine the results in the order of regions
+
+    Args:
+        query_region (Callable[[str], list[dict]]): Function that returns the resources found in one region
+        regions (list[str]): List of regions to search for resources in.
+
+    Returns:
+        list[dict] - Resources found in all regions
+    """
+    if not regions:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(regions))) as executor:
+        return [resource for region_resources in executor.map(query_region, regions) for resource in region_resources]
 
 
 def get_images(tag_key: str, tag_value: str, regions: list[str]) -> list[dict]:
@@ -36,28 +61,28 @@ def get_images(tag_key: str, tag_value: str, regions: list[str]) -> list[dict]:
     Raises:
         None: AWS client errors are caught and logged; processing continues.
     """
-    resources = []
-    for region in regions:
-        client = boto3.client("ec2", region_name=region)
+
+    def get_images_in_region(region: str) -> list[dict]:
+        resources = []
+        client = get_client("ec2", region)
         try:
             response = client.describe_images(
                 Owners=["self"],
                 Filters=[{"Name": f"tag:{tag_key}", "Values": [tag_value]}],
             )
 
-            ami_ids = [image["ImageId"] for image in response["Images"]]
-            for ami in ami_ids:
+            # Each AMI is followed by the snapshots backing it, so the images are only walked once
+            for image in response["Images"]:
                 resources.append(
                     {
                         "resource_type": "ami",
-                        "resource_id": ami,
+                        "resource_id": image["ImageId"],
                         "service": "ec2",
                         "region": region,
                     }
                 )
 
-            for image in response["Images"]:
-                for mapping in image.get("BlockDeviceMappings", []):
+                for mapping in image.get("BlockDeviceMappings", ()):
                     ebs = mapping.get("Ebs")
                     if ebs and "SnapshotId" in ebs:
                         resources.append(
@@ -72,7 +97,9 @@ def get_images(tag_key: str, tag_value: str, regions: list[str]) -> list[dict]:
         except botocore.exceptions.ClientError as e:
             tf.failure_print(f"Error querying AMIs in region {region}:")
             tf.indent_print(f"{e}")
-    return resources
+        return resources
+
+    return query_regions(get_images_in_region, regions)
 
 
 def get_autoscaling_groups(tag_key: str, tag_value: str, regions: list[str]) -> list[dict]:
@@ -95,13 +122,14 @@ def get_autoscaling_groups(tag_key: str, tag_value: str, regions: list[str]) ->
     Raises:
         None: AWS client errors are caught and logged; processing continues.
     """
-    resources = []
-    for region in regions:
-        client = boto3.client("autoscaling", region_name=region)
+
+    def get_autoscaling_groups_in_region(region: str) -> list[dict]:
+        resources = []
+        client = get_client("autoscaling", region)
         try:
-            autoscaling_groups = client.describe_auto_scaling_groups(Filters=[{"Name": f"tag:{tag_key}", "Values": [tag_value]}]).get(
-                "AutoScalingGroups", []
-            )
+            paginator = client.get_paginator("describe_auto_scaling_groups")
+            pages = paginator.paginate(Filters=[{"Name": f"tag:{tag_key}", "Values": [tag_value]}])
+            autoscaling_groups = [asg for page in pages for asg in page.get("AutoScalingGroups", [])]
 
             for asg in autoscaling_groups:
                 resources.append(
@@ -117,4 +145,6 @@ def get_autoscaling_groups(tag_key: str, tag_value: str, regions: list[str]) ->
             tf.failure_print(f"Error querying ASGs in region {region}:")
             tf.indent_print(f"{e}\n", 8)
 
-    return resources
+        return resources
+
+    return query_regions(get_autoscaling_groups_in_region, regions)
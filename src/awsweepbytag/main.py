@@ -1,12 +1,16 @@
+import argparse
 import json
 
 import botocore.exceptions
 
+from awsweepbytag import delete_functions as df
+from awsweepbytag import dep_checkers
 from awsweepbytag import get_and_order as go
 from awsweepbytag import main_delete as md
 from awsweepbytag import text_formatting as tf
 
-VALID_REGIONS = [
+# Regions in the order they are listed to the user
+VALID_REGIONS_IN_ORDER = (
     "us-east-1",
     "us-east-2",
     "us-west-1",
@@ -43,20 +47,50 @@ VALID_REGIONS = [
     "cn-northwest-1",
     "us-gov-east-1",
     "us-gov-west-1",
-]
+)
+VALID_REGIONS = frozenset(VALID_REGIONS_IN_ORDER)
 
 
-def main():
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Parse command line arguments
+
+    Args:
+        argv (list[str] | None, optional): Arguments to parse. Defaults to None, which parses sys.argv.
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+
+    parser = argparse.ArgumentParser(description="Delete AWS resources by tag")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print the full response of every API call")
+    parser.add_argument(
+        "--lifecycle",
+        action="store_true",
+        help="expire the contents of non-empty S3 buckets with lifecycle rules instead of deleting them object by object",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    tf.VERBOSE = args.verbose or tf.verbose_from_env()
+    df.EXPIRE_S3_OBJECTS = args.lifecycle
+
+    # Describe results and bucket confirmations cached by an earlier run in the same process are stale
+    dep_checkers.clear_route_table_associations()
+    df.clear_internet_gateway_attachments()
+    df.clear_distribution_etags()
+    df.clear_s3_bucket_listings()
+    df.CONFIRMED_S3_BUCKETS.clear()
+
     tag_key = input("Enter the tag key to search by: ")
     tag_value = input("Enter the tag value to search by: ")
-    regions = [
-        r.strip() for r in input("Which region(s) would you like to search? (separate multiple regions with commas): ").lower().split(",")
-    ]
+    region_input = input("Which region(s) would you like to search? (separate multiple regions with commas): ")
+    # Regions entered more than once are only searched once
+    regions = list(dict.fromkeys(r.strip() for r in region_input.lower().split(",")))
 
-    invalid_regions = []
-    for region in regions:
-        if region not in VALID_REGIONS:
-            invalid_regions.append(region)
+    invalid_regions = [region for region in regions if region not in VALID_REGIONS]
 
     if invalid_regions:
         tf.failure_print("\nThe following regions are invalid:\n")
@@ -64,7 +98,7 @@ def main():
             tf.indent_print(region)
         print()
         tf.subheader_print("Valid regions are:")
-        for region in VALID_REGIONS:
+        for region in VALID_REGIONS_IN_ORDER:
             tf.indent_print(region)
         print("\nPlease try again with valid regions. Exiting...\n")
         return
@@ -90,7 +124,8 @@ def main():
 
     other_resources_for_deletion = go.get_other_resources(tag_key, tag_value, regions)
     resources_for_deletion.extend(other_resources_for_deletion)
-    ordered_resources_for_deletion = go.order_resources_for_deletion(resources_for_deletion)
+    deletion_waves = go.order_resources_into_waves(resources_for_deletion)
+    ordered_resources_for_deletion = [resource for wave in deletion_waves for resource in wave]
 
     tf.header_print("\nResources queued for deletion:\n")
 
@@ -117,23 +152,27 @@ def main():
 
     failed_deletions = []
 
-    for resource in ordered_resources_for_deletion:
-        resource_name = resource.get("arn") or resource.get("resource_id")
+    # Resources within the same wave don't depend on each other, so they can be deleted concurrently when no per-resource prompt is needed
+    if prompt.lower() != "y":
+        failed_deletions = md.delete_resources_concurrently(deletion_waves)
+
+    else:
+        for resource in ordered_resources_for_deletion:
+            resource_name = resource.get("arn") or resource.get("resource_id")
 
-        if prompt.lower() == "y":
             confirm = input(f"\nDo you want to delete the following resource?\n{json.dumps(resource, indent=4, default=str )}\n[y/n]?: ")
             print()
             if confirm.lower() != "y":
                 print(f"Skipping deletion of {resource_name}")
                 continue
 
-        result = md.delete_resource(resource)
+            result = md.delete_resource(resource)
 
-        if result:
-            if isinstance(result, list):
-                failed_deletions.extend(result)
-            else:
-                failed_deletions.append(result)
+            if result:
+                if isinstance(result, list):
+                    failed_deletions.extend(result)
+                else:
+                    failed_deletions.append(result)
 
     if failed_deletions:
         md.retry_failed_deletions(failed_deletions)
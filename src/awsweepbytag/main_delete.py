@@ -1,14 +1,21 @@
-import inspect
 import json
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import NamedTuple
 
 import botocore.exceptions
 
+from awsweepbytag import delete_functions as df
 from awsweepbytag import delete_resource_map as drmap
 from awsweepbytag import text_formatting as tf
+from awsweepbytag.arns import parse_arn
+from awsweepbytag.aws_clients import MAX_WORKERS, client_error_code
 from awsweepbytag.delete_functions import (
+    CONFIRMED_S3_BUCKETS,
     delete_cloudfront_distribution,
     disable_cloudfront_distribution,
+    s3_bucket_has_objects,
     wait_for_distribution_disabled,
 )
 
@@ -63,22 +70,21 @@ def delete_resource(resource: dict[str, str], dependency_checker: bool = False)
         else:
             return None
 
-    if service in drmap.DELETE_FUNCTIONS and resource_type in drmap.DELETE_FUNCTIONS[service]:  # type: ignore
+    delete_fn, takes_dependency_checker = drmap.resolve_delete_function(service, resource_type)
 
-        delete_fn = drmap.DELETE_FUNCTIONS[service][resource_type]  # type: ignore
-        fn_signature = inspect.signature(delete_fn)
+    if delete_fn:
         try:
-            if "dependency_checker" in fn_signature.parameters:
-                resources = drmap.DELETE_FUNCTIONS[service][resource_type](arn, region, dependency_checker)  # type: ignore
+            if takes_dependency_checker:
+                resources = delete_fn(arn, region, dependency_checker)
             else:
-                resources = drmap.DELETE_FUNCTIONS[service][resource_type](arn, region)  # type: ignore
+                resources = delete_fn(arn, region)
             if resources:
                 return resources
             else:
                 return None
 
         except botocore.exceptions.ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code", "")
+            error_code = client_error_code(e)
 
             # These exceptions will not be handled by the retry function since they indicate the resource does not exist
             if error_code in [
@@ -94,6 +100,8 @@ def delete_resource(resource: dict[str, str], dependency_checker: bool = False)
                 "DependencyViolation",
                 "TooManyRequestsException",
                 "ThrottlingException",
+                "Throttling",
+                "RequestLimitExceeded",
                 "ServiceUnavailableException",
             ]:
                 tf.failure_print(f"Resource '{arn}' could not be deleted due to a {error_code}. Retrying later...")
@@ -113,6 +121,165 @@ def delete_resource(resource: dict[str, str], dependency_checker: bool = False)
         return None
 
 
+class DeleteResult(NamedTuple):
+    """Outcome of deleting one resource during a concurrent sweep."""
+
+    resource: dict[str, str]
+    retry: list[dict[str, str]]
+    duration: float
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """
+        True if nothing was left to retry
+
+        Delete functions also return nothing for resources that were skipped, declined or already gone, so this
+        doesn't mean the resource was deleted.
+        """
+        return not self.retry
+
+
+def timed_delete_resource(resource: dict[str, str]) -> DeleteResult:
+    """
+    Calls delete_resource and records how long it took and what is left to retry
+
+    Args:
+        resource (dict[str, str]): Dictionary containing resource information.
+
+    Returns:
+        DeleteResult: The resource, any resources to retry, the time taken in seconds and the error if one was raised.
+    """
+
+    start = time.perf_counter()
+    try:
+        retry = delete_resource(resource) or []
+    except Exception as e:
+        return DeleteResult(resource, [resource], time.perf_counter() - start, str(e))
+
+    return DeleteResult(resource, retry, time.perf_counter() - start)
+
+
+def confirm_non_empty_buckets(waves: list[list[dict[str, str]]]) -> list[list[dict[str, str]]]:
+    """
+    Checks every S3 bucket in the waves and asks once whether to empty all of the non-empty ones
+
+    Without this, each non-empty bucket prompts while it is being deleted, interleaved with the output of other
+    deletions. Buckets are checked concurrently, and s3_bucket_has_objects caches what it lists so delete_s3_bucket
+    doesn't list the buckets again. If the user agrees, the buckets are added to CONFIRMED_S3_BUCKETS so
+    delete_s3_bucket doesn't prompt for them again, otherwise they are left out of the sweep. If EXPIRE_S3_OBJECTS is
+    set, the prompt asks whether to expire the contents with lifecycle rules instead.
+
+    Args:
+        waves (list[list[dict[str, str]]]): Ordered list of waves of resources to delete.
+
+    Returns:
+        list[list[dict[str, str]]]: The waves, without any non-empty buckets the user chose not to empty.
+    """
+
+    buckets = [resource for wave in waves for resource in wave if (resource["service"], resource["resource_type"]) == ("s3", "bucket")]
+    if not buckets:
+        return waves
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(buckets))) as executor:
+        has_objects = list(executor.map(lambda bucket: s3_bucket_has_objects(bucket["arn"], bucket["region"]), buckets))
+
+    non_empty_arns = {bucket["arn"] for bucket, has in zip(buckets, has_objects, strict=True) if has}
+    if not non_empty_arns:
+        return waves
+
+    tf.subheader_print("The following S3 buckets are not empty:", 0)
+    for bucket_arn in sorted(non_empty_arns):
+        tf.indent_print(bucket_arn)
+    print()
+
+    if df.EXPIRE_S3_OBJECTS:
+        confirm = tf.warning_confirmation(
+            "The lifecycle configuration of these buckets will be replaced with rules that expire all of their contents, overwriting "
+            "any existing lifecycle rules. Are you sure you want to expire the contents of these buckets?"
+        )
+    else:
+        confirm = tf.warning_confirmation("Are you sure you want to delete all contents of these buckets and the buckets?")
+    print()
+
+    if confirm == "yes":
+        CONFIRMED_S3_BUCKETS.update(parse_arn(bucket_arn).resource_id for bucket_arn in non_empty_arns)
+        return waves
+
+    tf.indent_print("Skipping deletion of non-empty buckets...\n")
+    waves = [[resource for resource in wave if resource.get("arn") not in non_empty_arns] for wave in waves]
+    return [wave for wave in waves if wave]
+
+
+def delete_resources_concurrently(waves: list[list[dict[str, str]]], max_workers: int = MAX_WORKERS) -> list[dict[str, str]]:
+    """
+    Deletes resources wave by wave, deleting the resources within each wave concurrently
+
+    Waves are built by get_and_order.order_resources_into_waves. Each wave is only started once every resource in the
+    previous wave has been processed, so dependency ordering (e.g. instances before subnets before VPCs) is kept while
+    independent resources are deleted at the same time.
+
+    Each region gets its own thread pool, matching the per-region clients in aws_clients, so a sweep across several
+    regions isn't limited by a single pool and a slow or throttled region doesn't hold up the others within a wave.
+    Output is written by a background thread (see text_formatting.background_output) so threads don't block each other on stdout.
+    Each deletion is returned as a DeleteResult, which is used to collect the resources to retry and to print a summary.
+    Non-empty S3 buckets are confirmed together before the first wave (see confirm_non_empty_buckets).
+
+    Args:
+        waves (list[list[dict[str, str]]]): Ordered list of waves of resources to delete.
+        max_workers (int, optional): Maximum number of resources to delete at the same time in each region. Defaults to MAX_WORKERS.
+
+    Returns:
+        list[dict[str, str]]: List of resources that were not successfully deleted and should be passed to retry_failed_deletions.
+
+    Raises:
+        None
+
+        - Unexpected exceptions from a single deletion are printed and the resource is returned for retry instead of
+        aborting the rest of the sweep.
+    """
+
+    waves = confirm_non_empty_buckets(waves)
+
+    failed_deletions: list[dict[str, str]] = []
+    results: list[DeleteResult] = []
+    start = time.perf_counter()
+
+    with tf.background_output(), ExitStack() as stack:
+        executors: dict[str, ThreadPoolExecutor] = {}
+
+        for wave in waves:
+            futures: list[Future[DeleteResult]] = []
+            for resource in wave:
+                # Resources without a delete function only print a message, so they don't need a worker
+                if (resource["service"], resource["resource_type"]) not in drmap.SUPPORTED_RESOURCE_TYPES:
+                    delete_resource(resource)
+                    continue
+
+                region = resource["region"]
+                if region not in executors:
+                    executors[region] = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=region))
+
+                futures.append(executors[region].submit(timed_delete_resource, resource))
+
+            for future in as_completed(futures):
+                result = future.result()
+                if result.error is not None:
+                    resource_name = result.resource.get("arn") or result.resource.get("resource_id")
+                    tf.failure_print(f"Unexpected error deleting '{resource_name}': {result.error}")
+                    tf.indent_print("Retrying later...\n")
+
+                results.append(result)
+                failed_deletions.extend(result.retry)
+
+        if results:
+            finished = sum(result.finished for result in results)
+            elapsed = time.perf_counter() - start
+            tf.subheader_print(f"{finished} of {len(results)} resources processed without retry in {elapsed:.1f} seconds\n", 0)
+
+    return failed_deletions
+
+
 # Need to print a statement when all resources have been deleted
 def retry_failed_deletions(failed_resources: list[dict[str, str]], max_retries: int = 6, wait_time: int = 10) -> None:
     """
@@ -122,6 +289,7 @@ def retry_failed_deletions(failed_resources: list[dict[str, str]], max_retries:
         - In the main delete function (delete_resources), the distribution is disabled, unless it has already been disabled in which case it is deleted.
         - In this function, a waiter is called to wait for the distribution to be disabled.
         - After the distribution is disabled, it is deleted.
+        - All distributions are waited on and deleted concurrently, so the wait is only as long as the slowest one.
 
     Other Resources:
         - The retry function is called for each resource that was not successfully deleted.
@@ -143,13 +311,22 @@ def retry_failed_deletions(failed_resources: list[dict[str, str]], max_retries:
     other_resources = [r for r in failed_resources if r.get("resource_type") != "distribution"]
 
     # Handle CloudFronts first
-    for resource in cloudfront_resources:
-        try:
-            wait_for_distribution_disabled(resource["arn"])
-            delete_cloudfront_distribution(resource["arn"])
-        except Exception as e:
-            tf.failure_print(f"Error deleting CloudFront distribution {resource['arn']} on retry: {str(e)}")
-            other_resources.append(resource)  # Add it back for retry if it still fails
+    # Disabling can take several minutes per distribution, so all of them are waited on and deleted at the same time
+    if cloudfront_resources:
+
+        def finish_cloudfront_deletion(arn: str) -> None:
+            wait_for_distribution_disabled(arn)
+            delete_cloudfront_distribution(arn)
+
+        with tf.background_output(), ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {executor.submit(finish_cloudfront_deletion, resource["arn"]): resource for resource in cloudfront_resources}
+            for future in as_completed(futures):
+                resource = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    tf.failure_print(f"Error deleting CloudFront distribution {resource['arn']} on retry: {str(e)}")
+                    other_resources.append(resource)  # Add it back for retry if it still fails
 
     if other_resources == []:
         return
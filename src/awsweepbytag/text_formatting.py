@@ -2,16 +2,160 @@
 Text formatting functions for terminal output
 
 Functions:
+    verbose_from_env() -> bool
     header_print(text, indent) -> None
     subheader_print(text, indent) -> None
     indent_print(text, indent) -> None
     success_print(text, indent) -> None
     failure_print(text, indent) -> None
     response_print(text, indent) -> None
+    api_response_print(response, indent) -> None
     prompt(text, indent) -> str
     warning_confirmation(text, indent) -> str
+    prompting() -> Iterator[None]
+    background_output() -> Iterator[None]
 """
 
+import json
+import os
+import queue
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TextIO
+
+# orjson is optional - when it is installed verbose responses are serialized with it, since it is much faster than json on large responses
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def verbose_from_env() -> bool:
+    """
+    Check whether verbose output is turned on with the AWSWEEP_VERBOSE environment variable
+
+    Returns:
+        bool: True if AWSWEEP_VERBOSE is set to 1, true or yes
+    """
+    return os.getenv("AWSWEEP_VERBOSE", "").lower() in ("1", "true", "yes")
+
+
+# Full API responses are only printed when verbose output is enabled
+VERBOSE = verbose_from_env()
+
+# Only one thread can prompt at a time when resources are deleted concurrently. The lock is reentrant so a thread
+# can hold it with prompting() across the text shown before a prompt and any follow-up prompts.
+_PROMPT_LOCK = threading.RLock()
+
+
+class QueuedStdout:
+    """
+    Stand-in for sys.stdout that hands writes to a background thread
+
+    Deletion threads only put text on a queue and carry on, and a single writer thread does the
+    actual writes to the terminal, so concurrent deletions don't wait on each other to print.
+    Text is queued a whole line at a time per thread, so print's separate write of the line ending
+    can't be split from its line by another thread's output. The writer takes everything queued
+    at once and writes it with a single write and flush. flush() queues the calling thread's
+    unfinished line and waits until everything queued so far has been written, which keeps prompts
+    from input() in order with the output before them.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._partial_lines: dict[int, str] = {}
+        self._partial_lines_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_queued, name="output-writer", daemon=True)
+        self._writer.start()
+
+    def _write_queued(self) -> None:
+        while True:
+            chunks = [self._queue.get()]
+            while True:
+                try:
+                    chunks.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.stream.write("".join(chunk for chunk in chunks if chunk is not None))
+                self.stream.flush()
+            finally:
+                for _ in chunks:
+                    self._queue.task_done()
+
+            if None in chunks:
+                return
+
+    def write(self, text: str) -> int:
+        thread_id = threading.get_ident()
+        with self._partial_lines_lock:
+            lines, newline, partial_line = (self._partial_lines.pop(thread_id, "") + text).rpartition("\n")
+            if newline:
+                self._queue.put(lines + newline)
+            if partial_line:
+                self._partial_lines[thread_id] = partial_line
+        return len(text)
+
+    def _queue_partial_lines(self, thread_id: int | None = None) -> None:
+        """Queue the unfinished line of one thread, or of every thread if thread_id is None."""
+        with self._partial_lines_lock:
+            if thread_id is None:
+                partial_lines = list(self._partial_lines.values())
+                self._partial_lines.clear()
+            else:
+                partial_lines = [self._partial_lines.pop(thread_id, "")]
+
+            for partial_line in partial_lines:
+                if partial_line:
+                    self._queue.put(partial_line)
+
+    def flush(self) -> None:
+        self._queue_partial_lines(threading.get_ident())
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write anything still queued, including unfinished lines, and stop the writer thread."""
+        self._queue_partial_lines()
+        self._queue.put(None)
+        self._writer.join()
+        self.stream.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+
+@contextmanager
+def prompting() -> Iterator[None]:
+    """
+    Hold the prompt lock for a block that prints what a prompt is about and then asks for input
+
+    Other threads can't prompt until the block exits, so the text shown before a prompt and any
+    follow-up prompts stay together with the question they belong to. Only the printing and
+    prompting should be inside the block, not the deletion work that follows.
+    """
+    with _PROMPT_LOCK:
+        yield
+
+
+@contextmanager
+def background_output() -> Iterator[None]:
+    """
+    Send everything printed inside the block through a QueuedStdout
+
+    Used while resources are deleted concurrently. All queued output is written before the block exits.
+    """
+    queued_stdout = QueuedStdout(sys.stdout)
+    sys.stdout = queued_stdout
+    try:
+        yield
+    finally:
+        sys.stdout = queued_stdout.stream
+        queued_stdout.close()
+
 
 class Format:
     """Color codes to use for text formatting."""
@@ -108,6 +252,28 @@ def response_print(text: str, indent: int = 6) -> None:
     print()
 
 
+def api_response_print(response: dict, indent: int = 6) -> None:
+    """
+    Print an API response if verbose output is enabled
+
+    The response is only serialized when VERBOSE is True, so the default output skips the
+    serialization entirely. orjson is used if it is installed, otherwise json.dumps.
+
+    Args:
+        response (dict): Response returned by a boto3 client call
+        indent (int, optional): Number of spaces to indent each line. Defaults to 6.
+    """
+    if not VERBOSE:
+        return
+
+    if orjson is not None:
+        text = orjson.dumps(response, option=orjson.OPT_INDENT_2, default=str).decode()
+    else:
+        text = json.dumps(response, indent=4, default=str)
+
+    response_print(text, indent)
+
+
 def y_n_prompt(text: str, indent: int = 4) -> str:
     """
     Format text as a prompt and return the user's response
@@ -123,7 +289,8 @@ def y_n_prompt(text: str, indent: int = 4) -> str:
     Returns:
         str: Input from the user, stripped and lowercased.
     """
-    return input(f"{' ' * indent}{text} (y/n): ").strip().lower()
+    with _PROMPT_LOCK:
+        return input(f"{' ' * indent}{text} (y/n): ").strip().lower()
 
 
 def custom_prompt(text: str, indent: int = 4) -> str:
@@ -140,7 +307,8 @@ def custom_prompt(text: str, indent: int = 4) -> str:
     Returns:
         str: Input from the user, stripped.
     """
-    return input(f"{' ' * indent}{text}: ").strip()
+    with _PROMPT_LOCK:
+        return input(f"{' ' * indent}{text}: ").strip()
 
 
 def warning_confirmation(text: str, indent: int = 4) -> str:
@@ -158,4 +326,5 @@ def warning_confirmation(text: str, indent: int = 4) -> str:
     Returns:
         str: Input from the user, stripped and lowercased.
     """
-    return input(f"{Format.yellow}{' ' * indent}***** WARNING ***** : {text} (yes/no): {Format.end}").strip().lower()
+    with _PROMPT_LOCK:
+        return input(f"{Format.yellow}{' ' * indent}***** WARNING ***** : {text} (yes/no): {Format.end}").strip().lower()
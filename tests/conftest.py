@@ -4,6 +4,8 @@ Common configurations for tests
 Sets up logger, fixtures, helper functions, and common exceptions that can be used across multiple test files.
 
 Fixtures:
+  - fresh_clients (autouse)
+  - fresh_describe_caches (autouse)
   - setup
   - vpc
   - subnet
@@ -25,6 +27,9 @@ import botocore.exceptions
 import pytest
 from moto import mock_aws
 
+from awsweepbytag.aws_clients import clear_clients
+from awsweepbytag.delete_functions import clear_distribution_etags, clear_internet_gateway_attachments, clear_s3_bucket_listings
+from awsweepbytag.dep_checkers import clear_route_table_associations
 from awsweepbytag.logger import get_colored_stream_handler
 
 log_level_str = os.getenv("LOG_LEVEL", "WARNING").upper()
@@ -38,6 +43,28 @@ if not logger.handlers:
 
 
 ####################################### Fixtures/Reusable Functions ########################################
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Clients are cached by aws_clients, so clear them between tests to keep mocks from leaking."""
+    clear_clients()
+    yield
+    clear_clients()
+
+
+@pytest.fixture(autouse=True)
+def fresh_describe_caches():
+    """Route table and internet gateway attachments, distribution ETags and bucket listings are cached while deleting, so clear them between tests."""
+    clear_route_table_associations()
+    clear_internet_gateway_attachments()
+    clear_distribution_etags()
+    clear_s3_bucket_listings()
+    yield
+    clear_route_table_associations()
+    clear_internet_gateway_attachments()
+    clear_distribution_etags()
+    clear_s3_bucket_listings()
+
+
 def create_arn(service: str, region: str, resource_type: str, resource_id: str, account_id: str = "123456789012"):
     return f"arn:aws:{service}:{region}:{account_id}:{resource_type}/{resource_id}"
 
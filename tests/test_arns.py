@@ -0,0 +1,40 @@
+"""
+Tests for arns.py
+
+The following functions are tested:
+- parse_arn
+
+"""
+
+import pytest
+
+from awsweepbytag.arns import ArnParts, parse_arn
+
+
+################################### parse_arn tests ######################################
+def test_parse_arn():
+    parts = parse_arn("arn:aws:ec2:us-east-1:123456789012:instance/i-0123456789abcdef0")
+
+    assert parts == ArnParts("aws", "ec2", "us-east-1", "123456789012", "instance/i-0123456789abcdef0")
+    assert parts.resource_id == "i-0123456789abcdef0"
+
+
+def test_parse_arn_resource_with_colons():
+    parts = parse_arn("arn:aws-us-gov:autoscaling:us-gov-west-1:123456789012:autoScalingGroup:1234:autoScalingGroupName/my-asg")
+
+    assert parts.partition == "aws-us-gov"
+    assert parts.resource == "autoScalingGroup:1234:autoScalingGroupName/my-asg"
+    assert parts.resource_id == "my-asg"
+
+
+def test_parse_arn_without_region_or_account():
+    parts = parse_arn("arn:aws:s3:::my-bucket")
+
+    assert parts.region == ""
+    assert parts.account_id == ""
+    assert parts.resource_id == "my-bucket"
+
+
+def test_parse_arn_invalid():
+    with pytest.raises(ValueError):
+        parse_arn("not-an-arn")
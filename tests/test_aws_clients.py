@@ -0,0 +1,59 @@
+"""
+Tests for aws_clients.py
+
+The following functions are tested:
+- get_client
+- clear_clients
+- backoff_delay
+- client_error_code
+
+"""
+
+from botocore.exceptions import ClientError
+
+from awsweepbytag.aws_clients import MAX_POOL_CONNECTIONS, backoff_delay, clear_clients, client_error_code, get_client
+
+
+################################### get_client tests ######################################
+def test_get_client_reuses_client(setup):
+    region, _ = setup
+
+    client = get_client("sqs", region)
+
+    assert get_client("sqs", region) is client
+    assert get_client("sqs", "us-west-2") is not client
+    assert get_client("sns", region) is not client
+
+
+def test_get_client_config(setup):
+    region, _ = setup
+
+    config = get_client("sqs", region).meta.config
+
+    assert config.max_pool_connections == MAX_POOL_CONNECTIONS
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive is True
+
+
+def test_clear_clients(setup):
+    region, _ = setup
+
+    client = get_client("ec2", region)
+    clear_clients()
+
+    assert get_client("ec2", region) is not client
+
+
+################################### backoff_delay tests ######################################
+def test_backoff_delay():
+    assert 2 <= backoff_delay(0) <= 3
+    assert 8 <= backoff_delay(2) <= 9
+    assert 30 <= backoff_delay(10) <= 31
+
+
+################################### client_error_code tests ######################################
+def test_client_error_code():
+    error = ClientError({"Error": {"Code": "NotFoundException", "Message": "Not found"}}, "GetVpcLink")
+
+    assert client_error_code(error) == "NotFoundException"
+    assert client_error_code(ClientError({}, "GetVpcLink")) == ""
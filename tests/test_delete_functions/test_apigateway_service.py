@@ -0,0 +1,105 @@
+"""
+Tests for API Gateway service resources in delete_functions.py
+
+The following functions are tested:
+- delete_api
+- delete_rest_api
+- vpc_link_waiter
+
+"""
+
+from unittest.mock import patch
+
+import botocore.session
+
+from awsweepbytag import delete_functions as df
+from tests.conftest import create_arn
+
+
+################################### delete_api tests ######################################
+@patch("awsweepbytag.text_formatting.y_n_prompt", return_value="n")
+@patch("boto3.client")
+def test_delete_api_dedupes_vpc_links_across_pages(mock_boto_client, mock_prompt, setup):
+    region, _ = setup
+    mock_client = mock_boto_client.return_value
+    mock_client.get_paginator.return_value.paginate.return_value = [
+        {
+            "Items": [
+                {"IntegrationId": "int-1", "ConnectionType": "VPC_LINK", "ConnectionId": "link-1"},
+                {"IntegrationId": "int-2", "ConnectionType": "INTERNET"},
+            ]
+        },
+        {"Items": [{"IntegrationId": "int-3", "ConnectionType": "VPC_LINK", "ConnectionId": "link-1"}]},
+    ]
+    mock_client.delete_api.return_value = {"ResponseMetadata": {"HTTPStatusCode": 204}}
+    arn = create_arn("apigateway", region, "apis", "api123")
+
+    df.delete_api(arn, region)
+
+    mock_client.get_paginator.assert_called_once_with("get_integrations")
+    mock_client.get_integrations.assert_not_called()
+    assert "Found 1 VPC link(s)" in mock_prompt.call_args.args[0]
+    mock_client.delete_api.assert_called_once_with(ApiId="api123")
+
+
+################################### delete_rest_api tests ######################################
+@patch("awsweepbytag.text_formatting.y_n_prompt", return_value="n")
+@patch("boto3.client")
+def test_delete_rest_api_finds_vpc_links_without_get_integration(mock_boto_client, mock_prompt, setup):
+    region, _ = setup
+    mock_client = mock_boto_client.return_value
+    mock_client.get_paginator.return_value.paginate.return_value = [
+        {
+            "items": [
+                {"id": "root", "path": "/"},
+                {
+                    "id": "abc123",
+                    "path": "/items",
+                    "resourceMethods": {
+                        "GET": {"methodIntegration": {"connectionType": "VPC_LINK", "connectionId": "link-1"}},
+                        "POST": {"methodIntegration": {"connectionType": "INTERNET"}},
+                    },
+                },
+            ]
+        }
+    ]
+    mock_client.delete_rest_api.return_value = {"ResponseMetadata": {"HTTPStatusCode": 202}}
+    arn = create_arn("apigateway", region, "restapis", "api123")
+
+    df.delete_rest_api(arn, region)
+
+    mock_client.get_paginator.return_value.paginate.assert_called_once_with(
+        restApiId="api123", embed=["methods"], PaginationConfig={"PageSize": 500}
+    )
+    mock_client.get_integration.assert_not_called()
+    assert "Found 1 VPC link(s)" in mock_prompt.call_args.args[0]
+    mock_client.delete_rest_api.assert_called_once_with(restApiId="api123")
+
+
+################################### vpc_link_waiter tests ######################################
+@patch("awsweepbytag.delete_functions.time.sleep")
+@patch("boto3.client")
+def test_vpc_link_waiter_only_checks_active_links(mock_boto_client, mock_sleep, capsys, setup):
+    region, _ = setup
+    mock_client = mock_boto_client.return_value
+    mock_client.exceptions.NotFoundException = (
+        botocore.session.get_session().create_client("apigatewayv2", region).exceptions.NotFoundException
+    )
+    not_found = mock_client.exceptions.NotFoundException({"Error": {"Code": "NotFoundException"}}, "GetVpcLink")
+    # link-1 is already gone, link-2 is still deleting on the first check
+    responses = {"link-1": [not_found], "link-2": [{"VpcLinkStatus": "DELETING"}, not_found]}
+
+    def fake_get_vpc_link(VpcLinkId):
+        response = responses[VpcLinkId].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    mock_client.get_vpc_link.side_effect = fake_get_vpc_link
+
+    df.vpc_link_waiter(["link-1", "link-2"], region)
+
+    checked = [call.kwargs["VpcLinkId"] for call in mock_client.get_vpc_link.call_args_list]
+    assert sorted(checked) == ["link-1", "link-2", "link-2"]
+    assert mock_sleep.call_count == 1
+    assert "All VPC links are inactive or deleted" in capsys.readouterr().out
@@ -0,0 +1,53 @@
+"""
+Tests for Autoscaling service resources in delete_functions.py
+
+The following functions are tested:
+- delete_autoscaling_group
+
+"""
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag.aws_clients import get_client
+
+
+@pytest.fixture(scope="function")
+def autoscaling_group(subnet):
+    region, client, _, subnet_id, _ = subnet
+    image_id = client.describe_images(Owners=["amazon"])["Images"][0]["ImageId"]
+    client.create_launch_template(LaunchTemplateName="test-template", LaunchTemplateData={"ImageId": image_id, "InstanceType": "t2.micro"})
+    autoscaling_client = boto3.client("autoscaling", region_name=region)
+    autoscaling_client.create_auto_scaling_group(
+        AutoScalingGroupName="test-asg",
+        LaunchTemplate={"LaunchTemplateName": "test-template"},
+        MinSize=3,
+        MaxSize=3,
+        VPCZoneIdentifier=subnet_id,
+    )
+    asg = autoscaling_client.describe_auto_scaling_groups(AutoScalingGroupNames=["test-asg"])["AutoScalingGroups"][0]
+    yield region, client, autoscaling_client, asg["AutoScalingGroupARN"], [instance["InstanceId"] for instance in asg["Instances"]]
+
+
+################################### delete_autoscaling_group tests ######################################
+def test_delete_autoscaling_group_terminates_instances_together(capsys, autoscaling_group):
+    region, client, autoscaling_client, arn, instance_ids = autoscaling_group
+    terminate_calls = []
+    get_client("ec2", region).meta.events.register("before-call.ec2.TerminateInstances", lambda **kwargs: terminate_calls.append(kwargs))
+
+    result = df.delete_autoscaling_group(arn, region)
+    output = capsys.readouterr().out
+
+    assert result == []
+    assert len(instance_ids) == 3
+    assert len(terminate_calls) == 1
+    for instance_id in instance_ids:
+        assert f"EC2 instance '{instance_id}' is shutting down." in output
+    assert not autoscaling_client.describe_auto_scaling_groups(AutoScalingGroupNames=["test-asg"])["AutoScalingGroups"]
+    states = [
+        instance["State"]["Name"]
+        for r in client.describe_instances(InstanceIds=instance_ids)["Reservations"]
+        for instance in r["Instances"]
+    ]
+    assert set(states) == {"terminated"}
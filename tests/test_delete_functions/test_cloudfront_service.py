@@ -0,0 +1,77 @@
+"""
+Tests for CloudFront service resources in delete_functions.py
+
+The following functions are tested:
+- disable_cloudfront_distribution
+- delete_cloudfront_distribution
+
+"""
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag.aws_clients import get_client
+
+
+@pytest.fixture(scope="function")
+def distribution(setup):
+    client = boto3.client("cloudfront", region_name="us-east-1")
+    distribution_config = {
+        "CallerReference": "test-distribution",
+        "Origins": {
+            "Quantity": 1,
+            "Items": [{"Id": "origin", "DomainName": "example.s3.amazonaws.com", "S3OriginConfig": {"OriginAccessIdentity": ""}}],
+        },
+        "DefaultCacheBehavior": {
+            "TargetOriginId": "origin",
+            "ViewerProtocolPolicy": "allow-all",
+            "MinTTL": 0,
+            "ForwardedValues": {"QueryString": False, "Cookies": {"Forward": "none"}},
+            "TrustedSigners": {"Enabled": False, "Quantity": 0},
+        },
+        "Comment": "",
+        "Enabled": True,
+    }
+    arn = client.create_distribution(DistributionConfig=distribution_config)["Distribution"]["ARN"]
+    yield client, arn
+
+
+################################### disable_cloudfront_distribution tests ######################################
+def test_disable_cloudfront_distribution(distribution):
+    client, arn = distribution
+    distribution_id = arn.split("/")[-1]
+
+    retry = df.disable_cloudfront_distribution(arn)
+
+    assert retry is True
+    assert client.get_distribution(Id=distribution_id)["Distribution"]["DistributionConfig"]["Enabled"] is False
+
+
+################################### delete_cloudfront_distribution tests ######################################
+def test_delete_cloudfront_distribution_reuses_etag_from_disable(capsys, distribution):
+    client, arn = distribution
+    get_distribution_calls = []
+    get_client("cloudfront").meta.events.register(
+        "before-call.cloudfront.GetDistribution", lambda **kwargs: get_distribution_calls.append(kwargs)
+    )
+
+    df.disable_cloudfront_distribution(arn)
+    df.delete_cloudfront_distribution(arn)
+
+    assert len(get_distribution_calls) == 1
+    assert f"CloudFront distribution {arn} was successfully deleted" in capsys.readouterr().out
+    assert client.list_distributions()["DistributionList"].get("Items", []) == []
+
+
+def test_delete_cloudfront_distribution_without_cached_etag(capsys, distribution):
+    client, arn = distribution
+    distribution_id = arn.split("/")[-1]
+    config = client.get_distribution(Id=distribution_id)
+    config["Distribution"]["DistributionConfig"]["Enabled"] = False
+    client.update_distribution(Id=distribution_id, DistributionConfig=config["Distribution"]["DistributionConfig"], IfMatch=config["ETag"])
+
+    df.delete_cloudfront_distribution(arn)
+
+    assert f"CloudFront distribution {arn} was successfully deleted" in capsys.readouterr().out
+    assert client.list_distributions()["DistributionList"].get("Items", []) == []
@@ -0,0 +1,123 @@
+"""
+Tests for DynamoDB service resources in delete_functions.py
+
+The following functions are tested:
+- delete_dynamodb_table
+
+"""
+
+import threading
+from unittest.mock import patch
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag import text_formatting as tf
+
+
+@pytest.fixture(scope="function")
+def table(setup):
+    region, _ = setup
+    client = boto3.client("dynamodb", region_name=region)
+    table_arn = client.create_table(
+        TableName="test-table",
+        KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )["TableDescription"]["TableArn"]
+    yield region, client, table_arn
+
+
+################################### delete_dynamodb_table tests ######################################
+def test_delete_dynamodb_table_empty(capsys, monkeypatch, table):
+    region, client, arn = table
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: pytest.fail("Empty table should not prompt"))
+
+    result = df.delete_dynamodb_table(arn, region)
+    output = capsys.readouterr().out
+    assert "Table 'test-table' was successfully deleted" in output
+    assert result is None
+
+    # Confirm deletion
+    assert "test-table" not in client.list_tables()["TableNames"]
+
+
+def test_delete_dynamodb_table_with_items_skipped(capsys, monkeypatch, table):
+    region, client, arn = table
+    client.put_item(TableName="test-table", Item={"id": {"S": "1"}})
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: "no")
+
+    result = df.delete_dynamodb_table(arn, region)
+    output = capsys.readouterr().out
+    assert "Skipping deletion of DynamoDB table 'test-table'..." in output
+    assert result is None
+    assert "test-table" in client.list_tables()["TableNames"]
+
+
+def test_delete_dynamodb_table_keeps_protection_when_items_declined(monkeypatch, table):
+    region, client, arn = table
+    client.update_table(TableName="test-table", DeletionProtectionEnabled=True)
+    client.put_item(TableName="test-table", Item={"id": {"S": "1"}})
+    answers = iter(["yes", "no"])
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: next(answers))
+
+    result = df.delete_dynamodb_table(arn, region)
+
+    assert result is None
+    assert client.describe_table(TableName="test-table")["Table"]["DeletionProtectionEnabled"] is True
+
+
+def test_delete_dynamodb_table_backs_up_without_holding_prompt_lock(monkeypatch, table):
+    region, client, arn = table
+    client.put_item(TableName="test-table", Item={"id": {"S": "1"}})
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: "yes")
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: "y")
+    monkeypatch.setattr(tf, "custom_prompt", lambda *args, **kwargs: "nightly")
+    backups = []
+
+    def prompt_from_other_thread():
+        with tf.prompting():
+            pass
+
+    def fake_backup(backup_arn, backup_region, table_suffix=""):
+        # Another thread can prompt while the backup is being created
+        prompter = threading.Thread(target=prompt_from_other_thread, daemon=True)
+        prompter.start()
+        prompter.join(timeout=1)
+        backups.append((table_suffix, prompter.is_alive()))
+        return False
+
+    monkeypatch.setattr(df, "create_dynamodb_table_backup", fake_backup)
+
+    assert df.delete_dynamodb_table(arn, region) is None
+    assert backups == [("nightly", False)]
+    assert "test-table" not in client.list_tables()["TableNames"]
+
+
+def test_delete_dynamodb_table_failed_backup_declined(monkeypatch, table):
+    region, client, arn = table
+    client.put_item(TableName="test-table", Item={"id": {"S": "1"}})
+    prompts = []
+    monkeypatch.setattr(tf, "warning_confirmation", lambda text, **kwargs: prompts.append(text) or ("no" if "Backup" in text else "yes"))
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: "y")
+    monkeypatch.setattr(tf, "custom_prompt", lambda *args, **kwargs: "")
+    monkeypatch.setattr(df, "create_dynamodb_table_backup", lambda *args: True)
+
+    assert df.delete_dynamodb_table(arn, region) is None
+    assert prompts[-1] == "Backup of table 'test-table' could not be created. Do you still want to delete the table?"
+    assert "test-table" in client.list_tables()["TableNames"]
+
+
+@patch("boto3.client")
+def test_delete_dynamodb_table_item_count_skips_scan(mock_boto_client, monkeypatch, setup):
+    region, _ = setup
+    mock_client = mock_boto_client.return_value
+    mock_client.describe_table.return_value = {"Table": {"TableName": "test-table", "ItemCount": 10}}
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: "no")
+    arn = f"arn:aws:dynamodb:{region}:123456789012:table/test-table"
+
+    df.delete_dynamodb_table(arn, region)
+
+    mock_client.scan.assert_not_called()
+    mock_client.delete_table.assert_not_called()
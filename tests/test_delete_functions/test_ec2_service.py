@@ -11,9 +11,11 @@ The following functions are tested:
 - delete_network_interface
 - delete_route_table
 - delete_security_group
+- delete_security_groups
 - delete_snapshot
 - delete_subnet
 - delete_vpc_endpoint
+- delete_vpc_endpoints
 - delete_vpc
 
 """
@@ -27,6 +29,9 @@ import pytest
 from moto import mock_aws
 
 from awsweepbytag import delete_functions as df
+from awsweepbytag import main_delete as md
+from awsweepbytag import text_formatting as tf
+from awsweepbytag.aws_clients import get_client
 from tests.conftest import create_arn, logger, throttling_exception
 
 
@@ -56,8 +61,9 @@ def test_deregister_ami(capsys, instance):
 
 
 ################################### delete_ec2_instance tests ######################################
-def test_delete_ec2_instance(capsys, instance):
+def test_delete_ec2_instance(capsys, monkeypatch, instance):
     region, client, arn, instance_id = instance
+    monkeypatch.setattr(tf, "VERBOSE", True)
 
     # Run delete function
     result = df.delete_ec2_instance(arn, region)
@@ -75,6 +81,17 @@ def test_delete_ec2_instance(capsys, instance):
     assert instance["State"]["Name"] == "terminated"
 
 
+def test_delete_ec2_instance_response_not_printed_by_default(capsys, instance):
+    region, _, arn, instance_id = instance
+
+    result = df.delete_ec2_instance(arn, region)
+    output = capsys.readouterr().out
+    assert f"EC2 instance '{instance_id}' is shutting down." in output
+    assert "TerminatingInstances" not in output
+    assert "HTTPStatusCode" not in output
+    assert result is None
+
+
 @mock_aws
 def test_delete_ec2_instance_not_found(capsys, setup):
     region, _ = setup
@@ -98,17 +115,15 @@ def test_delete_ec2_instance_state_shutting_down(mock_boto_client, capsys, setup
     instance_id = "i-0b3697156fd669628"
     instance_status = "shutting-down"
     mock_client = mock_boto_client.return_value
-    mock_client.describe_instances.return_value = {
-        "Reservations": [
+    mock_client.terminate_instances.return_value = {
+        "TerminatingInstances": [
             {
-                "Instances": [
-                    {
-                        "InstanceId": instance_id,
-                        "State": {"Code": 32, "Name": instance_status},
-                    }
-                ]
+                "InstanceId": instance_id,
+                "CurrentState": {"Code": 32, "Name": "shutting-down"},
+                "PreviousState": {"Code": 32, "Name": instance_status},
             }
-        ]
+        ],
+        "ResponseMetadata": {"HTTPStatusCode": 200},
     }
 
     arn = create_arn("ec2", region, "instance", instance_id)
@@ -118,10 +133,13 @@ def test_delete_ec2_instance_state_shutting_down(mock_boto_client, capsys, setup
     assert f"Current status of EC2 instance '{instance_id}' is: '{instance_status}'. Skipping..." in output
     assert f"EC2 instance '{instance_id}' is shutting down." not in output
     assert result is None
+    mock_client.describe_instances.assert_not_called()
+    mock_client.get_waiter.assert_not_called()
 
 
-def test_delete_ec2_instance_autoscaling_true(capsys, instance):
+def test_delete_ec2_instance_autoscaling_true(capsys, monkeypatch, instance):
     region, client, arn, instance_id = instance
+    monkeypatch.setattr(tf, "VERBOSE", True)
     logger.debug(f"Instance ID for test: {instance_id}")
 
     # Run delete function
@@ -204,6 +222,24 @@ def test_delete_internet_gateway(capsys, vpc):
     assert gateway_id not in gateway_ids
 
 
+def test_get_internet_gateway_attachments_shared_describe(vpc):
+    region, client, _, vpc_id = vpc
+    attached_id = client.create_internet_gateway()["InternetGateway"]["InternetGatewayId"]
+    detached_id = client.create_internet_gateway()["InternetGateway"]["InternetGatewayId"]
+    client.attach_internet_gateway(InternetGatewayId=attached_id, VpcId=vpc_id)
+
+    describe_calls = []
+    get_client("ec2", region).meta.events.register(
+        "before-call.ec2.DescribeInternetGateways", lambda **kwargs: describe_calls.append(kwargs)
+    )
+
+    assert df.get_internet_gateway_attachments(attached_id, region) == [vpc_id]
+    assert df.get_internet_gateway_attachments(detached_id, region) == []
+
+    # Both gateways came from the one region-wide describe
+    assert len(describe_calls) == 1
+
+
 ################################### delete_launch_template tests ######################################
 def test_delete_launch_template(capsys, setup):
     region, client = setup
@@ -338,6 +374,34 @@ def test_delete_security_group(capsys, vpc):
     assert not any(g["GroupId"] == sg_id for g in security_groups)
 
 
+def test_delete_security_groups_revokes_cross_references(monkeypatch, vpc):
+    region, client, _, vpc_id = vpc
+    sg_a = client.create_security_group(GroupName="sg-a", Description="Group A", VpcId=vpc_id)["GroupId"]
+    sg_b = client.create_security_group(GroupName="sg-b", Description="Group B", VpcId=vpc_id)["GroupId"]
+    client.authorize_security_group_ingress(
+        GroupId=sg_a,
+        IpPermissions=[
+            {"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443, "UserIdGroupPairs": [{"GroupId": sg_b}]},
+            {"IpProtocol": "tcp", "FromPort": 22, "ToPort": 22, "IpRanges": [{"CidrIp": "10.0.0.0/16"}]},
+        ],
+    )
+    security_groups = [
+        {"resource_type": "securitygroup", "arn": create_arn("ec2", region, "security-group", sg_id), "service": "ec2", "region": region}
+        for sg_id in (sg_a, sg_b)
+    ]
+    deleted = []
+    monkeypatch.setattr(md, "delete_resource", lambda resource, dependency_checker=False: deleted.append(resource["arn"]))
+
+    result = df.delete_security_groups(security_groups, region)
+
+    assert result == []
+    assert sorted(deleted) == sorted(sg["arn"] for sg in security_groups)
+
+    # Only the rule referencing the other group is revoked
+    permissions = client.describe_security_groups(GroupIds=[sg_a])["SecurityGroups"][0]["IpPermissions"]
+    assert [permission["FromPort"] for permission in permissions] == [22]
+
+
 ################################### delete_snapshot tests ######################################
 def test_delete_snapshot(capsys, setup):
     region, client = setup
@@ -402,6 +466,52 @@ def test_delete_subnet_with_route_table_association(capsys, subnet, route_table)
     assert not any(s["SubnetId"] == subnet_id for s in subnets)
 
 
+def test_delete_subnets_share_route_table_lookup(subnet, route_table):
+    region, client, arn, subnet_id, vpc_id = subnet
+    _, _, _, route_table_id, _ = route_table
+    second_subnet_id = client.create_subnet(VpcId=vpc_id, CidrBlock="10.0.1.0/24")["Subnet"]["SubnetId"]
+    second_arn = create_arn("ec2", region, "subnet", second_subnet_id)
+    client.associate_route_table(RouteTableId=route_table_id, SubnetId=subnet_id)
+    client.associate_route_table(RouteTableId=route_table_id, SubnetId=second_subnet_id)
+
+    ec2_client = get_client("ec2", region)
+    describe_route_tables = ec2_client.describe_route_tables
+    calls = []
+
+    def count_describe_route_tables(**kwargs):
+        calls.append(kwargs)
+        return describe_route_tables(**kwargs)
+
+    ec2_client.describe_route_tables = count_describe_route_tables
+
+    assert df.delete_subnet(arn, region) is None
+    assert df.delete_subnet(second_arn, region) is None
+
+    # Route tables are described once for the VPC, not once per subnet
+    assert calls == [{"Filters": [{"Name": "vpc-id", "Values": [vpc_id]}]}]
+    assert not client.describe_subnets(Filters=[{"Name": "vpc-id", "Values": [vpc_id]}])["Subnets"]
+
+
+def test_delete_subnet_retry_disassociates_after_failed_disassociation(subnet, route_table):
+    region, client, arn, subnet_id, _ = subnet
+    _, _, _, route_table_id, _ = route_table
+    client.associate_route_table(RouteTableId=route_table_id, SubnetId=subnet_id)
+
+    ec2_client = get_client("ec2", region)
+    disassociate_route_table = ec2_client.disassociate_route_table
+
+    with patch.object(ec2_client, "disassociate_route_table", side_effect=throttling_exception):
+        with pytest.raises(botocore.exceptions.ClientError):
+            df.delete_subnet(arn, region)
+
+    # The association is still cached, so the retry disassociates it before deleting the subnet
+    with patch.object(ec2_client, "disassociate_route_table", side_effect=disassociate_route_table) as mock_disassociate:
+        assert df.delete_subnet(arn, region) is None
+
+    mock_disassociate.assert_called_once()
+    assert not client.describe_subnets(Filters=[{"Name": "subnet-id", "Values": [subnet_id]}])["Subnets"]
+
+
 def test_delete_subnet_with_lambda_function(capsys, subnet):
     region, client, arn, subnet_id, vpc_id = subnet
     logger.debug(f"Subnet ID for test: {subnet_id}")
@@ -638,6 +748,35 @@ def test_delete_vpc_endpoint(capsys, subnet):
         assert vpc_endpoints[0]["State"] == "deleted"
 
 
+def test_delete_vpc_endpoints_in_one_call(capsys, vpc):
+    region, client, _, vpc_id = vpc
+    route_table_id = client.describe_route_tables(Filters=[{"Name": "vpc-id", "Values": [vpc_id]}])["RouteTables"][0]["RouteTableId"]
+    endpoint_ids = [
+        client.create_vpc_endpoint(
+            VpcId=vpc_id, ServiceName=f"com.amazonaws.us-east-1.{service}", VpcEndpointType="Gateway", RouteTableIds=[route_table_id]
+        )["VpcEndpoint"]["VpcEndpointId"]
+        for service in ("s3", "dynamodb")
+    ]
+    endpoints = [
+        {"resource_type": "vpcendpoint", "arn": create_arn("ec2", region, "vpc-endpoint", endpoint_id), "service": "ec2", "region": region}
+        for endpoint_id in endpoint_ids
+    ]
+
+    delete_calls = []
+    get_client("ec2", region).meta.events.register("before-call.ec2.DeleteVpcEndpoints", lambda **kwargs: delete_calls.append(kwargs))
+
+    failed = df.delete_vpc_endpoints(endpoints, region)
+    output = capsys.readouterr().out
+
+    assert failed == []
+    assert len(delete_calls) == 1
+    for endpoint_id in endpoint_ids:
+        assert f"VPC endpoint '{endpoint_id}' was successfully deleted" in output
+
+    remaining = client.describe_vpc_endpoints(VpcEndpointIds=endpoint_ids)["VpcEndpoints"]
+    assert all(endpoint["State"] == "deleted" for endpoint in remaining)
+
+
 ################################### delete_vpc tests ######################################
 def test_delete_vpc(capsys, vpc):
     region, client, arn, vpc_id = vpc
@@ -660,3 +799,26 @@ def test_delete_vpc(capsys, vpc):
     # Confirm deletion
     vpcs = client.describe_vpcs()["Vpcs"]
     assert not any(v["VpcId"] == vpc_id for v in vpcs)
+
+
+def test_delete_vpc_with_cross_referencing_security_groups(capsys, monkeypatch, vpc):
+    region, client, arn, vpc_id = vpc
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: "y")
+    sg_a = client.create_security_group(GroupName="sg-a", Description="Group A", VpcId=vpc_id)["GroupId"]
+    sg_b = client.create_security_group(GroupName="sg-b", Description="Group B", VpcId=vpc_id)["GroupId"]
+    client.authorize_security_group_ingress(
+        GroupId=sg_a, IpPermissions=[{"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443, "UserIdGroupPairs": [{"GroupId": sg_b}]}]
+    )
+    client.authorize_security_group_ingress(
+        GroupId=sg_b, IpPermissions=[{"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443, "UserIdGroupPairs": [{"GroupId": sg_a}]}]
+    )
+
+    result = df.delete_vpc(arn, region)
+    output = capsys.readouterr().out
+    assert f"Security group '{sg_a}' was successfully deleted" in output
+    assert f"Security group '{sg_b}' was successfully deleted" in output
+    assert f"VPC '{vpc_id}' was successfully deleted" in output
+    assert result is None
+
+    # Confirm deletion
+    assert not any(v["VpcId"] == vpc_id for v in client.describe_vpcs()["Vpcs"])
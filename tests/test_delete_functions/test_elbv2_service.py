@@ -0,0 +1,126 @@
+"""
+Tests for ELBv2 service resources in delete_functions.py
+
+The following functions are tested:
+- delete_elastic_load_balancer
+- delete_listener
+- delete_target_group
+
+"""
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag import text_formatting as tf
+
+
+@pytest.fixture(scope="function")
+def load_balancer(subnet):
+    region, client, _, subnet_id, vpc_id = subnet
+    second_subnet_id = client.create_subnet(VpcId=vpc_id, CidrBlock="10.0.1.0/24", AvailabilityZone=f"{region}b")["Subnet"]["SubnetId"]
+    elb_client = boto3.client("elbv2", region_name=region)
+    elb_arn = elb_client.create_load_balancer(Name="test-elb", Subnets=[subnet_id, second_subnet_id])["LoadBalancers"][0]["LoadBalancerArn"]
+
+    tg_arns = [
+        elb_client.create_target_group(Name=f"test-tg-{i}", Protocol="HTTP", Port=80 + i, VpcId=vpc_id)["TargetGroups"][0]["TargetGroupArn"]
+        for i in range(2)
+    ]
+    listener_arns = [
+        elb_client.create_listener(
+            LoadBalancerArn=elb_arn,
+            Protocol="HTTP",
+            Port=80 + i,
+            DefaultActions=[{"Type": "forward", "ForwardConfig": {"TargetGroups": [{"TargetGroupArn": tg_arn}]}}],
+        )["Listeners"][0]["ListenerArn"]
+        for i, tg_arn in enumerate(tg_arns)
+    ]
+    yield region, elb_client, elb_arn, listener_arns, tg_arns
+
+
+################################### delete_elastic_load_balancer tests ######################################
+def test_delete_elastic_load_balancer(capsys, monkeypatch, load_balancer):
+    region, elb_client, elb_arn, listener_arns, tg_arns = load_balancer
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: "y")
+
+    result = df.delete_elastic_load_balancer(elb_arn, region)
+    output = capsys.readouterr().out
+    for listener_arn in listener_arns:
+        assert f"Listener {listener_arn} was successfully deleted" in output
+    for tg_arn in tg_arns:
+        assert f"Target group {tg_arn} was successfully deleted" in output
+    assert f"Load balancer {elb_arn} has been fully deleted" in output
+    assert result is None
+
+    # Confirm deletion
+    assert not elb_client.describe_load_balancers()["LoadBalancers"]
+    assert not elb_client.describe_target_groups()["TargetGroups"]
+
+
+def test_delete_elastic_load_balancer_polls_until_deleted(capsys, monkeypatch, load_balancer):
+    region, _, elb_arn, _, _ = load_balancer
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: "y")
+    client = df.get_client("elbv2", region)
+    describe_load_balancers = client.describe_load_balancers
+    still_deleting = iter([True, True])
+
+    # Report the load balancer as still present for the first two checks after deletion
+    def fake_describe_load_balancers(**kwargs):
+        if next(still_deleting, False):
+            return {"LoadBalancers": [{"LoadBalancerArn": elb_arn}]}
+        return describe_load_balancers(**kwargs)
+
+    monkeypatch.setattr(client, "describe_load_balancers", fake_describe_load_balancers)
+    delays = []
+    monkeypatch.setattr(df.time, "sleep", delays.append)
+
+    df.delete_elastic_load_balancer(elb_arn, region)
+
+    assert f"Load balancer {elb_arn} has been fully deleted" in capsys.readouterr().out
+    assert len(delays) == 2
+    assert 0.5 <= delays[0] <= 1.5 and 1 <= delays[1] <= 2
+
+
+def test_delete_elastic_load_balancer_shared_target_group(capsys, monkeypatch, load_balancer):
+    region, elb_client, elb_arn, _, tg_arns = load_balancer
+    subnet_ids = elb_client.describe_load_balancers(LoadBalancerArns=[elb_arn])["LoadBalancers"][0]["AvailabilityZones"]
+    other_elb_arn = elb_client.create_load_balancer(Name="other-elb", Subnets=[az["SubnetId"] for az in subnet_ids])["LoadBalancers"][0][
+        "LoadBalancerArn"
+    ]
+    elb_client.create_listener(
+        LoadBalancerArn=other_elb_arn, Protocol="HTTP", Port=80, DefaultActions=[{"Type": "forward", "TargetGroupArn": tg_arns[0]}]
+    )
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: pytest.fail("Should not prompt when a target group is shared"))
+
+    df.delete_elastic_load_balancer(elb_arn, region)
+    output = capsys.readouterr().out
+    assert "The following target groups are used by other ELBs and will not be deleted:" in output
+    assert tg_arns[0] in output
+    assert f"ELB {elb_arn} cannot be deleted at this time. Exiting..." in output
+    assert len(elb_client.describe_load_balancers()["LoadBalancers"]) == 2
+
+
+################################### delete_listener tests ######################################
+def test_delete_listener(capsys, load_balancer):
+    region, elb_client, elb_arn, listener_arns, _ = load_balancer
+
+    df.delete_listener(listener_arns[0], region)
+    assert f"Listener {listener_arns[0]} was successfully deleted" in capsys.readouterr().out
+    assert [listener["ListenerArn"] for listener in elb_client.describe_listeners(LoadBalancerArn=elb_arn)["Listeners"]] == listener_arns[
+        1:
+    ]
+
+    df.delete_listener(listener_arns[0], region)
+    assert f"Listener {listener_arns[0]} was not found and may have already been deleted" in capsys.readouterr().out
+
+
+################################### delete_target_group tests ######################################
+def test_delete_target_group(capsys, setup):
+    region, _ = setup
+    elb_client = boto3.client("elbv2", region_name=region)
+    vpc_id = boto3.client("ec2", region_name=region).create_vpc(CidrBlock="10.0.0.0/16")["Vpc"]["VpcId"]
+    tg_arn = elb_client.create_target_group(Name="test-tg", Protocol="HTTP", Port=80, VpcId=vpc_id)["TargetGroups"][0]["TargetGroupArn"]
+
+    df.delete_target_group(tg_arn, region)
+    assert f"Target group {tg_arn} was successfully deleted" in capsys.readouterr().out
+    assert not elb_client.describe_target_groups()["TargetGroups"]
@@ -0,0 +1,185 @@
+"""
+Tests for S3 service resources in delete_functions.py
+
+The following functions are tested:
+- s3_bucket_has_objects
+- list_s3_bucket_pages
+- empty_s3_bucket
+- expire_s3_bucket_objects
+- delete_s3_bucket
+
+"""
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag import text_formatting as tf
+from awsweepbytag.aws_clients import get_client
+
+
+@pytest.fixture(scope="function")
+def bucket(setup):
+    region, _ = setup
+    client = boto3.client("s3", region_name=region)
+    client.create_bucket(Bucket="test-bucket")
+    yield region, client, "test-bucket"
+
+
+################################### s3_bucket_has_objects tests ######################################
+def test_s3_bucket_has_objects(bucket):
+    region, client, bucket_name = bucket
+    arn = f"arn:aws:s3:::{bucket_name}"
+
+    assert df.s3_bucket_has_objects(arn, region) is False
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"data")
+    assert df.s3_bucket_has_objects(arn, region) is True
+    assert df.s3_bucket_has_objects("arn:aws:s3:::missing-bucket", region) is False
+
+
+################################### list_s3_bucket_pages tests ######################################
+def test_list_s3_bucket_pages_continues_after_first_page(bucket):
+    region, client, bucket_name = bucket
+    client.put_bucket_versioning(Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"})
+    for i in range(3):
+        client.put_object(Bucket=bucket_name, Key=f"object-{i}", Body=b"data")
+    first_page = client.list_object_versions(Bucket=bucket_name, MaxKeys=2)
+
+    pages = list(df.list_s3_bucket_pages(bucket_name, region, True, first_page))
+
+    assert pages[0] is first_page
+    keys = [version["Key"] for page in pages for version in page.get("Versions", [])]
+    assert sorted(keys) == ["object-0", "object-1", "object-2"]
+
+
+################################### empty_s3_bucket tests ######################################
+def test_empty_s3_bucket_multiple_pages(bucket):
+    region, client, bucket_name = bucket
+    for i in range(5):
+        client.put_object(Bucket=bucket_name, Key=f"object-{i}", Body=b"data")
+
+    # Small pages so the bucket is emptied in several delete_objects calls
+    events = df.get_client("s3", region).meta.events
+    events.register("before-parameter-build.s3.ListObjectsV2", lambda params, **kwargs: params.update(MaxKeys=2))
+    delete_calls = []
+    events.register("before-call.s3.DeleteObjects", lambda **kwargs: delete_calls.append(kwargs))
+
+    errors = df.empty_s3_bucket(bucket_name, region, False)
+
+    assert errors == []
+    assert len(delete_calls) == 3
+    assert client.list_objects_v2(Bucket=bucket_name)["KeyCount"] == 0
+
+
+def test_empty_s3_bucket_versioned(bucket):
+    region, client, bucket_name = bucket
+    client.put_bucket_versioning(Bucket=bucket_name, VersioningConfiguration={"Status": "Enabled"})
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"v1")
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"v2")
+    client.delete_object(Bucket=bucket_name, Key="object")
+
+    errors = df.empty_s3_bucket(bucket_name, region, True)
+
+    assert errors == []
+    response = client.list_object_versions(Bucket=bucket_name)
+    assert "Versions" not in response and "DeleteMarkers" not in response
+
+
+################################### expire_s3_bucket_objects tests ######################################
+def test_expire_s3_bucket_objects(capsys, bucket):
+    region, client, bucket_name = bucket
+
+    df.expire_s3_bucket_objects(bucket_name, region)
+
+    rules = client.get_bucket_lifecycle_configuration(Bucket=bucket_name)["Rules"]
+    assert {rule["ID"] for rule in rules} == {"awsweepbytag-expire-objects", "awsweepbytag-expire-delete-markers"}
+    assert f"Lifecycle rules to expire all contents of bucket '{bucket_name}' were applied" in capsys.readouterr().out
+
+
+################################### delete_s3_bucket tests ######################################
+def test_delete_s3_bucket_with_objects(capsys, monkeypatch, bucket):
+    region, client, bucket_name = bucket
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"data")
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: "yes")
+
+    df.delete_s3_bucket(f"arn:aws:s3:::{bucket_name}", region)
+    output = capsys.readouterr().out
+
+    assert f"Emptying bucket '{bucket_name}'..." in output
+    assert f"S3 bucket '{bucket_name}' successfully deleted." in output
+    assert bucket_name not in [b["Name"] for b in client.list_buckets()["Buckets"]]
+
+
+def test_delete_s3_bucket_lists_first_page_once(monkeypatch, bucket):
+    region, client, bucket_name = bucket
+    for i in range(5):
+        client.put_object(Bucket=bucket_name, Key=f"object-{i}", Body=b"data")
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: "yes")
+
+    events = df.get_client("s3", region).meta.events
+    events.register("before-parameter-build.s3.ListObjectsV2", lambda params, **kwargs: params.update(MaxKeys=2))
+    list_calls = []
+    events.register("before-call.s3.ListObjectsV2", lambda **kwargs: list_calls.append(kwargs))
+
+    df.delete_s3_bucket(f"arn:aws:s3:::{bucket_name}", region)
+
+    # Pages of 2, 2 and 1 objects, with the first page also used to check whether the bucket is empty
+    assert len(list_calls) == 3
+    assert bucket_name not in [b["Name"] for b in client.list_buckets()["Buckets"]]
+
+
+def test_delete_s3_bucket_declined(capsys, monkeypatch, bucket):
+    region, client, bucket_name = bucket
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"data")
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: "no")
+
+    df.delete_s3_bucket(f"arn:aws:s3:::{bucket_name}", region)
+
+    assert f"Skipping deletion of bucket '{bucket_name}'." in capsys.readouterr().out
+    assert client.list_objects_v2(Bucket=bucket_name)["KeyCount"] == 1
+
+
+def test_delete_s3_bucket_lifecycle(capsys, monkeypatch, bucket):
+    region, client, bucket_name = bucket
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"data")
+    prompts = []
+    monkeypatch.setattr(tf, "warning_confirmation", lambda text: prompts.append(text) or "yes")
+    monkeypatch.setattr(df, "EXPIRE_S3_OBJECTS", True)
+
+    df.delete_s3_bucket(f"arn:aws:s3:::{bucket_name}", region)
+    output = capsys.readouterr().out
+
+    assert "delete all contents" not in prompts[0]
+    assert "overwriting any existing lifecycle rules" in prompts[0]
+    assert "Emptying bucket" not in output
+    assert client.list_objects_v2(Bucket=bucket_name)["KeyCount"] == 1
+    assert client.get_bucket_lifecycle_configuration(Bucket=bucket_name)["Rules"]
+
+
+def test_delete_s3_bucket_already_confirmed(monkeypatch, bucket):
+    region, client, bucket_name = bucket
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"data")
+    monkeypatch.setattr(tf, "warning_confirmation", lambda *args, **kwargs: pytest.fail("Confirmed bucket should not prompt"))
+    monkeypatch.setattr(df, "CONFIRMED_S3_BUCKETS", {bucket_name})
+
+    df.delete_s3_bucket(f"arn:aws:s3:::{bucket_name}", region)
+
+    assert bucket_name not in [b["Name"] for b in client.list_buckets()["Buckets"]]
+
+
+def test_delete_s3_bucket_reuses_has_objects_listing(monkeypatch, bucket):
+    region, client, bucket_name = bucket
+    arn = f"arn:aws:s3:::{bucket_name}"
+    client.put_object(Bucket=bucket_name, Key="object", Body=b"data")
+    monkeypatch.setattr(df, "CONFIRMED_S3_BUCKETS", {bucket_name})
+
+    calls = []
+    get_client("s3", region).meta.events.register("before-call.s3.*", lambda model, **kwargs: calls.append(model.name))
+
+    assert df.s3_bucket_has_objects(arn, region) is True
+    df.delete_s3_bucket(arn, region)
+
+    # Versioning and the first page are only fetched by the check, not again by the delete
+    assert calls.count("GetBucketVersioning") == 1
+    assert calls.count("ListObjectsV2") == 1
+    assert bucket_name not in [b["Name"] for b in client.list_buckets()["Buckets"]]
@@ -0,0 +1,70 @@
+"""
+Tests for SNS service resources in delete_functions.py
+
+The following functions are tested:
+- delete_sns_topic
+
+"""
+
+import threading
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag import text_formatting as tf
+
+
+################################### delete_sns_topic tests ######################################
+def test_delete_sns_topic_without_subscriptions(capsys, monkeypatch, setup):
+    region, _ = setup
+    client = boto3.client("sns", region_name=region)
+    topic_arn = client.create_topic(Name="test-topic")["TopicArn"]
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: pytest.fail("Should not prompt for a topic without subscriptions"))
+
+    df.delete_sns_topic(topic_arn, region)
+
+    assert f"SNS topic {topic_arn} was successfully deleted" in capsys.readouterr().out
+    assert client.list_topics()["Topics"] == []
+
+
+def test_delete_sns_topic_lists_every_page_of_subscriptions(capsys, monkeypatch, setup):
+    region, _ = setup
+    client = boto3.client("sns", region_name=region)
+    topic_arn = client.create_topic(Name="test-topic")["TopicArn"]
+    endpoints = [f"http://example.com/{i}" for i in range(101)]
+    for endpoint in endpoints:
+        client.subscribe(TopicArn=topic_arn, Protocol="http", Endpoint=endpoint)
+    monkeypatch.setattr(tf, "y_n_prompt", lambda *args, **kwargs: "n")
+
+    df.delete_sns_topic(topic_arn, region)
+    output = capsys.readouterr().out
+
+    assert all(f'"Endpoint": "{endpoint}"' in output for endpoint in endpoints)
+    assert f"Skipping deletion of SNS topic {topic_arn}" in output
+    assert [topic["TopicArn"] for topic in client.list_topics()["Topics"]] == [topic_arn]
+
+
+def test_delete_sns_topic_prompts_stay_with_their_topic(capsys, monkeypatch, setup):
+    region, _ = setup
+    client = boto3.client("sns", region_name=region)
+    topic_arns = [client.create_topic(Name=f"test-topic-{i}")["TopicArn"] for i in range(2)]
+    for topic_arn in topic_arns:
+        client.subscribe(TopicArn=topic_arn, Protocol="http", Endpoint=f"http://example.com/{topic_arn}")
+    # Approve only the first topic, and show the prompt in the output like input() does
+    monkeypatch.setattr("builtins.input", lambda text: print(text) or ("y" if topic_arns[0] in text else "n"))
+
+    with tf.background_output():
+        threads = [threading.Thread(target=df.delete_sns_topic, args=(topic_arn, region)) for topic_arn in topic_arns]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    lines = capsys.readouterr().out.splitlines()
+    for topic_arn, other_arn in (topic_arns, topic_arns[::-1]):
+        start = next(i for i, line in enumerate(lines) if f"SNS topic {topic_arn} has the following subscriptions" in line)
+        end = next(i for i, line in enumerate(lines) if "Do you wish to proceed" in line and topic_arn in line)
+        # Other output, like the other topic's header, can still show up in between, but not its subscriptions or prompt
+        assert not any(other_arn in line and "Deleting SNS topic" not in line and "Skipping" not in line for line in lines[start:end])
+    assert [topic["TopicArn"] for topic in client.list_topics()["Topics"]] == [topic_arns[1]]
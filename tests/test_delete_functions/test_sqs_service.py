@@ -0,0 +1,69 @@
+"""
+Tests for SQS service resources in delete_functions.py
+
+The following functions are tested:
+- delete_sqs_queue
+
+"""
+
+from unittest.mock import patch
+
+import boto3
+import botocore.exceptions
+import pytest
+
+from awsweepbytag import delete_functions as df
+from tests.conftest import logger
+
+
+################################### delete_sqs_queue tests ######################################
+def test_delete_sqs_queue(capsys, setup):
+    region, _ = setup
+    client = boto3.client("sqs", region_name=region)
+    queue_url = client.create_queue(QueueName="test-queue")["QueueUrl"]
+    arn = client.get_queue_attributes(QueueUrl=queue_url, AttributeNames=["QueueArn"])["Attributes"]["QueueArn"]
+    logger.debug(f"Queue ARN for test: {arn}")
+
+    result = df.delete_sqs_queue(arn, region)
+    output = capsys.readouterr().out
+    assert f"Deleting SQS queue test-queue in {region}..." in output
+    assert f"SQS queue {arn} was successfully deleted" in output
+    assert result is None
+
+    # Confirm deletion
+    assert not client.list_queues().get("QueueUrls", [])
+
+
+@patch("boto3.client")
+def test_delete_sqs_queue_builds_url_from_arn(mock_boto_client, setup):
+    region, _ = setup
+    mock_client = mock_boto_client.return_value
+    mock_client.delete_queue.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    arn = f"arn:aws:sqs:{region}:123456789012:test-queue.fifo"
+
+    df.delete_sqs_queue(arn, region)
+
+    mock_client.delete_queue.assert_called_once_with(QueueUrl=f"https://sqs.{region}.amazonaws.com/123456789012/test-queue.fifo")
+    mock_client.get_queue_url.assert_not_called()
+
+
+@patch("boto3.client")
+def test_delete_sqs_queue_uses_arn_region(mock_boto_client, setup):
+    region, _ = setup
+    mock_client = mock_boto_client.return_value
+    mock_client.delete_queue.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+    arn = "arn:aws:sqs:eu-west-1:123456789012:test-queue"
+
+    df.delete_sqs_queue(arn, region)
+
+    assert mock_boto_client.call_args.args[0] == "sqs"
+    assert mock_boto_client.call_args.kwargs["region_name"] == "eu-west-1"
+    mock_client.delete_queue.assert_called_once_with(QueueUrl="https://sqs.eu-west-1.amazonaws.com/123456789012/test-queue")
+
+
+def test_delete_sqs_queue_not_found(setup):
+    region, _ = setup
+    arn = f"arn:aws:sqs:{region}:123456789012:missing-queue"
+
+    with pytest.raises(botocore.exceptions.ClientError):
+        df.delete_sqs_queue(arn, region)
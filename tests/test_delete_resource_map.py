@@ -0,0 +1,38 @@
+"""
+Tests for delete_resource_map.py
+
+The following functions are tested:
+- not_implemented
+- resolve_delete_function
+- SUPPORTED_RESOURCE_TYPES
+
+"""
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag import delete_resource_map as drmap
+
+
+################################### not_implemented tests ######################################
+def test_not_implemented(capsys):
+    arn = "arn:aws:kms:us-east-1:123456789012:key/1234"
+
+    assert drmap.DELETE_FUNCTIONS[("kms", "key")] is drmap.not_implemented
+    assert drmap.not_implemented(arn, "us-east-1") is None
+    assert f"No delete function implemented yet for '{arn}' in us-east-1" in capsys.readouterr().out
+
+
+################################### resolve_delete_function tests ######################################
+def test_resolve_delete_function():
+    assert drmap.resolve_delete_function("sqs", "queue") == (df.delete_sqs_queue, False)
+    assert drmap.resolve_delete_function("ec2", "internetgateway") == (df.delete_internet_gateway, True)
+
+
+def test_resolve_delete_function_missing():
+    assert drmap.resolve_delete_function("notaservice", "notatype") == (None, False)
+
+
+################################### SUPPORTED_RESOURCE_TYPES tests ######################################
+def test_supported_resource_types():
+    assert ("sqs", "queue") in drmap.SUPPORTED_RESOURCE_TYPES
+    assert ("kms", "key") not in drmap.SUPPORTED_RESOURCE_TYPES
+    assert ("iam", "role") not in drmap.SUPPORTED_RESOURCE_TYPES
@@ -0,0 +1,58 @@
+"""
+Tests for get_and_order.py
+
+The following functions are tested:
+- order_resources_into_waves
+
+"""
+
+from awsweepbytag import get_and_order as go
+from tests.conftest import create_arn
+
+
+def make_resource(service: str, resource_type: str, resource_id: str, region: str = "us-east-1") -> dict[str, str]:
+    return {
+        "resource_type": resource_type,
+        "arn": create_arn(service, region, resource_type, resource_id),
+        "service": service,
+        "region": region,
+    }
+
+
+################################### order_resources_into_waves tests ######################################
+def test_order_resources_into_waves():
+    vpc = make_resource("ec2", "vpc", "vpc-1")
+    subnet = make_resource("ec2", "subnet", "subnet-1")
+    instance = make_resource("ec2", "instance", "i-1")
+    queue = make_resource("sqs", "queue", "queue-1")
+    topic = make_resource("sns", "topic", "topic-1")
+    snapshot = {"resource_type": "snapshot", "resource_id": "snap-1", "service": "ec2", "region": "us-east-1"}
+    scaling_target = make_resource("applicationautoscaling", "scalabletarget", "target-1")
+
+    waves = go.order_resources_into_waves([vpc, subnet, instance, queue, topic, snapshot, scaling_target])
+
+    assert waves == [[queue, topic], [snapshot], [instance], [subnet], [vpc]]
+
+
+def test_order_resources_into_waves_snapshots_after_amis():
+    ami = {"resource_type": "ami", "resource_id": "ami-1", "service": "ec2", "region": "us-east-1"}
+    snapshots = [{"resource_type": "snapshot", "resource_id": f"snap-{i}", "service": "ec2", "region": "us-east-1"} for i in range(3)]
+
+    waves = go.order_resources_into_waves([ami, *snapshots])
+
+    assert waves == [[ami], snapshots]
+
+
+def test_order_resources_into_waves_removes_duplicates():
+    queue = make_resource("sqs", "queue", "queue-1")
+    snapshot = {"resource_type": "snapshot", "resource_id": "snap-1", "service": "ec2", "region": "us-east-1"}
+    other_region_snapshot = {**snapshot, "region": "us-west-2"}
+
+    waves = go.order_resources_into_waves([queue, snapshot, dict(queue), dict(snapshot), other_region_snapshot])
+
+    assert waves == [[queue], [snapshot, other_region_snapshot]]
+    assert waves[0][0] is queue
+
+
+def test_order_resources_into_waves_empty():
+    assert go.order_resources_into_waves([]) == []
@@ -0,0 +1,69 @@
+"""
+Tests for get_other_ids.py
+
+The following functions are tested:
+- get_images
+- get_autoscaling_groups
+- query_regions
+
+"""
+
+import boto3
+
+from awsweepbytag import get_other_ids
+
+
+################################### get_images tests ######################################
+def test_get_images_returns_amis_with_their_snapshots(setup):
+    region, client = setup
+    image_id = client.describe_images(Owners=["amazon"])["Images"][0]["ImageId"]
+    instance_id = client.run_instances(ImageId=image_id, MinCount=1, MaxCount=1)["Instances"][0]["InstanceId"]
+    ami_ids = [
+        client.create_image(
+            InstanceId=instance_id,
+            Name=f"test-image-{i}",
+            TagSpecifications=[{"ResourceType": "image", "Tags": [{"Key": "env", "Value": "test"}]}],
+        )["ImageId"]
+        for i in range(2)
+    ]
+
+    resources = get_other_ids.get_images("env", "test", [region])
+
+    assert sorted(resource["resource_id"] for resource in resources if resource["resource_type"] == "ami") == sorted(ami_ids)
+    # Each AMI is immediately followed by its snapshot
+    assert [resource["resource_type"] for resource in resources] == ["ami", "snapshot", "ami", "snapshot"]
+    assert all(resource["region"] == region and resource["service"] == "ec2" for resource in resources)
+
+
+################################### get_autoscaling_groups tests ######################################
+def test_get_autoscaling_groups_searches_every_region(setup):
+    regions = ["us-east-1", "us-west-2"]
+    for region in regions:
+        ec2_client = boto3.client("ec2", region_name=region)
+        image_id = ec2_client.describe_images(Owners=["amazon"])["Images"][0]["ImageId"]
+        ec2_client.create_launch_template(
+            LaunchTemplateName="test-template", LaunchTemplateData={"ImageId": image_id, "InstanceType": "t2.micro"}
+        )
+        zone = ec2_client.describe_availability_zones()["AvailabilityZones"][0]["ZoneName"]
+        boto3.client("autoscaling", region_name=region).create_auto_scaling_group(
+            AutoScalingGroupName=f"test-asg-{region}",
+            LaunchTemplate={"LaunchTemplateName": "test-template"},
+            MinSize=0,
+            MaxSize=1,
+            AvailabilityZones=[zone],
+            Tags=[{"Key": "env", "Value": "test", "PropagateAtLaunch": False}],
+        )
+
+    resources = get_other_ids.get_autoscaling_groups("env", "test", regions)
+
+    assert [resource["region"] for resource in resources] == regions
+    assert all(resource["resource_type"] == "autoscalinggroup" for resource in resources)
+    assert resources[0]["arn"].endswith("autoScalingGroupName/test-asg-us-east-1")
+
+
+################################### query_regions tests ######################################
+def test_query_regions_keeps_region_order():
+    resources = get_other_ids.query_regions(lambda region: [{"region": region}, {"region": region}], ["b", "a", "c"])
+
+    assert [resource["region"] for resource in resources] == ["b", "b", "a", "a", "c", "c"]
+    assert get_other_ids.query_regions(lambda region: [{"region": region}], []) == []
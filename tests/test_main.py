@@ -0,0 +1,103 @@
+"""
+Tests for main.py
+
+The following functions are tested:
+- parse_args
+- main
+
+"""
+
+import boto3
+import pytest
+
+from awsweepbytag import delete_functions as df
+from awsweepbytag import dep_checkers, main
+
+
+################################### parse_args tests ######################################
+def test_parse_args_verbose():
+    assert main.parse_args(["--verbose"]).verbose is True
+    assert main.parse_args(["-v"]).verbose is True
+
+
+def test_parse_args_lifecycle():
+    assert main.parse_args(["--lifecycle"]).lifecycle is True
+
+
+def test_parse_args_defaults():
+    args = main.parse_args([])
+    assert args.verbose is False
+    assert args.lifecycle is False
+
+
+################################### main tests ######################################
+def test_main_rejects_invalid_regions(capsys, monkeypatch):
+    answers = iter(["env", "test", "us-east-1, not-a-region, not-a-region"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(answers))
+    monkeypatch.setattr(main.go, "get_resources_by_tag", lambda *args: pytest.fail("Should not search with invalid regions"))
+
+    main.main([])
+    output = capsys.readouterr().out
+
+    assert output.count("not-a-region") == 1
+    assert "Please try again with valid regions" in output
+
+
+def test_main_clears_caches_from_earlier_runs(monkeypatch):
+    dep_checkers._route_table_associations[("us-east-1", "vpc-1")] = {"subnet-1": []}
+    df._internet_gateway_attachments["us-east-1"] = {"igw-1": ["vpc-1"]}
+    df._distribution_etags["E1"] = "ETAG"
+    df._s3_bucket_listings["bucket"] = (False, {})
+    df.CONFIRMED_S3_BUCKETS.add("bucket")
+    answers = iter(["env", "test", "not-a-region"])
+    monkeypatch.setattr("builtins.input", lambda *args: next(answers))
+
+    main.main([])
+
+    assert not dep_checkers._route_table_associations
+    assert not df._internet_gateway_attachments
+    assert not df._distribution_etags
+    assert not df._s3_bucket_listings
+    assert not df.CONFIRMED_S3_BUCKETS
+
+
+def test_main_verbose_flag_only_applies_to_its_own_run(monkeypatch):
+    monkeypatch.delenv("AWSWEEP_VERBOSE", raising=False)
+    # Restored after the test, since main sets it
+    monkeypatch.setattr(main.tf, "VERBOSE", False)
+
+    for argv, verbose in ((["--verbose"], True), ([], False)):
+        answers = iter(["env", "test", "not-a-region"])
+        monkeypatch.setattr("builtins.input", lambda *args: next(answers))
+        main.main(argv)
+
+        assert main.tf.VERBOSE is verbose
+
+
+def test_valid_regions():
+    assert main.VALID_REGIONS == frozenset(main.VALID_REGIONS_IN_ORDER)
+    assert len(main.VALID_REGIONS) == len(main.VALID_REGIONS_IN_ORDER)
+
+
+def test_main_lifecycle_flag_only_applies_to_its_own_run(monkeypatch, setup):
+    region, _ = setup
+    s3 = boto3.client("s3", region_name=region)
+    s3.create_bucket(Bucket="sweep-bucket")
+    s3.put_object(Bucket="sweep-bucket", Key="object", Body=b"data")
+    bucket = {"resource_type": "bucket", "arn": "arn:aws:s3:::sweep-bucket", "service": "s3", "region": region}
+    monkeypatch.setattr(main.go, "get_resources_by_tag", lambda *args: [])
+    monkeypatch.setattr(main.go, "get_other_resources", lambda *args: [dict(bucket)])
+    monkeypatch.setattr(main.tf, "warning_confirmation", lambda *args, **kwargs: "yes")
+    # Restored after the test, since main sets it
+    monkeypatch.setattr(main.df, "EXPIRE_S3_OBJECTS", False)
+
+    for argv in (["--lifecycle"], []):
+        answers = iter(["env", "test", region, "y", "n"])
+        monkeypatch.setattr("builtins.input", lambda *args: next(answers))
+        main.main(argv)
+
+        if argv:
+            # The first run only expires the contents, so the bucket and its object are left in place
+            assert s3.list_objects_v2(Bucket="sweep-bucket")["KeyCount"] == 1
+
+    assert "sweep-bucket" not in [b["Name"] for b in s3.list_buckets()["Buckets"]]
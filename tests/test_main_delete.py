@@ -0,0 +1,186 @@
+"""
+Tests for main_delete.py
+
+The following functions are tested:
+- timed_delete_resource
+- confirm_non_empty_buckets
+- delete_resources_concurrently
+- retry_failed_deletions
+
+"""
+
+import threading
+
+import pytest
+
+from awsweepbytag import main_delete as md
+from awsweepbytag import text_formatting as tf
+
+
+def make_resource(service: str, resource_type: str, region: str, name: str) -> dict[str, str]:
+    return {
+        "resource_type": resource_type,
+        "arn": f"arn:aws:{service}:{region}:123456789012:{name}",
+        "service": service,
+        "region": region,
+    }
+
+
+################################### timed_delete_resource tests ######################################
+def test_timed_delete_resource(monkeypatch):
+    queue = make_resource("sqs", "queue", "us-east-1", "queue-1")
+    vpc_link = make_resource("apigateway", "vpclink", "us-east-1", "link-1")
+    results = {"queue-1": None, "link-1": [vpc_link]}
+
+    def fake_delete_resource(resource):
+        name = resource["arn"].rsplit(":", 1)[-1]
+        if name not in results:
+            raise RuntimeError("boom")
+        return results[name]
+
+    monkeypatch.setattr(md, "delete_resource", fake_delete_resource)
+
+    finished = md.timed_delete_resource(queue)
+    assert finished.finished and finished.retry == [] and finished.error is None
+    assert finished.duration >= 0
+
+    ancillary = md.timed_delete_resource(vpc_link)
+    assert not ancillary.finished and ancillary.retry == [vpc_link]
+
+    error = make_resource("sqs", "queue", "us-east-1", "error-queue")
+    failed = md.timed_delete_resource(error)
+    assert failed.retry == [error] and failed.error == "boom"
+
+
+################################### confirm_non_empty_buckets tests ######################################
+@pytest.fixture
+def buckets(monkeypatch):
+    empty = {"resource_type": "bucket", "arn": "arn:aws:s3:::empty-bucket", "service": "s3", "region": "us-east-1"}
+    full = [{"resource_type": "bucket", "arn": f"arn:aws:s3:::full-bucket-{i}", "service": "s3", "region": "us-east-1"} for i in range(2)]
+    monkeypatch.setattr(md, "s3_bucket_has_objects", lambda arn, region: "full" in arn)
+    md.CONFIRMED_S3_BUCKETS.clear()
+    yield empty, full
+    md.CONFIRMED_S3_BUCKETS.clear()
+
+
+def test_confirm_non_empty_buckets_prompts_once(monkeypatch, buckets):
+    empty, full = buckets
+    prompts = []
+    monkeypatch.setattr(tf, "warning_confirmation", lambda text: prompts.append(text) or "yes")
+    queue = make_resource("sqs", "queue", "us-east-1", "queue-1")
+    waves = [[queue, empty, *full]]
+
+    assert md.confirm_non_empty_buckets(waves) == waves
+    assert len(prompts) == 1
+    assert md.CONFIRMED_S3_BUCKETS == {"full-bucket-0", "full-bucket-1"}
+
+
+def test_confirm_non_empty_buckets_lifecycle_prompt(monkeypatch, buckets):
+    _, full = buckets
+    prompts = []
+    monkeypatch.setattr(tf, "warning_confirmation", lambda text: prompts.append(text) or "yes")
+    monkeypatch.setattr(md.df, "EXPIRE_S3_OBJECTS", True)
+
+    md.confirm_non_empty_buckets([full])
+
+    assert "delete all contents" not in prompts[0]
+    assert "overwriting any existing lifecycle rules" in prompts[0]
+
+
+def test_confirm_non_empty_buckets_declined(monkeypatch, buckets):
+    empty, full = buckets
+    monkeypatch.setattr(tf, "warning_confirmation", lambda text: "no")
+    queue = make_resource("sqs", "queue", "us-east-1", "queue-1")
+
+    waves = md.confirm_non_empty_buckets([[queue, empty], full])
+
+    assert waves == [[queue, empty]]
+    assert not md.CONFIRMED_S3_BUCKETS
+
+
+################################### delete_resources_concurrently tests ######################################
+def test_delete_resources_concurrently_keeps_wave_order(monkeypatch):
+    deleted = []
+    lock = threading.Lock()
+
+    def fake_delete_resource(resource):
+        with lock:
+            deleted.append(resource["arn"])
+
+    monkeypatch.setattr(md, "delete_resource", fake_delete_resource)
+    first_wave = [make_resource("sqs", "queue", "us-east-1", f"queue-{i}") for i in range(5)]
+    second_wave = [make_resource("ec2", "vpc", "us-east-1", "vpc-1")]
+
+    failed = md.delete_resources_concurrently([first_wave, second_wave])
+
+    assert failed == []
+    assert sorted(deleted[:5]) == sorted(resource["arn"] for resource in first_wave)
+    assert deleted[5] == second_wave[0]["arn"]
+
+
+def test_delete_resources_concurrently_pool_per_region(monkeypatch):
+    thread_names = {}
+
+    def fake_delete_resource(resource):
+        thread_names[resource["region"]] = threading.current_thread().name
+
+    monkeypatch.setattr(md, "delete_resource", fake_delete_resource)
+    wave = [make_resource("sqs", "queue", "us-east-1", "queue-1"), make_resource("sqs", "queue", "us-west-2", "queue-2")]
+
+    md.delete_resources_concurrently([wave])
+
+    assert thread_names["us-east-1"].startswith("us-east-1")
+    assert thread_names["us-west-2"].startswith("us-west-2")
+
+
+def test_delete_resources_concurrently_collects_failures(monkeypatch, capsys):
+    retry = make_resource("sqs", "queue", "us-east-1", "retry-queue")
+    error = make_resource("sqs", "queue", "us-east-1", "error-queue")
+
+    def fake_delete_resource(resource):
+        if resource is retry:
+            return [resource]
+        if resource is error:
+            raise RuntimeError("boom")
+        return None
+
+    monkeypatch.setattr(md, "delete_resource", fake_delete_resource)
+
+    failed = md.delete_resources_concurrently([[retry, error, make_resource("sqs", "queue", "us-east-1", "ok-queue")]])
+
+    assert sorted(resource["arn"] for resource in failed) == sorted([retry["arn"], error["arn"]])
+    output = capsys.readouterr().out
+    assert f"Unexpected error deleting '{error['arn']}': boom" in output
+    assert "1 of 3 resources processed without retry in" in output
+
+
+################################### retry_failed_deletions tests ######################################
+def test_retry_failed_deletions_waits_for_distributions_concurrently(monkeypatch):
+    deleted = []
+    waited = []
+    # Each wait only returns once all three distributions are being waited on, so the barrier breaks if they are waited on one at a time
+    barrier = threading.Barrier(3)
+
+    def fake_wait(arn):
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            return
+        waited.append(arn)
+
+    monkeypatch.setattr(md, "wait_for_distribution_disabled", fake_wait)
+    monkeypatch.setattr(md, "delete_cloudfront_distribution", deleted.append)
+    distributions = [
+        {
+            "resource_type": "distribution",
+            "arn": f"arn:aws:cloudfront::123456789012:distribution/E{i}",
+            "service": "cloudfront",
+            "region": "us-east-1",
+        }
+        for i in range(3)
+    ]
+
+    md.retry_failed_deletions(distributions)
+
+    assert sorted(waited) == sorted(distribution["arn"] for distribution in distributions)
+    assert sorted(deleted) == sorted(distribution["arn"] for distribution in distributions)
@@ -0,0 +1,125 @@
+"""
+Tests for text_formatting.py
+
+The following functions are tested:
+- verbose_from_env
+- api_response_print
+- background_output
+- prompting
+
+"""
+
+import sys
+import threading
+from datetime import datetime
+
+import pytest
+
+from awsweepbytag import text_formatting as tf
+
+RESPONSE = {"Deleted": True, "CreatedTime": datetime(2025, 1, 1), "ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+################################### verbose_from_env tests ######################################
+@pytest.mark.parametrize(("value", "expected"), [("1", True), ("TRUE", True), ("yes", True), ("0", False), ("", False)])
+def test_verbose_from_env(monkeypatch, value, expected):
+    monkeypatch.setenv("AWSWEEP_VERBOSE", value)
+
+    assert tf.verbose_from_env() is expected
+
+
+################################### api_response_print tests ######################################
+def test_api_response_print_not_verbose(capsys, monkeypatch):
+    monkeypatch.setattr(tf, "VERBOSE", False)
+
+    tf.api_response_print(RESPONSE)
+
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_api_response_print_verbose(capsys, monkeypatch, use_orjson):
+    if use_orjson and tf.orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(tf, "orjson", None)
+    monkeypatch.setattr(tf, "VERBOSE", True)
+
+    tf.api_response_print(RESPONSE)
+
+    output = capsys.readouterr().out
+    assert '      "Deleted": true,' in output
+    assert '"HTTPStatusCode": 200' in output
+    assert "2025-01-01" in output
+
+
+################################### background_output tests ######################################
+def test_background_output(capsys):
+    stdout = sys.stdout
+
+    with tf.background_output():
+        assert isinstance(sys.stdout, tf.QueuedStdout)
+        tf.header_print("header")
+        tf.indent_print("indented")
+
+    assert sys.stdout is stdout
+    assert capsys.readouterr().out == f"{tf.Format.blue}header{tf.Format.end}\n\n    indented\n"
+
+
+def test_background_output_from_threads(capsys):
+    def print_lines(thread_number):
+        for line_number in range(50):
+            print(f"{thread_number}-{line_number}")
+
+    with tf.background_output():
+        threads = [threading.Thread(target=print_lines, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted(f"{i}-{j}" for i in range(4) for j in range(50))
+
+
+def test_background_output_keeps_lines_whole(capsys):
+    # print writes each argument, separator and line ending separately
+    def print_lines(thread_number):
+        for line_number in range(50):
+            print(thread_number, "line", line_number)
+
+    with tf.background_output():
+        threads = [threading.Thread(target=print_lines, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print("unfinished", end="")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(lines) == sorted([f"{i} line {j}" for i in range(4) for j in range(50)] + ["unfinished"])
+
+
+def test_background_output_flush_writes_queued_text(capsys):
+    with tf.background_output():
+        print("before prompt")
+        sys.stdout.flush()
+        assert capsys.readouterr().out == "before prompt\n"
+
+
+################################### prompting tests ######################################
+def test_prompting_keeps_follow_up_prompts_together(monkeypatch):
+    asked = []
+    monkeypatch.setattr("builtins.input", lambda text: asked.append(text.strip()) or "y")
+    other_prompt = threading.Thread(target=tf.y_n_prompt, args=("Other?",))
+
+    with tf.prompting():
+        tf.y_n_prompt("First?")
+        other_prompt.start()
+        # The other thread can't prompt while this block holds the prompt lock
+        other_prompt.join(timeout=0.2)
+        assert other_prompt.is_alive()
+        tf.custom_prompt("Second")
+
+    other_prompt.join()
+    assert asked == ["First? (y/n):", "Second:", "Other? (y/n):"]